@@ -0,0 +1,77 @@
+## Description
+
+    # Designs every crossing in a table of sites, one BridgeDesigner run per site, sites spread across a process pool
+    # The sites table (.csv or .xlsx) has one row per crossing: a 'Site' column plus any of the Constants names
+    # ('Cable Size', '# of walkway cables', 'guess LHS tiers', 'approx. soil slope LHS', 'Country', 'x_fnd_LHS', 'HWL_elevation' ...)
+    # Fields that are missing or blank keep their MasterInputs value
+    # Writes one result row per site to results_path
+
+    # How to use? Point sites_path at the table and run, each new site compiles its model once (then it is in the kernel cache)
+
+## Imports
+import contextlib
+import io
+import os
+import runpy
+import time
+import pandas as pd
+import Optimizer
+import SiteInputs
+import WorkbookLoader
+
+## Inputs
+path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
+sites_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Sites.csv')
+results_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BatchResults.csv')
+workers = os.cpu_count()
+
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BridgeDesigner.py')
+variable_names = ['G2S_L', 'G2S_R', 'CL_L', 'CL_R', 'x1', 'x2', 'x4', 'h_back_low', 'h_back_high']
+
+
+def read_table(table_path, **kwargs):
+    if table_path.endswith('.csv'):
+        return pd.read_csv(table_path, **kwargs)
+    return pd.read_excel(table_path, **kwargs)
+
+
+    # Runs BridgeDesigner for one site with its printout and plot switched off, a failing site gives a row with its error
+def design_site(name, fields, Constants, Tables):
+    os.environ['BRIDGEDESIGNER_HEADLESS'] = '1'
+    row = {'Site': name}
+    start = time.perf_counter()
+    try:
+        inputs = SiteInputs.site_inputs(Constants, Tables, fields)
+        with contextlib.redirect_stdout(io.StringIO()):
+            run = runpy.run_path(script, init_globals={'site_inputs': inputs})
+        row['Span'] = float(run['Span'])
+        row['DH'] = float(run['DH'])
+        row.update(zip(variable_names, run['res'].x))
+        row['Cost'] = float(run['res'].fun)
+        row.update({check: float(value) for check, value in run['checks'].items() if check != 'Cost'})
+        row['meets FOS targets'] = Optimizer.meets_targets(run['res'].x, run['problem'])
+        row['error'] = ''
+    except Exception as error:
+        row['error'] = type(error).__name__ + ': ' + str(error)
+    row['seconds'] = round(time.perf_counter() - start, 2)
+    return row
+
+
+def design_sites(sites, Constants, Tables, workers=None):
+    names = [str(name) for name in sites['Site']]
+    fields = [row.to_dict() for _, row in sites.iterrows()]
+    with Optimizer.process_pool(workers or os.cpu_count()) as pool:
+        rows = list(pool.map(design_site, names, fields, [Constants] * len(names), [Tables] * len(names)))
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    inputs = WorkbookLoader.load_inputs(path)
+    Constants = inputs['Constants']
+    Tables = inputs['Tables']
+    sites = read_table(sites_path)
+    start = time.perf_counter()
+    results = design_sites(sites, Constants, Tables, workers)
+    results.to_csv(results_path, index=False)
+    print(str(len(results)) + ' sites designed in ' + str(round(time.perf_counter() - start, 1)) + ' s, '
+          + str(int((results['error'] != '').sum())) + ' failed, results in ' + results_path)
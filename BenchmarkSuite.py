@@ -0,0 +1,163 @@
+## Description
+
+    # Times every phase of a BridgeDesigner run over a set of synthetic sites, so a change can be checked for making
+    # the designer faster or slower
+    # Sites cover spans from 20 to 120 m, both low sides, both countries and every tier class (on both abutments)
+    # Phases per site: site inputs, startup with an empty and with a warm kernel cache, symbolic build, derivatives,
+    # lambdify, one Cost_function call, the full minimize and the report, the workbook read is timed once per run
+    # Every run is appended to results_path with the commit it ran on, compare() lines runs up phase by phase
+
+    # How to use? Run it on each commit to compare, it prints this run against the previous one in results_path
+
+## Imports
+import contextlib
+import io
+import os
+import runpy
+import subprocess
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import KernelCache
+import Optimizer
+import SiteInputs
+import TierTable
+import WorkbookLoader
+
+## Inputs
+path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
+results_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BenchmarkResults.csv')
+spans = [20, 45, 70, 95, 120]  # meters
+low_sides = ['Left', 'Right']
+countries = ['Bolivia', 'Eswatini']
+solver = 'trust-constr'
+calls = 200  # Cost_function and report calls averaged per site
+
+code_dir = os.path.dirname(os.path.abspath(__file__))
+script = os.path.join(code_dir, 'BridgeDesigner.py')
+
+
+    # one fields dict (Constants names, as in Sites.csv) per site, the tier classes are cycled so each shows up on
+    # both abutments, x_fnd_RHS is set so the Geometry span comes out at the wanted span
+def synthetic_sites(Constants, Tables, spans=spans, low_sides=low_sides, countries=countries):
+    sites = []
+    for span in spans:
+        for low_side in low_sides:
+            for country in countries:
+                k = len(sites)
+                fields = {'Low Side?': low_side, 'Country': country,
+                          'guess LHS tiers': float(TierTable.tier_heights[k % 5]),
+                          'guess RHS tiers': float(TierTable.tier_heights[(k + 2) % 5]),
+                          'x_fnd_LHS': 20.0, 'y_fnd_LHS': 102.1, 'y_fnd_RHS': 101.04}
+                if low_side == 'Left':
+                    fields['y_fnd_LHS'], fields['y_fnd_RHS'] = fields['y_fnd_RHS'], fields['y_fnd_LHS']
+                Lookups = SiteInputs.lookups(SiteInputs.site_constants(Constants, fields), Tables)
+                fields['x_fnd_RHS'] = fields['x_fnd_LHS'] + span - Lookups.iloc[6, 0] - Lookups.iloc[7, 0] + 0.01  # 1 cm so the floor doesn't drop a meter on rounding
+                fields['Site'] = str(span) + ' m ' + low_side + ' ' + country
+                sites.append(fields)
+    return sites
+
+
+def run_script(inputs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return runpy.run_path(script, init_globals={'build_only': True, 'site_inputs': inputs})
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    value = function(*args)
+    return value, time.perf_counter() - start
+
+
+def per_call(function, *args):
+    start = time.perf_counter()
+    for _ in range(calls):
+        function(*args)
+    return (time.perf_counter() - start) / calls
+
+
+    # seconds of every phase for one site, the kernel cache points at an empty directory so the first startup compiles
+def site_phases(fields, Constants, Tables):
+    phases = {}
+    inputs, phases['site inputs'] = timed(SiteInputs.site_inputs, Constants, Tables, fields)
+    default_cache = KernelCache.cache_dir
+    with tempfile.TemporaryDirectory() as cache:
+        KernelCache.cache_dir = cache
+        try:
+            run, phases['startup, empty cache'] = timed(run_script, inputs)
+            run, phases['startup, cached kernel'] = timed(run_script, inputs)
+        finally:
+            KernelCache.cache_dir = default_cache
+
+    (variables, weights, outputs), phases['symbolic build'] = timed(run['build_model'])
+    derivatives, phases['derivatives'] = timed(run['model_derivatives'], variables, outputs)
+    _, phases['lambdify'] = timed(run['compile_kernel'], variables, weights, outputs, derivatives)
+
+    problem = run['problem']
+    phases['Cost_function call'] = per_call(Optimizer.cost_function, problem['x0'], problem)
+    res, phases['minimize'] = timed(Optimizer.solve, problem['x0'], solver, problem)
+    phases['report'] = per_call(Optimizer.report, res.x, problem)
+    extra = {'Span': float(run['Span']), 'iterations': res.get('nit', np.nan), 'cost evals': res.nfev,
+             'meets FOS targets': Optimizer.meets_targets(res.x, problem)}
+    return phases, extra
+
+
+    # the workbook read straight from the xlsx and from the WorkbookLoader sidecar
+def workbook_phases(path):
+    phases = {}
+    with pd.ExcelFile(path) as workbook:
+        _, phases['workbook read (xlsx)'] = timed(lambda: {name: workbook.parse(name, **options) for name, options in WorkbookLoader.sheet_options.items()})
+    WorkbookLoader.load_inputs(path)
+    _, phases['workbook read (sidecar)'] = timed(WorkbookLoader.load_inputs, path)
+    return phases
+
+
+def current_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=code_dir, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+    # long table, one row per (site, phase), every row of a run shares its run stamp and commit
+def benchmark(path=path, sites=None):
+    inputs = WorkbookLoader.load_inputs(path)
+    Constants = inputs['Constants']
+    Tables = inputs['Tables']
+    sites = sites or synthetic_sites(Constants, Tables)
+    stamp = time.strftime('%Y-%m-%d %H:%M:%S')
+    commit = current_commit()
+    rows = [{'run': stamp, 'commit': commit, 'Site': 'workbook', 'phase': phase, 'seconds': seconds}
+            for phase, seconds in workbook_phases(path).items()]
+    for fields in sites:
+        phases, extra = site_phases(fields, Constants, Tables)
+        rows += [dict({'run': stamp, 'commit': commit, 'Site': fields['Site'], 'phase': phase, 'seconds': seconds}, **extra)
+                 for phase, seconds in phases.items()]
+    return pd.DataFrame(rows)
+
+
+def read_results(path=results_path):
+    return pd.read_csv(path, dtype={'run': str, 'commit': str}).fillna({'commit': ''})
+
+
+    # median seconds of each phase (rows) in each run (columns), runs named by their commit and stamp, oldest first
+def compare(results, runs=None):
+    results = results.assign(label=(results['commit'].fillna('') + ' ' + results['run']).str.strip())
+    labels = list(dict.fromkeys(results.sort_values('run')['label']))
+    if runs is not None:
+        labels = labels[-runs:]
+    table = results[results['label'].isin(labels)].pivot_table(index='phase', columns='label', values='seconds', aggfunc='median', sort=False)
+    return table[labels]
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    run_results = benchmark(path)
+    results = run_results
+    if os.path.exists(results_path):
+        results = pd.concat([read_results(results_path), run_results], ignore_index=True)
+    results.to_csv(results_path, index=False)
+    print(str(run_results['Site'].nunique() - 1) + ' sites benchmarked in ' + str(round(time.perf_counter() - start, 1)) + ' s, results in ' + results_path)
+    print('median seconds per site')
+    print(compare(results, runs=2).to_string(float_format=lambda seconds: '{:.3g}'.format(seconds)))
@@ -4,7 +4,7 @@
     # Constrained by Cable FOS, Sliding, Uplift
     # Optimized for labor and costs
 
-    # How to use? Play with the penalties function until FOS is met
+    # How to use? Set the minimum FOS and freeboard in fos_targets, the solver holds the design to them
 
 ## Assumptions
     # Tiers are "normal" sized from 0.5 to 3 and a 1.5 foundation
@@ -12,16 +12,37 @@
     # sliding and uplift will govern, so tower and foundation analyses are not considered
 
 ## Imports
-import pandas as pd
-import sympy as sym
-from sympy import Symbol
-from sympy.core.relational import Relational
-from sympy import *
-import mpmath as mp
+    # sympy, mpmath and SymbolicDerivatives are only imported when the model has to be compiled (not in the kernel cache)
+    # and matplotlib only when the plot is wanted, on a cached headless run they were most of the startup time
+import time
+start_time = time.perf_counter()
+import os
 import numpy as np
-from scipy.optimize import minimize
-from scipy.optimize import LinearConstraint
-import matplotlib.pyplot as plt
+from scipy.optimize import Bounds
+from scipy.optimize import OptimizeResult
+import KernelCache
+import Optimizer
+import PhaseProfile
+import ResultCache
+import SagCalculator
+import Surrogate
+import TierTable
+import WarmStart
+import WorkbookLoader
+
+## Run settings
+    # headless skips the plot and never imports matplotlib (batch servers), figure_path saves the plot to that file instead of
+    # showing it, BRIDGEDESIGNER_HEADLESS=1 and BRIDGEDESIGNER_FIGURE=<file> set them from outside
+headless = os.environ.get('BRIDGEDESIGNER_HEADLESS', '0') != '0'
+figure_path = os.environ.get('BRIDGEDESIGNER_FIGURE')
+    # show_startup prints the time from the first import to the first solver call against startup_target (cached kernel),
+    # BRIDGEDESIGNER_STARTUP=1 sets it from outside
+show_startup = os.environ.get('BRIDGEDESIGNER_STARTUP', '0') != '0'
+startup_target = 1.0  # seconds
+    # LearningEngine and other callers run this script with build_only = True to get the compiled problem without solving
+build_only = globals().get('build_only', False)
+    # BRIDGEDESIGNER_PROFILE=<file.jsonl> appends the time, peak memory and expression size of each section to that file
+PhaseProfile.start()
 
 ## Constant Variables
 
@@ -50,12 +71,14 @@ masonry_labor = 5 #m3 a day of masonry
 fill_labor = 20 #m3 a day of fill
 excavation_labor = 3 #m3 a day of excavation
 
+    # default cost weights, the compiled cost takes them as arguments (see LearningEngine)
 weight_masonry = 1
 weight_excav = 1
-weight_cemeht = 1
+weight_cement = 1
 weight_sand = 1
 weight_gravel = 1
 weight_rock = 1
+weight_names = Optimizer.weight_names
 #####
 
 increment = 0.7 # meter increment for selecting points
@@ -68,19 +91,17 @@ bottom_forces = 0.5  #include 50% of bottom forces
 saddle_friction = 0.15 #coefficient of friction across saddle
 
 ## Read-in and Calculated Variables
+PhaseProfile.phase('Read-in')
     # Read in the file
 path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
-Constants = pd.read_excel(path, sheet_name="Constants")
-
-G2S_L = Symbol('G2S_L', real = True)  #ground to saddle total, left
-G2S_R = Symbol('G2S_R', real = True)  #ground to saddle total, right
-CL_L = Symbol('CL_L', real = True)  #backwall to center line, left
-CL_R = Symbol('CL_R', real = True)  #backwall to center line, right
-x1 = Symbol('x1', real = True)  #construction sag
-x2 = Symbol('x2', real = True)  #hoisting sag
-x4 = Symbol('x4', real = True)  #live sag
-h_back_low = Symbol('h_back_low', real = True)  #back wall height meters
-h_back_high = Symbol('h_back_high', real = True)  #back wall height meters
+    # BatchDesigner runs this script once per site with site_inputs = (Constants, Lookups, Geometry) already set
+if 'site_inputs' in globals():
+    Constants, Lookups, Geometry = site_inputs
+else:
+    inputs = WorkbookLoader.load_inputs(path)  # all sheets in one read, then from the sidecar until the workbook changes
+    Constants = inputs['Constants']
+    Lookups = inputs['Lookup']
+    Geometry = inputs['Geometry']
 
 # Keep for testing
 # Span = 55
@@ -109,7 +130,6 @@ y_fnd_L = Constants.iloc[15, 1]
 y_fnd_R = Constants.iloc[16, 1]
 HWL = Constants.iloc[17, 1]
 
-Lookups = pd.read_excel(path, sheet_name="Lookup")
 
 CableArea = Lookups.iloc[0, 0]
 A_cable = CableArea*TotalCables
@@ -127,56 +147,13 @@ else:
     tiers_low = Constants.iloc[9, 1]
     tiers_high = Constants.iloc[8, 1]
 
-if tiers_low < 1: #this means just one half tier
-    H_tiers_low = 0.9 # 0.9 m off the centerline
-    front_extra_low = 2.3 - 0.9
-    tiers_loss_low = (.90 * 1) + ((.90 - tier_offset) * tiers_low) + ((.90 - (2 * tiers_offset)) * walkway_height)
-    y_hand_low = 3 #distance to high saddle
-elif tiers_low == 1:
-    H_tiers_low = 0.9
-    front_extra_low = 2.3 - 0.9
-    tiers_loss_low = (.90 * 1) + ((.90 - tier_offset) * tiers_low) + ((.90 - (2 * tier_offset)) * walkway_height)
-    y_hand_low = 3.5
-elif tiers_low == 2:
-    H_tiers_low = 1.15
-    front_extra_low = 2.95 - 1.15
-    tiers_loss_low = (1.15 * 1) + ((1.15 - (tier_offset * (tiers_low -1))) * 1) + ((1.15 - (tier_offset * tiers_low)) * 1) + ((1.15 - ((tiers_low+1) * tier_offset)) * walkway_height)
-    y_hand_low = 4.5
-elif tiers_low == 3:
-    H_tiers_low = 1.4
-    front_extra_low = 3.6 - 1.4
-    tiers_loss_low = (1.40 * 1) + ((1.40 - (tier_offset * (tiers_low - 2))) * 1) + ((1.40 - (tier_offset * (tiers_low - 1))) * 1) + ((1.40 - (tier_offset * tiers_low)) * 1) + ((1.40 - ((tiers_low + 1) * tier_offset)) * walkway_height)
-    y_hand_low = 5.5
-elif tiers_low > 3: #this means a 1.5 foundation tier
-    H_tiers_low = 1.4
-    front_extra_low = 3.6 - 1.4
-    tiers_loss_low = (1.40 * 1.5) + ((1.40 - (tier_offset * (tiers_low - 2))) * 1) + ((1.40 - (tier_offset * (tiers_low - 1))) * 1) + ((1.40 - (tier_offset * tiers_low)) * 1) + ((1.40 - ((tiers_low + 1) * tier_offset)) * walkway_height)
-    y_hand_low = 6
-if tiers_high < 1:  # this means just one half tier
-    H_tiers_high = 0.9
-    front_extra_high = 2.3 - 0.9
-    tiers_loss_high = (0.90 * 1) + ((0.90 - tier_offset) * tiers_low) + ((0.90 - (2 * tier_offset)) * walkway_height)
-    y_hand_high = 3
-elif tiers_high == 1:
-    H_tiers_high = 0.9
-    front_extra_high = 2.3 - 0.9
-    tiers_loss_high = (0.90 * 1) + ((0.90 - tier_offset) * tiers_low) + ((0.90 - (2 * tier_offset)) * walkway_height)
-    y_hand_high = 3.5
-elif tiers_high == 2:
-    H_tiers_high = 1.15
-    front_extra_high = 2.95 - 1.15
-    tiers_loss_high = (1.15 * 1) + ((1.15 - (tier_offset * (tiers_low - 1))) * 1) + ((1.15 - (tier_offset * tiers_low)) * 1) + ((1.15 - ((tiers_low + 1) * tier_offset)) * walkway_height)
-    y_hand_high = 4.5
-elif tiers_high == 3:
-    H_tiers_high = 1.4
-    front_extra_high = 3.6 - 1.4
-    tiers_loss_high = (1.40 * 1) + ((1.40 - (tier_offset * (tiers_low - 2))) * 1) + ((1.40 - (tier_offset * (tiers_low - 1))) * 1) + ((1.40 - (tier_offset * tiers_low)) * 1) + ((1.40 - ((tiers_low + 1) * tier_offset)) * walkway_height)
-    y_hand_high = 5.5
-elif tiers_high > 3:  # this means a 1.5 foundation tier
-    H_tiers_high = 1.4
-    front_extra_high = 3.6 - 1.4
-    tiers_loss_high = (1.40 * 1.5) + ((1.40 - (tier_offset * (tiers_low - 2))) * 1) + ((1.40 - (tier_offset * (tiers_low - 1))) * 1) + ((1.40 - (tier_offset * tiers_low)) * 1) + ((1.40 - ((tiers_low + 1) * tier_offset)) * walkway_height)
-    y_hand_high = 6
+    # tier properties of both abutments at once (see TierTable)
+tiers = TierTable.tier_properties(TierTable.tier_table(tier_offset, walkway_height), [tiers_low, tiers_high])
+H_tiers_low, H_tiers_high = tiers['H_tiers']  # m off the centerline
+front_extra_low, front_extra_high = tiers['front_extra']
+tiers_loss_low, tiers_loss_high = tiers['tiers_loss']
+y_hand_low, y_hand_high = tiers['y_hand']  #distance to high saddle
+fnd_height_low, fnd_height_high = tiers['fnd_height']
 
 Span = abs(x_fnd_L - x_fnd_R) + front_extra_high + front_extra_low  # Span in meters as defined by x coords and tiers
 
@@ -202,18 +179,8 @@ else:
     b2 = 1.4
     b1 = 1.1
 
-if tiers_low > 3:
-    ground_height_low = (H_Anchor + 1.5) / 2
-    fnd_height_low = 1.5
-else:
-    ground_height_low = (H_Anchor + 1) / 2
-    fnd_height_low = 1
-if tiers_high > 3:
-    ground_height_high = (H_Anchor + 1.5) / 2
-    fnd_height_high = 1.5
-else:
-    ground_height_high = (H_Anchor + 1) / 2
-    fnd_height_high = 1
+ground_height_low = (H_Anchor + fnd_height_low) / 2
+ground_height_high = (H_Anchor + fnd_height_high) / 2
 
 if LowSide == 'Left':
     DH = abs((y_fnd_R + y_hand_high) - (y_fnd_L + y_hand_low))
@@ -225,7 +192,7 @@ else:
     y_walk_right = y_hand_low - tower_height
 
 walkway_area = Span*deck_width
-live_reduced = live_base*(0.25 + (4.57/sym.sqrt(walkway_area)))
+live_reduced = live_base*(0.25 + (4.57/np.sqrt(walkway_area)))
 if walkway_area <= 37:
     W_live = live_base
 else:
@@ -238,896 +205,901 @@ else:
 w_TL = W_live + W_dead
 
 design_sag = design_sag_percent * Span / 100
-## Set up system of equations
-
-    # Cable FOS
-Ph = (w_TL * (Span**2)) / (8 * x4)
-
-theta_low = sym.atan(((4 * x4) - DH) / Span)
-theta_high = sym.atan(((4 * x4) + DH) / Span)
-Pv_low = Ph * sym.tan(theta_low)
-Pv_high = Ph * sym.tan(theta_high)
-Pt_low = Ph / sym.cos(theta_low)
-Pt_high = Ph / sym.cos(theta_high)
-
-if LowSide == 'Left':
-    alpha_hand_low = sym.atan((G2S_L + tower_height - V_Anchor) / (CL_L - H_Anchor))
-    alpha_hand_high = sym.atan((G2S_R + tower_height - V_Anchor) / (CL_R - H_Anchor))
-    alpha_walk_low = sym.atan((G2S_L - V_Anchor) / (CL_L - H_Anchor))
-    alpha_walk_high = sym.atan((G2S_R- V_Anchor) / (CL_R - H_Anchor))
-else:
-    alpha_hand_low = sym.atan((G2S_R + tower_height - V_Anchor) / (CL_R - H_Anchor))
-    alpha_hand_high = sym.atan((G2S_L + tower_height - V_Anchor) / (CL_L - H_Anchor))
-    alpha_walk_low = sym.atan((G2S_R- V_Anchor) / (CL_R - H_Anchor))
-    alpha_walk_high = sym.atan((G2S_L - V_Anchor) / (CL_L - H_Anchor))
-
-Pt_back_hand_low = Ph / sym.cos(alpha_hand_low)
-Pt_back_hand_high = Ph / sym.cos(alpha_hand_high)
-Pt_back_walk_low = Ph / sym.cos(alpha_walk_low)
-Pt_back_walk_high = Ph / sym.cos(alpha_walk_high)
-
-Pv_back_hand_low = Pt_back_hand_low * sym.sin(alpha_hand_low)
-Pv_back_hand_high = Pt_back_hand_high * sym.sin(alpha_hand_high)
-Pv_back_walk_low = Pt_back_walk_high * sym.sin(alpha_walk_low)
-Pv_back_walk_high = Pt_back_walk_high * sym.sin(alpha_walk_high)
 
-Pt_main_low = Pt_low
-Pt_main_high = Pt_high
-Pv_main_low = Pt_main_low * sym.sin(theta_low)
-Pv_main_high = Pt_main_high * sym.sin(theta_high)
+    # soil and saddle values the checks take as single deterministic numbers (Reliability samples them), slopes in degrees
+soil_parameters = {'phi': phi, 'd_soil': d_soil, 'd_fill': d_fill, 'mu_saddle': mu_saddle,
+                   'slope_LHS': Constants.iloc[10, 1], 'slope_RHS': Constants.iloc[11, 1]}
 
-R_tower_low = Pv_back_hand_low + Pv_main_low
-R_tower_high = Pv_back_hand_high + Pv_main_high
-max_force = Pt_back_hand_low
-max_cable_tension = Lookups.iloc[5, 0]
-
-FOS_CABLE = max_cable_tension / (max_force / TotalCables)
-
-## Ramp Geometry
-back_low = h_back_low + anchor_height
-back_high = h_back_high + anchor_height
-
-if LowSide == 'Left':
-    area_ramp_base_low = (CL_L * y_walk_left) - tiers_loss_low - anchor_area
-    area_ramp_base_high = (CL_R * y_walk_right) - tiers_loss_high - anchor_area
-    ramp_loss_low = abs((back_low) - G2S_L) * CL_L * 0.5  # zero if no upper triangle
-    ramp_loss_high = abs((back_high) - G2S_R) * CL_R * 0.5  # zero if no upper triangle
-    start_area_ramp_low = area_ramp_base_low - ramp_loss_low
-    start_area_ramp_high = area_ramp_base_high - ramp_loss_high
-    ramp_angle_low = sym.atan((abs((back_low) - G2S_L)) / CL_L)  # zero if no upper triangle
-    ramp_angle_high = sym.atan((abs((back_high) - G2S_R)) / CL_R)  # zero if no upper triangle
-    area_low_30_50 = (CL_L * sym.tan(ramp_angle_low) * CL_L * 0.5) + (
-                (-1 * ((CL_L * sym.tan(ramp_angle_low)) - 1)) * CL_L)
-    area_low_30_70 = (CL_L * sym.tan(ramp_angle_low) * CL_L * 0.5) + (
-                (-1 * ((CL_L * sym.tan(ramp_angle_low)) - 2)) * CL_L)
-    area_high_30_50 = (CL_R * sym.tan(ramp_angle_high) * CL_R * 0.5) + (
-                (-1 * ((CL_R * sym.tan(ramp_angle_high)) - 1)) * CL_R)
-    area_high_30_70 = (CL_R * sym.tan(ramp_angle_high) * CL_R * 0.5) + (
-                (-1 * ((CL_R * sym.tan(ramp_angle_high)) - 2)) * CL_R)
-    bottom_slope_angle_low = sym.atan((G2S_L - y_walk_left) / CL_L)  # negative if y_walk is greater than G2S, in this case we go 0.5 up the foundation and subtract a bit for losses
-    bottom_slope_angle_high = sym.atan((G2S_R - y_walk_right) / CL_R)
-else:
-    area_ramp_base_low = (CL_R * y_walk_right) - tiers_loss_low - anchor_area
-    area_ramp_base_high = (CL_L * y_walk_left) - tiers_loss_high - anchor_area
-    ramp_loss_low = abs((back_low) - G2S_R) * CL_R * 0.5  # zero if no upper triangle
-    ramp_loss_high = abs((back_high) - G2S_L) * CL_L * 0.5  # zero if no upper triangle
-    start_area_ramp_low = area_ramp_base_low - ramp_loss_low
-    start_area_ramp_high = area_ramp_base_high - ramp_loss_high
-    ramp_angle_low = sym.atan((abs((back_low) - G2S_R)) / CL_R)  # zero if no upper triangle
-    ramp_angle_high = sym.atan((abs((back_high) - G2S_L)) / CL_L)  # zero if no upper triangle
-    area_low_30_50 = (CL_R * sym.tan(ramp_angle_low) * CL_R * 0.5) + (
-                (-1 * ((CL_R * sym.tan(ramp_angle_low)) - 1)) * CL_R)
-    area_low_30_70 = (CL_R * sym.tan(ramp_angle_low) * CL_R * 0.5) + (
-                (-1 * ((CL_R * sym.tan(ramp_angle_low)) - 2)) * CL_R)
-    area_high_30_50 = (CL_L * sym.tan(ramp_angle_high) * CL_L * 0.5) + (
-                (-1 * ((CL_L * sym.tan(ramp_angle_high)) - 1)) * CL_L)
-    area_high_30_70 = (CL_L * sym.tan(ramp_angle_high) * CL_L * 0.5) + (
-                (-1 * ((CL_L * sym.tan(ramp_angle_high)) - 2)) * CL_L)
-    bottom_slope_angle_low = sym.atan(abs(G2S_R - y_walk_right) / CL_R)
-    bottom_slope_angle_high = sym.atan(abs(G2S_L - y_walk_left) / CL_L)
-
-
-# 30 cm walls
-
-volume_30_low = start_area_ramp_low * 0.3
-volume_50_low = 0
-volume_70_low = 0
-volume_30_high = start_area_ramp_high * 0.3
-volume_50_high = 0
-volume_70_high = 0
-
-if tiers_low == 2:
-    volume_50_low = (start_area_ramp_low - area_low_30_50) * 0.2
-    area_50_low = start_area_ramp_low - area_low_30_50
-elif tiers_low > 2:
-    volume_50_low = (start_area_ramp_low - area_low_30_50) * 0.2
-    volume_70_low = (start_area_ramp_low - area_low_30_70) * 0.4
-    area_50_low = start_area_ramp_low - area_low_30_50
-    area_70_low = start_area_ramp_low - area_low_30_70
-
-if tiers_high == 2:
-    volume_50_high = (start_area_ramp_high - area_high_30_50) * 0.2
-    area_50_low = start_area_ramp_high - area_high_30_50
-elif tiers_high > 2:
-    volume_50_high = (start_area_ramp_high - area_high_30_50) * 0.2
-    volume_70_high = (start_area_ramp_high - area_high_30_70) * 0.4
-    area_50_low = start_area_ramp_high - area_high_30_50
-    area_70_low = start_area_ramp_high - area_high_30_70
-
-ramp_volume_total_low = volume_30_low + volume_50_low + volume_70_low
-ramp_volume_total_high = volume_30_high + volume_50_high + volume_70_high
-
-## End Ramp Geometry
-
-    # Uplift FOS
-if LowSide == 'Left':
-    area_low = (CL_L * (anchor_height + h_back_low)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_low))
-    area_high = (CL_R * (anchor_height + h_back_low)) + (0.5 * CL_R * (G2S_L - anchor_height - h_back_low))
-    ramp_angle_low = sym.atan((G2S_L - anchor_height - h_back_low) / CL_L)
-    ramp_angle_high = sym.atan((G2S_R - anchor_height - h_back_low) / CL_R)
-else:
-    area_low = (CL_R * (anchor_height + h_back_low)) + (0.5 * CL_R * (G2S_L - anchor_height - h_back_low))
-    area_high = (CL_L * (anchor_height + h_back_low)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_low))
-    ramp_angle_low = sym.atan((G2S_R - anchor_height - h_back_low) / CL_R)
-    ramp_angle_high = sym.atan((G2S_L - anchor_height - h_back_low) / CL_L)
-    
-uplift_x_low = (np.tan(np.radians(30)) * (anchor_height + h_back_low))  #x distance past anchor for overburden
-uplift_x_high = (np.tan(np.radians(30)) * (anchor_height + h_back_high))  #x distance past anchor for overburden
-uplift_y_low = (uplift_x_low + b2) * sym.tan(ramp_angle_low)
-uplift_y_high = (uplift_x_high + b2) * sym.tan(ramp_angle_high)
-ramplength_overburden_low = uplift_y_low / sym.sin(ramp_angle_low)
-ramplength_overburden_high = uplift_y_high / sym.sin(ramp_angle_high)
-
-overburden_area_low = (b2 * (anchor_height + h_back_low)) + (uplift_x_low * (anchor_height + h_back_low) * 0.5)+ ((uplift_x_low + b2) * (uplift_y_low) * 0.5) + 0.5 * (b2 + (back_low * sym.tan(np.radians(30)))) * sym.tan(ramp_angle_low) * (b2 + (back_low * sym.tan(np.radians(30))))
-overburden_area_high = (b2 * (anchor_height + h_back_high)) + (uplift_x_high * (anchor_height + h_back_high) * 0.5)+ ((uplift_x_high + b2) * (uplift_y_high) * 0.5) + 0.5 * (b2 + (back_high * sym.tan(np.radians(30)))) * sym.tan(ramp_angle_high) * (b2 + (back_high * sym.tan(np.radians(30))))
-
-
-if LowSide == 'Left':
-    soil_area_low = (ground_height_low * (CL_L - H_tiers_low - b2))
-    soil_area_high = (ground_height_high * (CL_R - H_tiers_high - b2))
-    rampwall_area_low = area_low - (tiers_loss_low / 100) - anchor_area - soil_area_low   # ramp wall area in m2
-    rampwall_area_high = area_high - (tiers_loss_high / 100) - anchor_area - soil_area_high # ramp wall area in m2
-else:
-    soil_area_low = (ground_height_low * (CL_R - H_tiers_low - b2))
-    soil_area_high = (ground_height_high * (CL_L - H_tiers_high - b2))
-    rampwall_area_low = area_high - (tiers_loss_high / 100) - anchor_area - soil_area_high
-    rampwall_area_high = area_low - (tiers_loss_low / 100) - anchor_area - soil_area_low
-
-    # concrete (ramp and anchor)
-overburden_concrete_low = ((ramplength_overburden_low * ramp_thickness) + anchor_area) * ramp_width  #m3
-overburden_concrete_high = ((ramplength_overburden_high * ramp_thickness) + anchor_area) * ramp_width
-    # masonry (backwall)
-overburden_masonry_low = (backwall_thickness * h_back_low) * ramp_width
-overburden_masonry_high = (backwall_thickness * h_back_high) * ramp_width
-    # rest of it
-overburden_leftover_low = (overburden_area_low * ramp_width) - overburden_concrete_low - overburden_masonry_low
-overburden_leftover_high = (overburden_area_high * ramp_width) - overburden_concrete_high - overburden_masonry_high
-
-W_overburden_low =overburden_concrete_low * d_concrete + overburden_masonry_low * d_masonry + overburden_leftover_low * d_fill
-W_overburden_high =overburden_concrete_high * d_concrete + overburden_masonry_high * d_masonry + overburden_leftover_high * d_fill
-Vn_low = W_overburden_low
-Vn_high = W_overburden_high
-
-    #set up uplift forces
-Pt_walk_tot_low = Pt_main_low * (WalkNumber/TotalCables)
-Pt_walk_tot_high = Pt_main_high * (WalkNumber/TotalCables)
-Pt_hand_tot_low = Pt_main_low * (HandNumber/TotalCables)
-Pt_hand_tot_high = Pt_main_high * (HandNumber/TotalCables)
-
-Pt_back_walk_belt_low = Pt_walk_tot_low * sym.exp((-mu_saddle) * (theta_low+alpha_walk_low + 0.04))
-Pt_back_walk_belt_high = Pt_walk_tot_high * sym.exp((-mu_saddle) * (theta_high+alpha_walk_high + 0.04))
-Pt_back_hand_belt_low = Pt_hand_tot_low * sym.exp((-mu_saddle) * (theta_low+alpha_hand_low + 0.04))
-Pt_back_hand_belt_high = Pt_hand_tot_high * sym.exp((-mu_saddle) * (theta_high+alpha_hand_high + 0.04))
-
-Pv_back_walk_belt_low = Pt_back_walk_belt_low * sym.sin(alpha_walk_low)
-Pv_back_walk_belt_high = Pt_back_walk_belt_high * sym.sin(alpha_walk_high)
-Pv_back_hand_belt_low = Pt_back_hand_belt_low * sym.sin(alpha_hand_low)
-Pv_back_hand_belt_high = Pt_back_hand_belt_high * sym.sin(alpha_hand_high)
-
-Ph_back_walk_belt_low = Pt_back_walk_belt_low * sym.cos(alpha_walk_low)
-Ph_back_walk_belt_high = Pt_back_walk_belt_high * sym.cos(alpha_walk_high)
-Ph_back_hand_belt_low = Pt_back_hand_belt_low * sym.cos(alpha_hand_low)
-Ph_back_hand_belt_high = Pt_back_hand_belt_high * sym.cos(alpha_hand_high)
-
-Pv_anchor_low = Pv_back_walk_belt_low + Pv_back_hand_belt_low
-Pv_anchor_high = Pv_back_walk_belt_high + Pv_back_hand_belt_high
-Vs_low = Pv_anchor_low
-Vs_high = Pv_anchor_high
-
-FOS_UPLIFT_LOW = Vn_low / Vs_low
-FOS_UPLIFT_HIGH = Vn_high / Vs_high
-
-    # Sliding FOS
-
-    # Weight resisting forces (soil and ramp walls)
-
-        #backwall
-W_backwall_low = ramp_width * backwall_thickness * h_back_low * d_masonry  #kN
-W_backwall_high = ramp_width * backwall_thickness * h_back_high * d_masonry
-
-        #anchor
-W_anchor = anchor_area * ramp_width * d_concrete  #kN
-
-        #cap
-W_rampcap_low = ramplength_overburden_low * ramp_thickness * ramp_width * d_masonry
-W_rampcap_high = ramplength_overburden_high * ramp_thickness * ramp_width * d_masonry
-
-        #rampwalls
-area_ramp_low = area_low - soil_area_low - anchor_area - (backwall_thickness * h_back_low) - (ramplength_overburden_low * ramp_thickness) - tiers_loss_low
-area_ramp_high = area_high - soil_area_high - anchor_area - (backwall_thickness * h_back_high) - (ramplength_overburden_high * ramp_thickness) - tiers_loss_high
-
-            #if the tiers are 2, we want to subtract one meter down from the top
-if LowSide == 'Left':
-    upper_triangle = (G2S_L - anchor_height - h_back_low)
-    upper_triangle_high = (G2S_R - anchor_height - h_back_high)
-    if tiers_low == 2:
-        W_extra_low = (anchor_height + h_back_low) * (CL_L - H_Anchor - (1.15/2)) * 0.2  # 1.15/2 is the average of how much tiers stick into the extra wall
-    elif tiers_low > 2:
-        W_extra_low = ((anchor_height + h_back_low) * (CL_L - H_Anchor - (1.4/2)) * 0.2) + ((anchor_height + h_back_low -1) * (CL_L - H_Anchor - (1.4/2)) * 0.2)
-    else:
-        W_extra_low = 0
-    if tiers_high== 2:
-        W_extra_high = (anchor_height + h_back_high) * (CL_R - H_Anchor - (1.15/2)) * 0.2
-    elif tiers_low > 2:
-        W_extra_high = ((anchor_height + h_back_high) * (CL_R - H_Anchor - (1.4/2)) * 0.2) + ((anchor_height + h_back_high -1) * (CL_R - H_Anchor - (1.4/2)) * 0.2)
-    else:
-        W_extra_high = 0
-else:  #high side is left
-    upper_triangle = (G2S_R - anchor_height - h_back_low)
-    upper_triangle_high = (G2S_L - anchor_height - h_back_high)
-    if tiers_low == 2:
-        W_extra_low = (anchor_height + h_back_low) * CL_R * 0.2
-    elif tiers_low > 2:
-        W_extra_low = ((anchor_height + h_back_low) * CL_R * 0.2) + ((anchor_height + h_back_low -1) * CL_R * 0.2)
+## Set up system of equations
+    # build_model() is the slow part of a run, its lambdified output is cached by KernelCache
+    # parameters replaces entries of soil_parameters with SymPy symbols, so the checks come out as functions of them
+def build_model(parameters=None):
+    import mpmath as mp
+    import sympy as sym
+    from sympy import Symbol
+
+    values = dict(soil_parameters, **(parameters or {}))
+    phi, d_soil, d_fill, mu_saddle = values['phi'], values['d_soil'], values['d_fill'], values['mu_saddle']
+
+    def radians(angle):
+        return angle * sym.pi / 180 if isinstance(angle, sym.Basic) else mp.radians(angle)
+
+    G2S_L = Symbol('G2S_L', real = True)  #ground to saddle total, left
+    G2S_R = Symbol('G2S_R', real = True)  #ground to saddle total, right
+    CL_L = Symbol('CL_L', real = True)  #backwall to center line, left
+    CL_R = Symbol('CL_R', real = True)  #backwall to center line, right
+    x1 = Symbol('x1', real = True)  #construction sag
+    x2 = Symbol('x2', real = True)  #hoisting sag
+    x4 = Symbol('x4', real = True)  #live sag
+    h_back_low = Symbol('h_back_low', real = True)  #back wall height meters
+    h_back_high = Symbol('h_back_high', real = True)  #back wall height meters
+        # cost weights stay symbols so a new weight set doesn't need a new model
+    weights = sym.symbols(weight_names, real = True)
+    weight_masonry, weight_excav, weight_cement, weight_sand, weight_gravel, weight_rock = weights
+
+        # Cable FOS
+    PhaseProfile.phase('Cable FOS')
+    Ph = (w_TL * (Span**2)) / (8 * x4)
+
+    theta_low = sym.atan(((4 * x4) - DH) / Span)
+    theta_high = sym.atan(((4 * x4) + DH) / Span)
+    Pv_low = Ph * sym.tan(theta_low)
+    Pv_high = Ph * sym.tan(theta_high)
+    Pt_low = Ph / sym.cos(theta_low)
+    Pt_high = Ph / sym.cos(theta_high)
+
+    if LowSide == 'Left':
+        alpha_hand_low = sym.atan((G2S_L + tower_height - V_Anchor) / (CL_L - H_Anchor))
+        alpha_hand_high = sym.atan((G2S_R + tower_height - V_Anchor) / (CL_R - H_Anchor))
+        alpha_walk_low = sym.atan((G2S_L - V_Anchor) / (CL_L - H_Anchor))
+        alpha_walk_high = sym.atan((G2S_R- V_Anchor) / (CL_R - H_Anchor))
     else:
-        W_extra_low = 0
-    if tiers_high== 2:
-        W_extra_high = (anchor_height + h_back_high) * CL_L * 0.2
-    elif tiers_low > 2:
-        W_extra_high = ((anchor_height + h_back_high) * CL_L * 0.2) + ((anchor_height + h_back_high -1) * CL_L * 0.2)
+        alpha_hand_low = sym.atan((G2S_R + tower_height - V_Anchor) / (CL_R - H_Anchor))
+        alpha_hand_high = sym.atan((G2S_L + tower_height - V_Anchor) / (CL_L - H_Anchor))
+        alpha_walk_low = sym.atan((G2S_R- V_Anchor) / (CL_R - H_Anchor))
+        alpha_walk_high = sym.atan((G2S_L - V_Anchor) / (CL_L - H_Anchor))
+
+    Pt_back_hand_low = Ph / sym.cos(alpha_hand_low)
+    Pt_back_hand_high = Ph / sym.cos(alpha_hand_high)
+    Pt_back_walk_low = Ph / sym.cos(alpha_walk_low)
+    Pt_back_walk_high = Ph / sym.cos(alpha_walk_high)
+
+    Pv_back_hand_low = Pt_back_hand_low * sym.sin(alpha_hand_low)
+    Pv_back_hand_high = Pt_back_hand_high * sym.sin(alpha_hand_high)
+    Pv_back_walk_low = Pt_back_walk_high * sym.sin(alpha_walk_low)
+    Pv_back_walk_high = Pt_back_walk_high * sym.sin(alpha_walk_high)
+
+    Pt_main_low = Pt_low
+    Pt_main_high = Pt_high
+    Pv_main_low = Pt_main_low * sym.sin(theta_low)
+    Pv_main_high = Pt_main_high * sym.sin(theta_high)
+
+    R_tower_low = Pv_back_hand_low + Pv_main_low
+    R_tower_high = Pv_back_hand_high + Pv_main_high
+    max_force = Pt_back_hand_low
+    max_cable_tension = Lookups.iloc[5, 0]
+
+    FOS_CABLE = max_cable_tension / (max_force / TotalCables)
+
+    PhaseProfile.expression_size(FOS_CABLE=FOS_CABLE)
+
+    ## Ramp Geometry
+    PhaseProfile.phase('Ramp Geometry')
+    back_low = h_back_low + anchor_height
+    back_high = h_back_high + anchor_height
+
+    if LowSide == 'Left':
+        area_ramp_base_low = (CL_L * y_walk_left) - tiers_loss_low - anchor_area
+        area_ramp_base_high = (CL_R * y_walk_right) - tiers_loss_high - anchor_area
+        ramp_loss_low = abs((back_low) - G2S_L) * CL_L * 0.5  # zero if no upper triangle
+        ramp_loss_high = abs((back_high) - G2S_R) * CL_R * 0.5  # zero if no upper triangle
+        start_area_ramp_low = area_ramp_base_low - ramp_loss_low
+        start_area_ramp_high = area_ramp_base_high - ramp_loss_high
+        ramp_angle_low = sym.atan((abs((back_low) - G2S_L)) / CL_L)  # zero if no upper triangle
+        ramp_angle_high = sym.atan((abs((back_high) - G2S_R)) / CL_R)  # zero if no upper triangle
+        area_low_30_50 = (CL_L * sym.tan(ramp_angle_low) * CL_L * 0.5) + (
+                    (-1 * ((CL_L * sym.tan(ramp_angle_low)) - 1)) * CL_L)
+        area_low_30_70 = (CL_L * sym.tan(ramp_angle_low) * CL_L * 0.5) + (
+                    (-1 * ((CL_L * sym.tan(ramp_angle_low)) - 2)) * CL_L)
+        area_high_30_50 = (CL_R * sym.tan(ramp_angle_high) * CL_R * 0.5) + (
+                    (-1 * ((CL_R * sym.tan(ramp_angle_high)) - 1)) * CL_R)
+        area_high_30_70 = (CL_R * sym.tan(ramp_angle_high) * CL_R * 0.5) + (
+                    (-1 * ((CL_R * sym.tan(ramp_angle_high)) - 2)) * CL_R)
+        bottom_slope_angle_low = sym.atan((G2S_L - y_walk_left) / CL_L)  # negative if y_walk is greater than G2S, in this case we go 0.5 up the foundation and subtract a bit for losses
+        bottom_slope_angle_high = sym.atan((G2S_R - y_walk_right) / CL_R)
     else:
-        W_extra_high = 0
-
-# W_ramp_low = (W_extra_low * d_masonry) + (area_ramp_low * base_wall_thickness * d_masonry)
-# W_ramp_high = (W_extra_high * d_masonry) + (area_ramp_high * base_wall_thickness * d_masonry)
-W_ramp_low = ramp_volume_total_low * d_masonry
-W_ramp_high = ramp_volume_total_high * d_masonry
-
-        #fill
-# W_fill_low = (area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_low * (ramp_width - (2 * base_wall_thickness)) * d_soil)  # Assume extra is built out not in to the fill and add soil
-# W_fill_high = (area_ramp_high * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_high * (ramp_width - (2 * base_wall_thickness)) * d_soil)
-W_fill_low = (start_area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_low * (ramp_width - (2 * base_wall_thickness)) * d_soil)
-W_fill_high = (start_area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_high * (ramp_width - (2 * base_wall_thickness)) * d_soil)
-        #Tiers
-if tiers_low < 1:
-    W_tiers_low = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((1.26 * d_fill) + (2.475 * d_masonry))
-elif tiers_low == 1:
-    W_tiers_low = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry))
-elif tiers_low == 2:
-    W_tiers_low = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry)) + ((6.58 * d_fill) + (10.03 * d_masonry))
-elif tiers_low == 3:
-    W_tiers_low = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry)) + ((6.58 * d_fill) + (10.03 * d_masonry)) + ((9 * d_fill) + (12.96 * d_masonry))
-elif tiers_low > 3:
-    W_tiers_low = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry)) + ((6.58 * d_fill) + (10.03 * d_masonry)) + ((13.5 * d_fill) + (19.44 * d_masonry))
-
-if tiers_high < 1:
-    W_tiers_high = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((1.26 * d_fill) + (2.475 * d_masonry))
-elif tiers_high == 1:
-    W_tiers_high = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry))
-elif tiers_high == 2:
-    W_tiers_high = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry)) + ((6.58 * d_fill) + (10.03 * d_masonry))
-elif tiers_high == 3:
-    W_tiers_high = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry)) + ((6.58 * d_fill) + (10.03 * d_masonry)) + ((9 * d_fill) + (12.96 * d_masonry))
-elif tiers_high > 3:
-    W_tiers_high = ((4.42 * d_fill) + (7.36 * d_masonry)) + ((2.52 * d_fill) + (4.95 * d_masonry)) + ((6.58 * d_fill) + (10.03 * d_masonry)) + ((13.5 * d_fill) + (19.44 * d_masonry))
-
-Pabut_low = W_backwall_low + W_anchor + W_rampcap_low + W_ramp_low + W_fill_low + Ptower + W_tiers_low
-Pabut_high = W_backwall_high + W_anchor + W_rampcap_high + W_ramp_high + W_fill_high + Ptower + W_tiers_high
-
-
-    # Cable vertical forces (for)
-Pv_tower_low = Pv_main_low + Pv_back_hand_belt_low + Pv_back_walk_belt_low
-Pv_tower_high = Pv_main_high + Pv_back_hand_belt_low + Pv_back_walk_belt_low
-
-    # Sidewall friction
-if tiers_low > 3:
-    Avg_Embedment_low = (1.5 + (h_back_low + anchor_height)) / 2
-else:
-    Avg_Embedment_low = (1 + (h_back_low + anchor_height))/2
-if tiers_high > 3:
-    Avg_Embedment_high = (1.5 + (h_back_high + anchor_height))/2
-else:
-    Avg_Embedment_high = (1 + (h_back_high + anchor_height)) / 2
+        area_ramp_base_low = (CL_R * y_walk_right) - tiers_loss_low - anchor_area
+        area_ramp_base_high = (CL_L * y_walk_left) - tiers_loss_high - anchor_area
+        ramp_loss_low = abs((back_low) - G2S_R) * CL_R * 0.5  # zero if no upper triangle
+        ramp_loss_high = abs((back_high) - G2S_L) * CL_L * 0.5  # zero if no upper triangle
+        start_area_ramp_low = area_ramp_base_low - ramp_loss_low
+        start_area_ramp_high = area_ramp_base_high - ramp_loss_high
+        ramp_angle_low = sym.atan((abs((back_low) - G2S_R)) / CL_R)  # zero if no upper triangle
+        ramp_angle_high = sym.atan((abs((back_high) - G2S_L)) / CL_L)  # zero if no upper triangle
+        area_low_30_50 = (CL_R * sym.tan(ramp_angle_low) * CL_R * 0.5) + (
+                    (-1 * ((CL_R * sym.tan(ramp_angle_low)) - 1)) * CL_R)
+        area_low_30_70 = (CL_R * sym.tan(ramp_angle_low) * CL_R * 0.5) + (
+                    (-1 * ((CL_R * sym.tan(ramp_angle_low)) - 2)) * CL_R)
+        area_high_30_50 = (CL_L * sym.tan(ramp_angle_high) * CL_L * 0.5) + (
+                    (-1 * ((CL_L * sym.tan(ramp_angle_high)) - 1)) * CL_L)
+        area_high_30_70 = (CL_L * sym.tan(ramp_angle_high) * CL_L * 0.5) + (
+                    (-1 * ((CL_L * sym.tan(ramp_angle_high)) - 2)) * CL_L)
+        bottom_slope_angle_low = sym.atan(abs(G2S_R - y_walk_right) / CL_R)
+        bottom_slope_angle_high = sym.atan(abs(G2S_L - y_walk_left) / CL_L)
+
+
+    # 30 cm walls
+
+    volume_30_low = start_area_ramp_low * 0.3
+    volume_50_low = 0
+    volume_70_low = 0
+    volume_30_high = start_area_ramp_high * 0.3
+    volume_50_high = 0
+    volume_70_high = 0
 
-if LowSide == 'Left':
-    if tiers_low < 2:
-        friction_area_low = Avg_Embedment_low * CL_L + (2.3 / 2) + 0.25
-        extraCL_L = 2.3 - 0.9 + CL_L #extra amount of tier past the CL to the x_fnd value
-    elif tiers_low == 2:
-        friction_area_low = Avg_Embedment_low * CL_L + (2.95 / 2) + 0.325
-        extraCL_L = 2.95 - 1.15 + CL_L
-    elif tiers_low > 2:
-        friction_area_low = Avg_Embedment_low * CL_L + (3.6 / 2) + 0.4
-        extraCL_L = 3.6 - 1.4 + CL_L
-    if tiers_high < 2:
-        friction_area_high = Avg_Embedment_high * CL_R + (2.3 / 2) + 0.25
-        extraCL_H = 2.3 - 0.9 + CL_R
-    elif tiers_high == 2:
-        friction_area_high = Avg_Embedment_high * CL_R + (2.95 / 2) + 0.325
-        extraCL_H = 2.95 - 1.15 + CL_R
-    elif tiers_high > 2:
-        friction_area_high = Avg_Embedment_high * CL_R + (3.6 / 2) + 0.4
-        extraCL_H = 3.6 - 1.4 + CL_R
-else:
-    if tiers_low < 2:
-        friction_area_low = Avg_Embedment_low * CL_R + (2.3 / 2) + 0.25
-        extraCL_L = 2.3 - 0.9 + CL_R
-    elif tiers_low == 2:
-        friction_area_low = Avg_Embedment_low * CL_R + (2.95 / 2) + 0.325
-        extraCL_L = 2.95 - 1.15 + CL_R
+    if tiers_low == 2:
+        volume_50_low = (start_area_ramp_low - area_low_30_50) * 0.2
+        area_50_low = start_area_ramp_low - area_low_30_50
     elif tiers_low > 2:
-        friction_area_low = Avg_Embedment_low * CL_R + (3.6 / 2) + 0.4
-        extraCL_L = 3.6 - 1.4 + CL_R
-    if tiers_high < 2:
-        friction_area_high = Avg_Embedment_high * CL_L + (2.3 / 2) + 0.25
-        extraCL_H = 2.3 - 0.9 + CL_L
-    elif tiers_high == 2:
-        friction_area_high = Avg_Embedment_high * CL_L + (2.95 / 2) + 0.325
-        extraCL_H = 2.95 - 1.15 + CL_L
+        volume_50_low = (start_area_ramp_low - area_low_30_50) * 0.2
+        volume_70_low = (start_area_ramp_low - area_low_30_70) * 0.4
+        area_50_low = start_area_ramp_low - area_low_30_50
+        area_70_low = start_area_ramp_low - area_low_30_70
+
+    if tiers_high == 2:
+        volume_50_high = (start_area_ramp_high - area_high_30_50) * 0.2
+        area_50_low = start_area_ramp_high - area_high_30_50
     elif tiers_high > 2:
-        friction_area_high = Avg_Embedment_high * CL_L + (3.6 / 2) + 0.4
-        extraCL_H = 3.6 - 1.4 + CL_L
-
-P_sidewall_low = 2 * (1 - sym.sin(mp.radians(phi))) * d_soil * (Avg_Embedment_low/2) * sym.tan(mp.radians(15)) * friction_area_low
-P_sidewall_high = 2 * (1 - sym.sin(mp.radians(phi))) * d_soil * (Avg_Embedment_high/2) * sym.tan(mp.radians(15)) * friction_area_high
-
-    # Sliding forces against
-if LowSide == 'Left':
-    B_low =  mp.radians(Constants.iloc[10, 1]) #soil profile slope in radians
-    B_high = mp.radians(Constants.iloc[11, 1])
-else:
-    B_low = mp.radians(Constants.iloc[11, 1])
-    B_high = mp.radians(Constants.iloc[10, 1])
-
-Ka_low = sym.cos(B_low) * (sym.cos(B_low) - sym.sqrt((sym.cos(B_low)**2)-(sym.cos(mp.radians(phi))**2))) / (sym.cos(B_low) + sym.sqrt((sym.cos(B_low)**2)-(sym.cos(mp.radians(phi))**2)))
-Ka_high = sym.cos(B_high) * (sym.cos(B_high) - sym.sqrt((sym.cos(B_high)**2)-(sym.cos(mp.radians(phi))**2))) / (sym.cos(B_high) + sym.sqrt((sym.cos(B_high)**2)-(sym.cos(mp.radians(phi))**2)))
-P_active_low = 0.5 * Ka_low * d_soil * ((sym.tan(B_low) * (extraCL_L))**2) * ramp_width
-P_active_high = 0.5 * Ka_high * d_soil * ((sym.tan(B_high) * (extraCL_H))**2) * ramp_width
-
-Ph_tower_low = Ph - Ph_back_hand_belt_low - Ph_back_walk_belt_low
-Ph_tower_high = Ph - Ph_back_hand_belt_high - Ph_back_walk_belt_high
-Ph_anchor_low = Ph_back_hand_belt_low + Ph_back_walk_belt_low
-Ph_anchor_high = Ph_back_hand_belt_high + Ph_back_walk_belt_high
-
-Rs_low = Ph_anchor_low + Ph_tower_low + P_active_low + P_surcharge
-Rs_high = Ph_anchor_high + Ph_tower_high + P_active_high + P_surcharge
-
-    #Convert to transformed
-Rs_low_transformed = P_active_low + Ph_anchor_low * sym.cos(bottom_slope_angle_low) + Ph_tower_low - (bottom_forces * sym.sin(bottom_slope_angle_low) * W_ramp_low)
-Rs_high_transformed = P_active_high + Ph_anchor_high * sym.cos(bottom_slope_angle_high) + Ph_tower_high - (bottom_forces * sym.sin(bottom_slope_angle_high) * W_ramp_high)
-
-    # Convert vertical forces to frictional resistance
-sliding_coefficient = sym.tan(mp.radians(phi))
-
-total_vertical_low = (Pabut_low + Pv_tower_low - Pv_anchor_low) * sliding_coefficient
-total_vertical_high = (Pabut_high + Pv_tower_high - Pv_anchor_high) * sliding_coefficient
-Rn_low = P_sidewall_low + total_vertical_low #sliding resistance forces
-Rn_high = P_sidewall_high + total_vertical_high
-
-    #Convert to transformed
-Rn_low_transformed =  P_sidewall_low + sliding_coefficient * (W_anchor - Pv_anchor_low + Pv_tower_low + W_tiers_low + Ptower + ((W_backwall_low + W_rampcap_low + W_fill_low + W_ramp_low) * sym.cos(bottom_slope_angle_low)) + (Ph_anchor_low * sym.sin(bottom_slope_angle_low) * bottom_forces))
-Rn_high_transformed = P_sidewall_high + sliding_coefficient * (W_anchor - Pv_anchor_high + Pv_tower_high + W_tiers_high + Ptower + ((W_backwall_high + W_rampcap_high + W_fill_high + W_ramp_high) * sym.cos(bottom_slope_angle_high)) + (Ph_anchor_high * sym.sin(bottom_slope_angle_high) * bottom_forces))
-
-FOS_SLIDING_LOW = Rn_low_transformed / Rs_low_transformed
-FOS_SLIDING_HIGH = Rn_high_transformed / Rs_high_transformed
-
-###### PASTE SAG CALCULATOR ##########
-
-# Excel Inputs
-
-sag_design_i = Constants.iloc[6, 1]  # % design sag
-altSpan = Span - 2*increment
-
-LHS_backspan_walk = sym.sqrt((G2S_L-V_Anchor-offset)**2+(CL_L-H_Anchor)**2)
-LHS_backspan_hand = sym.sqrt((G2S_L-V_Anchor+tower_height)**2+(CL_L-H_Anchor)**2)
-LHS_alpha_walk = mp.degrees(sym.atan((G2S_L-V_Anchor-offset)/(CL_L-H_Anchor)))
-LHS_alpha_hand = mp.degrees(sym.atan((G2S_L-V_Anchor+tower_height)/(CL_L-H_Anchor)))
-
-RHS_backspan_walk = sym.sqrt((G2S_R-V_Anchor-offset)**2+(CL_R-H_Anchor)**2)
-RHS_backspan_hand = sym.sqrt((G2S_R-V_Anchor+tower_height)**2+(CL_R-H_Anchor)**2)
-RHS_alpha_walk = mp.degrees(sym.atan((G2S_R-V_Anchor-offset)/(CL_R-H_Anchor)))
-RHS_alpha_hand = mp.degrees(sym.atan((G2S_R-V_Anchor+tower_height)/(CL_R-H_Anchor)))
-
-# Create the point geometry
-Geometry = pd.read_excel(path, sheet_name="Geometry")
-max_len = int(mp.floor(Span)+3)
-points = Array(Geometry.iloc[1:max_len, 0])
-point_increment = Array(Geometry.iloc[1:max_len, 2])
-
-# lowercase x is X and uppercase x is X'
-x_lin = Array(Geometry.iloc[1:max_len, 3])
-y_lin = Array(Geometry.iloc[1:max_len, 4])
-X_lin = Array(Geometry.iloc[1:max_len, 5])
-Y_lin = Array(Geometry.iloc[1:max_len, 6])
-
-valZ = [x1, x2, Span*(sag_design_i/100), x4]
-loadZ = [W_cable, W_cable, W_dead, W_live+W_dead]
-
-## INITIALIZE 
-x = sym.zeros(len(x_lin), 4)
-y = sym.zeros(len(x_lin), 4)
-X = sym.zeros(len(x_lin), 4)
-Y = sym.zeros(len(x_lin), 4)
-dist_cable = sym.zeros(len(x_lin), 4)
-dist_total = sym.zeros(len(x_lin), 4)
-sag_cable = sym.zeros(len(x_lin), 4)
-T = sym.zeros(len(x_lin), 4)
-k_index = Array(range(4))
-index2 = Array(range(len(x_lin)))
-index = Array(range(len(x_lin)-1))
-
-#interim storage variables
-main_cable_length = sym.zeros(1, 4)
-deltaL = sym.zeros(1, 4)
-force_backstay_elongation_left = sym.zeros(1, 4)
-force_backstay_elongation_right = sym.zeros(1, 4)
-force_main_elongation = sym.zeros(1, 4)
-force_elongation = sym.zeros(1, 4)
-left_avg_backstay_tension = sym.zeros(1, 4)
-right_avg_backstay_tension = sym.zeros(1, 4)
-Pavg = sym.zeros(1, 4)
-strain = sym.zeros(1, 4)
-
-for k in k_index:
-
-    h = valZ[k]
-    W = loadZ[k]
-
-    if LowSide == 'Right':
-        x_init = Span * -1 * (4 * h + DH) / (8 * h)
+        volume_50_high = (start_area_ramp_high - area_high_30_50) * 0.2
+        volume_70_high = (start_area_ramp_high - area_high_30_70) * 0.4
+        area_50_low = start_area_ramp_high - area_high_30_50
+        area_70_low = start_area_ramp_high - area_high_30_70
+
+    ramp_volume_total_low = volume_30_low + volume_50_low + volume_70_low
+    ramp_volume_total_high = volume_30_high + volume_50_high + volume_70_high
+
+    PhaseProfile.expression_size(ramp_volume_total_low=ramp_volume_total_low, ramp_volume_total_high=ramp_volume_total_high)
+    ## End Ramp Geometry
+
+        # Uplift FOS
+    PhaseProfile.phase('Uplift')
+    if LowSide == 'Left':
+        area_low = (CL_L * (anchor_height + h_back_low)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_low))
+        area_high = (CL_R * (anchor_height + h_back_high)) + (0.5 * CL_R * (G2S_R - anchor_height - h_back_high))
+        ramp_angle_low = sym.atan((G2S_L - anchor_height - h_back_low) / CL_L)
+        ramp_angle_high = sym.atan((G2S_R - anchor_height - h_back_high) / CL_R)
     else:
-        x_init = Span * -1 * (4 * h - DH) / (8 * h)
-
-    for n in index2:
-         x[n, k] = x_lin[n] + x_init
-         y[n, k] = (h / ((Span / 2) ** 2)) * (x[n, k] ** 2)
-
-    if LowSide == 'Right':
-        x_towerVal = (Span / 2) - ((Span / (8 * h)) * (4 * h + DH))
+        area_low = (CL_R * (anchor_height + h_back_low)) + (0.5 * CL_R * (G2S_R - anchor_height - h_back_low))
+        area_high = (CL_L * (anchor_height + h_back_high)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_high))
+        ramp_angle_low = sym.atan((G2S_R - anchor_height - h_back_low) / CL_R)
+        ramp_angle_high = sym.atan((G2S_L - anchor_height - h_back_high) / CL_L)
+
+    uplift_x_low = (np.tan(np.radians(30)) * (anchor_height + h_back_low))  #x distance past anchor for overburden
+    uplift_x_high = (np.tan(np.radians(30)) * (anchor_height + h_back_high))  #x distance past anchor for overburden
+    uplift_y_low = (uplift_x_low + b2) * sym.tan(ramp_angle_low)
+    uplift_y_high = (uplift_x_high + b2) * sym.tan(ramp_angle_high)
+    ramplength_overburden_low = uplift_y_low / sym.sin(ramp_angle_low)
+    ramplength_overburden_high = uplift_y_high / sym.sin(ramp_angle_high)
+
+    overburden_area_low = (b2 * (anchor_height + h_back_low)) + (uplift_x_low * (anchor_height + h_back_low) * 0.5)+ ((uplift_x_low + b2) * (uplift_y_low) * 0.5) + 0.5 * (b2 + (back_low * sym.tan(np.radians(30)))) * sym.tan(ramp_angle_low) * (b2 + (back_low * sym.tan(np.radians(30))))
+    overburden_area_high = (b2 * (anchor_height + h_back_high)) + (uplift_x_high * (anchor_height + h_back_high) * 0.5)+ ((uplift_x_high + b2) * (uplift_y_high) * 0.5) + 0.5 * (b2 + (back_high * sym.tan(np.radians(30)))) * sym.tan(ramp_angle_high) * (b2 + (back_high * sym.tan(np.radians(30))))
+
+
+    if LowSide == 'Left':
+        soil_area_low = (ground_height_low * (CL_L - H_tiers_low - b2))
+        soil_area_high = (ground_height_high * (CL_R - H_tiers_high - b2))
+        rampwall_area_low = area_low - (tiers_loss_low / 100) - anchor_area - soil_area_low   # ramp wall area in m2
+        rampwall_area_high = area_high - (tiers_loss_high / 100) - anchor_area - soil_area_high # ramp wall area in m2
     else:
-        x_towerVal = (Span / 2) - ((Span / (8 * h)) * (4 * h - DH))
-
-    y_towerVal = ((4 * h + DH) ** 2) / (16 * h)
-    for n in index2:
-        X[n, k] = x[n, k] - x_towerVal
-        Y[n, k] = y[n, k] - y_towerVal
-    for i in index:
-        dist_cable[i+1, k] = sym.sqrt((X[i, k] - X[i + 1, k]) ** 2 + (Y[i, k] - Y[i + 1, k]) ** 2)
-        dist_total[i + 1, k] = dist_total[i, k] + dist_cable[i+1, k]
-
-    for n in index2:
-        sag_cable[n, k] = Y_lin[n] - Y[n, k]
-
-    # set up the column for construction values
-    if LowSide == 'Right':
-        xleft = Span * (4 * h + DH) / (8 * h)
-        yleft = ((4 * h + DH) ** 2) / (16 * h)
-        xright = Span * (4 * h - DH) / (8 * h)
-        yright = ((4 * h - DH) ** 2) / (16 * h)
-        left_tower_cable_angle = mp.degrees(sym.atan((4 * h + DH) / Span))
-        right_tower_cable_angle = mp.degrees(sym.atan((4 * h - DH) / Span))
+        soil_area_low = (ground_height_low * (CL_R - H_tiers_low - b2))
+        soil_area_high = (ground_height_high * (CL_L - H_tiers_high - b2))
+        rampwall_area_low = area_high - (tiers_loss_high / 100) - anchor_area - soil_area_high
+        rampwall_area_high = area_low - (tiers_loss_low / 100) - anchor_area - soil_area_low
+
+        # concrete (ramp and anchor)
+    overburden_concrete_low = ((ramplength_overburden_low * ramp_thickness) + anchor_area) * ramp_width  #m3
+    overburden_concrete_high = ((ramplength_overburden_high * ramp_thickness) + anchor_area) * ramp_width
+        # masonry (backwall)
+    overburden_masonry_low = (backwall_thickness * h_back_low) * ramp_width
+    overburden_masonry_high = (backwall_thickness * h_back_high) * ramp_width
+        # rest of it
+    overburden_leftover_low = (overburden_area_low * ramp_width) - overburden_concrete_low - overburden_masonry_low
+    overburden_leftover_high = (overburden_area_high * ramp_width) - overburden_concrete_high - overburden_masonry_high
+
+    W_overburden_low =overburden_concrete_low * d_concrete + overburden_masonry_low * d_masonry + overburden_leftover_low * d_fill
+    W_overburden_high =overburden_concrete_high * d_concrete + overburden_masonry_high * d_masonry + overburden_leftover_high * d_fill
+    Vn_low = W_overburden_low
+    Vn_high = W_overburden_high
+
+        #set up uplift forces
+    Pt_walk_tot_low = Pt_main_low * (WalkNumber/TotalCables)
+    Pt_walk_tot_high = Pt_main_high * (WalkNumber/TotalCables)
+    Pt_hand_tot_low = Pt_main_low * (HandNumber/TotalCables)
+    Pt_hand_tot_high = Pt_main_high * (HandNumber/TotalCables)
+
+    Pt_back_walk_belt_low = Pt_walk_tot_low * sym.exp((-mu_saddle) * (theta_low+alpha_walk_low + 0.04))
+    Pt_back_walk_belt_high = Pt_walk_tot_high * sym.exp((-mu_saddle) * (theta_high+alpha_walk_high + 0.04))
+    Pt_back_hand_belt_low = Pt_hand_tot_low * sym.exp((-mu_saddle) * (theta_low+alpha_hand_low + 0.04))
+    Pt_back_hand_belt_high = Pt_hand_tot_high * sym.exp((-mu_saddle) * (theta_high+alpha_hand_high + 0.04))
+
+    Pv_back_walk_belt_low = Pt_back_walk_belt_low * sym.sin(alpha_walk_low)
+    Pv_back_walk_belt_high = Pt_back_walk_belt_high * sym.sin(alpha_walk_high)
+    Pv_back_hand_belt_low = Pt_back_hand_belt_low * sym.sin(alpha_hand_low)
+    Pv_back_hand_belt_high = Pt_back_hand_belt_high * sym.sin(alpha_hand_high)
+
+    Ph_back_walk_belt_low = Pt_back_walk_belt_low * sym.cos(alpha_walk_low)
+    Ph_back_walk_belt_high = Pt_back_walk_belt_high * sym.cos(alpha_walk_high)
+    Ph_back_hand_belt_low = Pt_back_hand_belt_low * sym.cos(alpha_hand_low)
+    Ph_back_hand_belt_high = Pt_back_hand_belt_high * sym.cos(alpha_hand_high)
+
+    Pv_anchor_low = Pv_back_walk_belt_low + Pv_back_hand_belt_low
+    Pv_anchor_high = Pv_back_walk_belt_high + Pv_back_hand_belt_high
+    Vs_low = Pv_anchor_low
+    Vs_high = Pv_anchor_high
+
+    FOS_UPLIFT_LOW = Vn_low / Vs_low
+    FOS_UPLIFT_HIGH = Vn_high / Vs_high
+    PhaseProfile.expression_size(FOS_UPLIFT_LOW=FOS_UPLIFT_LOW, FOS_UPLIFT_HIGH=FOS_UPLIFT_HIGH)
+
+        # Sliding FOS
+    PhaseProfile.phase('Sliding')
+
+        # Weight resisting forces (soil and ramp walls)
+
+            #backwall
+    W_backwall_low = ramp_width * backwall_thickness * h_back_low * d_masonry  #kN
+    W_backwall_high = ramp_width * backwall_thickness * h_back_high * d_masonry
+
+            #anchor
+    W_anchor = anchor_area * ramp_width * d_concrete  #kN
+
+            #cap
+    W_rampcap_low = ramplength_overburden_low * ramp_thickness * ramp_width * d_masonry
+    W_rampcap_high = ramplength_overburden_high * ramp_thickness * ramp_width * d_masonry
+
+            #rampwalls
+    area_ramp_low = area_low - soil_area_low - anchor_area - (backwall_thickness * h_back_low) - (ramplength_overburden_low * ramp_thickness) - tiers_loss_low
+    area_ramp_high = area_high - soil_area_high - anchor_area - (backwall_thickness * h_back_high) - (ramplength_overburden_high * ramp_thickness) - tiers_loss_high
+
+                #if the tiers are 2, we want to subtract one meter down from the top
+    if LowSide == 'Left':
+        upper_triangle = (G2S_L - anchor_height - h_back_low)
+        upper_triangle_high = (G2S_R - anchor_height - h_back_high)
+        if tiers_low == 2:
+            W_extra_low = (anchor_height + h_back_low) * (CL_L - H_Anchor - (1.15/2)) * 0.2  # 1.15/2 is the average of how much tiers stick into the extra wall
+        elif tiers_low > 2:
+            W_extra_low = ((anchor_height + h_back_low) * (CL_L - H_Anchor - (1.4/2)) * 0.2) + ((anchor_height + h_back_low -1) * (CL_L - H_Anchor - (1.4/2)) * 0.2)
+        else:
+            W_extra_low = 0
+        if tiers_high== 2:
+            W_extra_high = (anchor_height + h_back_high) * (CL_R - H_Anchor - (1.15/2)) * 0.2
+        elif tiers_low > 2:
+            W_extra_high = ((anchor_height + h_back_high) * (CL_R - H_Anchor - (1.4/2)) * 0.2) + ((anchor_height + h_back_high -1) * (CL_R - H_Anchor - (1.4/2)) * 0.2)
+        else:
+            W_extra_high = 0
+    else:  #high side is left
+        upper_triangle = (G2S_R - anchor_height - h_back_low)
+        upper_triangle_high = (G2S_L - anchor_height - h_back_high)
+        if tiers_low == 2:
+            W_extra_low = (anchor_height + h_back_low) * CL_R * 0.2
+        elif tiers_low > 2:
+            W_extra_low = ((anchor_height + h_back_low) * CL_R * 0.2) + ((anchor_height + h_back_low -1) * CL_R * 0.2)
+        else:
+            W_extra_low = 0
+        if tiers_high== 2:
+            W_extra_high = (anchor_height + h_back_high) * CL_L * 0.2
+        elif tiers_low > 2:
+            W_extra_high = ((anchor_height + h_back_high) * CL_L * 0.2) + ((anchor_height + h_back_high -1) * CL_L * 0.2)
+        else:
+            W_extra_high = 0
+
+    # W_ramp_low = (W_extra_low * d_masonry) + (area_ramp_low * base_wall_thickness * d_masonry)
+    # W_ramp_high = (W_extra_high * d_masonry) + (area_ramp_high * base_wall_thickness * d_masonry)
+    W_ramp_low = ramp_volume_total_low * d_masonry
+    W_ramp_high = ramp_volume_total_high * d_masonry
+
+            #fill
+    # W_fill_low = (area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_low * (ramp_width - (2 * base_wall_thickness)) * d_soil)  # Assume extra is built out not in to the fill and add soil
+    # W_fill_high = (area_ramp_high * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_high * (ramp_width - (2 * base_wall_thickness)) * d_soil)
+    W_fill_low = (start_area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_low * (ramp_width - (2 * base_wall_thickness)) * d_soil)
+    W_fill_high = (start_area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * d_fill) + (soil_area_high * (ramp_width - (2 * base_wall_thickness)) * d_soil)
+            #Tiers
+    W_tiers_low, W_tiers_high = (tiers['fill_volume'] * d_fill) + (tiers['masonry_volume'] * d_masonry)
+
+    Pabut_low = W_backwall_low + W_anchor + W_rampcap_low + W_ramp_low + W_fill_low + Ptower + W_tiers_low
+    Pabut_high = W_backwall_high + W_anchor + W_rampcap_high + W_ramp_high + W_fill_high + Ptower + W_tiers_high
+
+
+        # Cable vertical forces (for)
+    Pv_tower_low = Pv_main_low + Pv_back_hand_belt_low + Pv_back_walk_belt_low
+    Pv_tower_high = Pv_main_high + Pv_back_hand_belt_low + Pv_back_walk_belt_low
+
+        # Sidewall friction
+    Avg_Embedment_low = (fnd_height_low + (h_back_low + anchor_height)) / 2
+    Avg_Embedment_high = (fnd_height_high + (h_back_high + anchor_height)) / 2
+
+    if LowSide == 'Left':
+        CL_low = CL_L
+        CL_high = CL_R
     else:
-        xleft = Span * (4 * h - DH) / (8 * h)
-        yleft = ((4 * h - DH) ** 2) / (16 * h)
-        xright = Span * (4 * h + DH) / (8 * h)
-        yright = ((4 * h + DH) ** 2) / (16 * h)
-        left_tower_cable_angle = mp.degrees(sym.atan((4 * h - DH) / Span))
-        right_tower_cable_angle = mp.degrees(sym.atan((4 * h + DH) / Span))
-
-    left_backstay_avg_angle = (HandNumber * LHS_alpha_hand + WalkNumber * LHS_alpha_walk) / TotalCables
-    right_backstay_avg_angle = (HandNumber * RHS_alpha_hand + WalkNumber * RHS_alpha_walk) / TotalCables
-    Ph = (W * (Span ** 2)) / (8 * h)
-    Pleft = Ph * sym.sqrt(1 + (4 * (yleft ** 2) / (xleft ** 2)))
-    Pright = Ph * sym.sqrt(1 + (4 * (yright ** 2) / (xright ** 2)))
-    # left_avg_backstay_tension[k] = Pleft * (1 - (0.1 * sym.sin(mp.radians(left_tower_cable_angle)))) / (
-    #             1 + (0.1 * sym.sin(mp.radians(left_backstay_avg_angle))))
-    # right_avg_backstay_tension[k] = Pright * (
-    #             1 - (0.1 * sym.sin(mp.radians(right_tower_cable_angle)))) / (
-    #                                                1 + (0.1 * sym.sin(mp.radians(right_backstay_avg_angle))))
-    left_avg_backstay_tension[k] = Pleft * sym.exp(-1 * saddle_friction * (0.04 + mp.radians(left_tower_cable_angle) + mp.radians(left_backstay_avg_angle)))
-    right_avg_backstay_tension[k] = Pright * sym.exp(-1 * saddle_friction * (0.04 + mp.radians(right_tower_cable_angle) + mp.radians(right_backstay_avg_angle)))
-
-    for j in index2:
-        T[j, k] = Ph * sym.sqrt(1 + (4 * (y[j, k] ** 2) / (x[j, k] ** 2)))
-
-    Pavg[k] = sum(T[:, k]) / len(x_lin)
-    left_avg_backstay_length = (HandNumber * LHS_backspan_hand + WalkNumber * LHS_backspan_walk) / TotalCables
-    right_avg_backstay_length = (HandNumber * RHS_backspan_hand + WalkNumber * RHS_backspan_walk) / TotalCables
-    main_cable_length[k] = dist_total[(len(x_lin)-1), k]
-    cable_length_sum = left_avg_backstay_length + right_avg_backstay_length + main_cable_length[k]
-
-    if k > 0:
-        deltaL[k] = (main_cable_length[k] - main_cable_length[k-1]) * 1000 # mm
-        strain[k] = deltaL[k] / main_cable_length[k] / 1000
+        CL_low = CL_R
+        CL_high = CL_L
+
+        # half the tier length plus its offset is the same as the tier length past the CL
+    friction_area_low = Avg_Embedment_low * CL_low + front_extra_low
+    friction_area_high = Avg_Embedment_high * CL_high + front_extra_high
+    extraCL_L = front_extra_low + CL_low  #extra amount of tier past the CL to the x_fnd value
+    extraCL_H = front_extra_high + CL_high
+
+    P_sidewall_low = 2 * (1 - sym.sin(radians(phi))) * d_soil * (Avg_Embedment_low/2) * sym.tan(mp.radians(15)) * friction_area_low
+    P_sidewall_high = 2 * (1 - sym.sin(radians(phi))) * d_soil * (Avg_Embedment_high/2) * sym.tan(mp.radians(15)) * friction_area_high
+
+        # Sliding forces against
+    if LowSide == 'Left':
+        B_low =  radians(values['slope_LHS']) #soil profile slope in radians
+        B_high = radians(values['slope_RHS'])
     else:
-        deltaL[k] = main_cable_length[k]
-        strain[k] = 0
-
-    if k > 1:
-        force_backstay_elongation_left[k] = (1000 * 1000 * left_avg_backstay_length * (left_avg_backstay_tension[k] - left_avg_backstay_tension[k - 1])) / (E_cable * A_cable)
-        force_backstay_elongation_right[k] = (1000 * 1000 * right_avg_backstay_length * (right_avg_backstay_tension[k] - right_avg_backstay_tension[k - 1])) / (E_cable * A_cable)
-        force_main_elongation[k] = (1000 * 1000 * main_cable_length[k] * (Pavg[k] - Pavg[k - 1])) / (E_cable * A_cable)
-        force_elongation[k] = force_backstay_elongation_left[k] + force_backstay_elongation_right[k] + force_main_elongation[k]
-    elif k < 1:
-        force_backstay_elongation_left[k] = 0
-        force_backstay_elongation_right[k] = 0
-        force_main_elongation[k] = 0
-        force_elongation[k] = 0
+        B_low = radians(values['slope_RHS'])
+        B_high = radians(values['slope_LHS'])
+
+    Ka_low = sym.cos(B_low) * (sym.cos(B_low) - sym.sqrt((sym.cos(B_low)**2)-(sym.cos(radians(phi))**2))) / (sym.cos(B_low) + sym.sqrt((sym.cos(B_low)**2)-(sym.cos(radians(phi))**2)))
+    Ka_high = sym.cos(B_high) * (sym.cos(B_high) - sym.sqrt((sym.cos(B_high)**2)-(sym.cos(radians(phi))**2))) / (sym.cos(B_high) + sym.sqrt((sym.cos(B_high)**2)-(sym.cos(radians(phi))**2)))
+    P_active_low = 0.5 * Ka_low * d_soil * ((sym.tan(B_low) * (extraCL_L))**2) * ramp_width
+    P_active_high = 0.5 * Ka_high * d_soil * ((sym.tan(B_high) * (extraCL_H))**2) * ramp_width
+
+    Ph_tower_low = Ph - Ph_back_hand_belt_low - Ph_back_walk_belt_low
+    Ph_tower_high = Ph - Ph_back_hand_belt_high - Ph_back_walk_belt_high
+    Ph_anchor_low = Ph_back_hand_belt_low + Ph_back_walk_belt_low
+    Ph_anchor_high = Ph_back_hand_belt_high + Ph_back_walk_belt_high
+
+    Rs_low = Ph_anchor_low + Ph_tower_low + P_active_low + P_surcharge
+    Rs_high = Ph_anchor_high + Ph_tower_high + P_active_high + P_surcharge
+
+        #Convert to transformed
+    Rs_low_transformed = P_active_low + Ph_anchor_low * sym.cos(bottom_slope_angle_low) + Ph_tower_low - (bottom_forces * sym.sin(bottom_slope_angle_low) * W_ramp_low)
+    Rs_high_transformed = P_active_high + Ph_anchor_high * sym.cos(bottom_slope_angle_high) + Ph_tower_high - (bottom_forces * sym.sin(bottom_slope_angle_high) * W_ramp_high)
+
+        # Convert vertical forces to frictional resistance
+    sliding_coefficient = sym.tan(radians(phi))
+
+    total_vertical_low = (Pabut_low + Pv_tower_low - Pv_anchor_low) * sliding_coefficient
+    total_vertical_high = (Pabut_high + Pv_tower_high - Pv_anchor_high) * sliding_coefficient
+    Rn_low = P_sidewall_low + total_vertical_low #sliding resistance forces
+    Rn_high = P_sidewall_high + total_vertical_high
+
+        #Convert to transformed
+    Rn_low_transformed =  P_sidewall_low + sliding_coefficient * (W_anchor - Pv_anchor_low + Pv_tower_low + W_tiers_low + Ptower + ((W_backwall_low + W_rampcap_low + W_fill_low + W_ramp_low) * sym.cos(bottom_slope_angle_low)) + (Ph_anchor_low * sym.sin(bottom_slope_angle_low) * bottom_forces))
+    Rn_high_transformed = P_sidewall_high + sliding_coefficient * (W_anchor - Pv_anchor_high + Pv_tower_high + W_tiers_high + Ptower + ((W_backwall_high + W_rampcap_high + W_fill_high + W_ramp_high) * sym.cos(bottom_slope_angle_high)) + (Ph_anchor_high * sym.sin(bottom_slope_angle_high) * bottom_forces))
+
+    FOS_SLIDING_LOW = Rn_low_transformed / Rs_low_transformed
+    FOS_SLIDING_HIGH = Rn_high_transformed / Rs_high_transformed
+    PhaseProfile.expression_size(FOS_SLIDING_LOW=FOS_SLIDING_LOW, FOS_SLIDING_HIGH=FOS_SLIDING_HIGH)
+
+    # Calculate materials and costs
+    PhaseProfile.phase('Materials')
+
+        # Materials
+    country = Constants.iloc[12, 1]
+
+            # Cable
+    cable_left = CL_L - b1
+    cable_right = CL_R - b1
+    CableLength = TotalCables * 1.04 * (Span + cable_left + cable_right + 14 )
+
+            # Cement
+    Rand2USD = 0.064
+    Bol2USD = 0.14
+    if country == 'Bolivia':
+        cementperfill = 20  #kg/m3
+        cementpermasonry = 80
+        cementperconcrete = 350
+        sandperconcrete = 0.6  #m3/m3
+        sandpermasonry = 0.4
+        sandperfill = 0.25
+        gravelperconcrete = 0.6
+        rockpermasonry = 0.8
+        rockperfill = 0.95
+        cost_cement = 57
+        cost_sand = 250
+        cost_gravel = 270
+        cost_rock = 100
     else:
-        force_backstay_elongation_left[k] = 0  # mm
-        force_backstay_elongation_right[k] = 0  # mm
-        force_main_elongation[k] = main_cable_length[k] * (construction_stretch/100) * 1000  # mm
-        force_elongation[k] = force_backstay_elongation_left[k] + force_backstay_elongation_right[k] + force_main_elongation[k]  # mm
-
-# Set Up Equations
-
-sag_equation = (abs(deltaL[2] - force_elongation[2])) + (abs(deltaL[3] - force_elongation[3]))
-
-###### END PASTE SAG CALCULATOR
-# Calculate materials and costs
-
-    # Materials
-country = Constants.iloc[12, 1]
-
-        # Cable
-cable_left = CL_L - b1
-cable_right = CL_R - b1
-CableLength = TotalCables * 1.04 * (Span + cable_left + cable_right + 14 )
-
-        # Cement
-Rand2USD = 0.064
-Bol2USD = 0.14
-if country == 'Bolivia':
-    cementperfill = 20  #kg/m3
-    cementpermasonry = 80
-    cementperconcrete = 350
-    sandperconcrete = 0.6  #m3/m3
-    sandpermasonry = 0.4
-    sandperfill = 0.25
-    gravelperconcrete = 0.6
-    rockpermasonry = 0.8
-    rockperfill = 0.95
-    cost_cement = 57
-    cost_sand = 250
-    cost_gravel = 270
-    cost_rock = 100
-else:
-    cementperfill = 36  #kg/m3
-    cementpermasonry = 74.88
-    cementperconcrete = 360
-    sandperconcrete = 0.5  #m3/m3
-    sandpermasonry = 0.208
-    sandperfill = 0.1
-    gravelperconcrete = 0.75
-    rockpermasonry = 0.8
-    rockperfill = 0.85
-    cost_cement = 120.38
-    cost_sand = 0  #no number, things less expensive in Eswatini
-    cost_gravel = 195
-    cost_rock = 0  #no number, things less expensive in Eswatini
-
-if tiers_low < 1:
-    M_tiers_low = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((1.26 * cementperfill) + (2.475 * cementpermasonry))
-    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((1.26 * rockperfill) + (2.475 * rockpermasonry))
-    S_tiers_low = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((1.26 * sandperfill) + (2.475 * sandpermasonry))
-    E_tiers_low = 4.42 + 7.36
-    L_tiers_low = 4.42 + 7.36 + 1.26 + 2.475
-elif tiers_low == 1:
-    M_tiers_low = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry))
-    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry))
-    S_tiers_low = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry))
-    E_tiers_low = 4.42 + 7.36
-    L_tiers_low = 4.42 + 7.36 + 2.52 + 4.95
-elif tiers_low == 2:
-    M_tiers_low = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry))
-    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry))
-    S_tiers_low = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry))
-    E_tiers_low = 6.58 + 10.03
-    L_tiers_low = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03
-elif tiers_low == 3:
-    M_tiers_low = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry)) + ((9 * cementperfill) + (12.96 * cementpermasonry))
-    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((9 * rockperfill) + (12.96 * rockpermasonry))
-    S_tiers_low = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry)) + ((9 * sandperfill) + (12.96 * sandpermasonry))
-    E_tiers_low = 9 + 12.96
-    L_tiers_low = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03 + 9 + 12.96
-elif tiers_low > 3:
-    M_tiers_low = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry)) + ((13.5 * cementperfill) + (19.44 * cementpermasonry))
-    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockperpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((13.5 * rockperfill) + (19.44 * rockpermasonry))
-    S_tiers_low = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry)) + ((13.5 * sandperfill) + (19.44 * sandpermasonry))
-    E_tiers_low = 13.5 + 19.44
-    L_tiers_low = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03 + 13.5 + 19.44
-if tiers_high < 1:
-    M_tiers_high = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((1.26 * cementperfill) + (2.475 * cementpermasonry))
-    R_tiers_high = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((1.26 * rockperfill) + (2.475 * rockpermasonry))
-    S_tiers_high = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((1.26 * sandperfill) + (2.475 * sandpermasonry))
-    E_tiers_high = 4.42 + 7.36
-    L_tiers_high = 4.42 + 7.36 + 1.26 + 2.475
-elif tiers_high == 1:
-    M_tiers_high = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry))
-    R_tiers_high = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry))
-    S_tiers_high = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry))
-    E_tiers_high = 4.42 + 7.36
-    L_tiers_high = 4.42 + 7.36 + 2.52 + 4.95
-elif tiers_high == 2:
-    M_tiers_high = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry))
-    R_tiers_high = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry))
-    S_tiers_high = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry))
-    E_tiers_high = 6.58 + 10.03
-    L_tiers_high = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03
-elif tiers_high == 3:
-    M_tiers_high = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry)) + ((9 * cementperfill) + (12.96 * cementpermasonry))
-    R_tiers_high = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((9 * rockperfill) + (12.96 * rockpermasonry))
-    S_tiers_high = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry)) + ((9 * sandperfill) + (12.96 * sandpermasonry))
-    E_tiers_high = 9 + 12.96
-    L_tiers_high = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03 + 9 + 12.96
-elif tiers_high > 3:
-    M_tiers_high = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry)) + ((13.5 * cementperfill) + (19.44 * cementpermasonry))
-    R_tiers_high = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((13.5 * rockperfill) + (19.44 * rockpermasonry))
-    S_tiers_high = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry)) + ((13.5 * sandperfill) + (19.44 * sandpermasonry))
-    E_tiers_high = 13.5 + 19.44
-    L_tiers_high = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 13.5 + 9 + 19.44
-
-M_tiers = ((M_tiers_low + M_tiers_high) / 50)  #value in 50 kg bags
-
-M_ramp_low = (W_extra_low + (area_ramp_low * base_wall_thickness))* cementpermasonry  #W_extra is actually a volume
-M_ramp_high = (W_extra_high + (area_ramp_high * base_wall_thickness))* cementpermasonry
-M_ramp = (M_ramp_low + M_ramp_high) / 50
-
-M_fill_low = area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * cementperfill
-M_fill_high = area_ramp_high * (ramp_width - (2 * base_wall_thickness)) * cementperfill
-M_fill = (M_fill_low + M_fill_high) / 50
-
-M_cap_low = ramplength_overburden_low * ramp_thickness * ramp_width * cementperconcrete
-M_cap_high = ramplength_overburden_high * ramp_thickness * ramp_width * cementperconcrete
-M_cap = (M_cap_low + M_cap_high) / 50
-
-M_anchor = 2 * anchor_area * ramp_width * cementperconcrete / 50
-
-M_towers = (tower_volume * cementperconcrete)/ 50  #2.492 m3 is tower volume number, assume this is constant
-
-Cement = M_tiers + M_ramp + M_fill + M_cap + M_anchor + M_towers  #value in 50 kg bags
-
-        # Rocks
-R_tiers = R_tiers_high + R_tiers_low
-R_masonry = (W_extra_low + W_extra_high + (area_ramp_low * base_wall_thickness) + (area_ramp_high * base_wall_thickness))* rockpermasonry
-R_fill = (area_ramp_low * (ramp_width - (2 * base_wall_thickness)) + area_ramp_high * (ramp_width - (2 * base_wall_thickness))) * rockperfill
-Rocks = R_tiers + R_masonry + R_fill
-
-        # Sand
-S_tiers = S_tiers_high + S_tiers_low
-S_masonry = (W_extra_low + W_extra_high + (area_ramp_low * base_wall_thickness) + (area_ramp_high * base_wall_thickness))* sandpermasonry
-S_fill = (area_ramp_low * (ramp_width - (2 * base_wall_thickness)) + area_ramp_high * (ramp_width - (2 * base_wall_thickness))) * sandperfill
-S_concrete = (tower_volume * sandperconcrete) + (2 * anchor_area * ramp_width * sandperconcrete)
-Sand = S_tiers + S_masonry + S_fill + S_concrete
-
-        # Gravel
-Gravel = (tower_volume * gravelperconcrete) + (2 * anchor_area * ramp_width * gravelperconcrete)
-
-    # Labor (this assumes the anchor, decking and tensioning is the same, only looking into tiers, walls, and excavations
-
-        #Excavation
-Footprint_Excavation =((extraCL_L * (fnd_height_low+(sym.tan(B_low) * (extraCL_L))) / 2) + (extraCL_H * (fnd_height_high+(sym.tan(B_high) * (extraCL_H))) / 2) - (soil_area_low + soil_area_high)) * ramp_width
-# Footprint_Excavation = ((soil_area_low + soil_area_high) * ramp_width) + (V_Anchor * ramp_width * b2 * 2) + E_tiers_low + E_tiers_high
-        #Ramp and Tiers
-Labor_Tiers = L_tiers_low + L_tiers_high
-Labor_RampWalls = (area_ramp_low + area_ramp_high) * base_wall_thickness + (W_extra_high + W_extra_low)
-Labor_RampFill = (area_ramp_high + area_ramp_low) * (ramp_width - 2 * base_wall_thickness)
-
-    # Cost
-
-        #Labor (Excavation, Masonry)
-pay = 40  # 40$ a day per mason
-            # assume that one mason takes 4 days to do about one tier or 15 m3 of masonry, 10 hour days
-Labor_Cost = (((Labor_Tiers/masonry_labor) * pay) + ((Labor_RampWalls/masonry_labor) * pay) + ((Labor_RampFill/fill_labor) * pay)) * weight_masonry + ((Footprint_Excavation/excavation_labor) * pay) * weight_excav
-
-        #Materials by price (Cement, Rocks, Sand, Gravel)
-Material_Cost = Cement * cost_cement * weight_cement + Rocks * cost_rock * weight_rock + Sand * cost_sand * weight_sand + Gravel * cost_gravel * weight_gravel
-
-## Set up constraints (https://docs.scipy.org/doc/scipy/reference/tutorial/optimize.html#constrained-minimization-of-multivariate-scalar-functions-minimize)
-f = (((4 * x4) - DH)**2)/(16 * x4)
+        cementperfill = 36  #kg/m3
+        cementpermasonry = 74.88
+        cementperconcrete = 360
+        sandperconcrete = 0.5  #m3/m3
+        sandpermasonry = 0.208
+        sandperfill = 0.1
+        gravelperconcrete = 0.75
+        rockpermasonry = 0.8
+        rockperfill = 0.85
+        cost_cement = 120.38
+        cost_sand = 0  #no number, things less expensive in Eswatini
+        cost_gravel = 195
+        cost_rock = 0  #no number, things less expensive in Eswatini
+
+    M_tiers_low, M_tiers_high = (tiers['fill_volume'] * cementperfill) + (tiers['masonry_volume'] * cementpermasonry)
+    R_tiers_low, R_tiers_high = (tiers['fill_volume'] * rockperfill) + (tiers['masonry_volume'] * rockpermasonry)
+    S_tiers_low, S_tiers_high = (tiers['fill_volume'] * sandperfill) + (tiers['masonry_volume'] * sandpermasonry)
+    E_tiers_low, E_tiers_high = tiers['excavation_volume']
+    L_tiers_low, L_tiers_high = tiers['fill_volume'] + tiers['masonry_volume']
+
+    M_tiers = ((M_tiers_low + M_tiers_high) / 50)  #value in 50 kg bags
+
+    M_ramp_low = (W_extra_low + (area_ramp_low * base_wall_thickness))* cementpermasonry  #W_extra is actually a volume
+    M_ramp_high = (W_extra_high + (area_ramp_high * base_wall_thickness))* cementpermasonry
+    M_ramp = (M_ramp_low + M_ramp_high) / 50
+
+    M_fill_low = area_ramp_low * (ramp_width - (2 * base_wall_thickness)) * cementperfill
+    M_fill_high = area_ramp_high * (ramp_width - (2 * base_wall_thickness)) * cementperfill
+    M_fill = (M_fill_low + M_fill_high) / 50
+
+    M_cap_low = ramplength_overburden_low * ramp_thickness * ramp_width * cementperconcrete
+    M_cap_high = ramplength_overburden_high * ramp_thickness * ramp_width * cementperconcrete
+    M_cap = (M_cap_low + M_cap_high) / 50
+
+    M_anchor = 2 * anchor_area * ramp_width * cementperconcrete / 50
+
+    M_towers = (tower_volume * cementperconcrete)/ 50  #2.492 m3 is tower volume number, assume this is constant
+
+    Cement = M_tiers + M_ramp + M_fill + M_cap + M_anchor + M_towers  #value in 50 kg bags
+
+            # Rocks
+    R_tiers = R_tiers_high + R_tiers_low
+    R_masonry = (W_extra_low + W_extra_high + (area_ramp_low * base_wall_thickness) + (area_ramp_high * base_wall_thickness))* rockpermasonry
+    R_fill = (area_ramp_low * (ramp_width - (2 * base_wall_thickness)) + area_ramp_high * (ramp_width - (2 * base_wall_thickness))) * rockperfill
+    Rocks = R_tiers + R_masonry + R_fill
+
+            # Sand
+    S_tiers = S_tiers_high + S_tiers_low
+    S_masonry = (W_extra_low + W_extra_high + (area_ramp_low * base_wall_thickness) + (area_ramp_high * base_wall_thickness))* sandpermasonry
+    S_fill = (area_ramp_low * (ramp_width - (2 * base_wall_thickness)) + area_ramp_high * (ramp_width - (2 * base_wall_thickness))) * sandperfill
+    S_concrete = (tower_volume * sandperconcrete) + (2 * anchor_area * ramp_width * sandperconcrete)
+    Sand = S_tiers + S_masonry + S_fill + S_concrete
+
+            # Gravel
+    Gravel = (tower_volume * gravelperconcrete) + (2 * anchor_area * ramp_width * gravelperconcrete)
+
+        # Labor (this assumes the anchor, decking and tensioning is the same, only looking into tiers, walls, and excavations
+
+            #Excavation
+    Footprint_Excavation =((extraCL_L * (fnd_height_low+(sym.tan(B_low) * (extraCL_L))) / 2) + (extraCL_H * (fnd_height_high+(sym.tan(B_high) * (extraCL_H))) / 2) - (soil_area_low + soil_area_high)) * ramp_width
+    # Footprint_Excavation = ((soil_area_low + soil_area_high) * ramp_width) + (V_Anchor * ramp_width * b2 * 2) + E_tiers_low + E_tiers_high
+            #Ramp and Tiers
+    Labor_Tiers = L_tiers_low + L_tiers_high
+    Labor_RampWalls = (area_ramp_low + area_ramp_high) * base_wall_thickness + (W_extra_high + W_extra_low)
+    Labor_RampFill = (area_ramp_high + area_ramp_low) * (ramp_width - 2 * base_wall_thickness)
+
+        # Cost
+
+            #Labor (Excavation, Masonry)
+    pay = 40  # 40$ a day per mason
+                # assume that one mason takes 4 days to do about one tier or 15 m3 of masonry, 10 hour days
+    Labor_Cost = (((Labor_Tiers/masonry_labor) * pay) + ((Labor_RampWalls/masonry_labor) * pay) + ((Labor_RampFill/fill_labor) * pay)) * weight_masonry + ((Footprint_Excavation/excavation_labor) * pay) * weight_excav
+
+            #Materials by price (Cement, Rocks, Sand, Gravel)
+    Material_Cost = Cement * cost_cement * weight_cement + Rocks * cost_rock * weight_rock + Sand * cost_sand * weight_sand + Gravel * cost_gravel * weight_gravel
+
+    ## Set up constraints (https://docs.scipy.org/doc/scipy/reference/tutorial/optimize.html#constrained-minimization-of-multivariate-scalar-functions-minimize)
+    f = (((4 * x4) - DH)**2)/(16 * x4)
+
+    if LowSide == 'Left':
+        Freeboard = y_fnd_L + y_hand_low - (f + HWL)
+    else:
+        Freeboard = y_fnd_R + y_hand_low - (f + HWL)
 
-if LowSide == 'Left':
-    Freeboard = y_fnd_L + y_hand_low - (f + HWL)
-else:
-    Freeboard = y_fnd_R + y_hand_low - (f + HWL)
+        # the FOS checks and Freeboard are held to fos_targets by the solver (Optimizer.fos_constraint), not penalized in Cost
 
-#STOPPED HERE
-    #Create penalty terms but conditionals don't work because of symbols
-cable_penalty = abs(FOS_CABLE - 3)
-sliding_penalty_low = abs(FOS_SLIDING_LOW - 1.5)
-sliding_penalty_high= abs(FOS_SLIDING_HIGH - 1.5)
-uplift_penalty_low = abs(FOS_UPLIFT_LOW - 1.5)
-uplift_penalty_high = abs(FOS_UPLIFT_HIGH- 1.5)
+    ## Solve for minimal "cost" with safety and serviceability constraints.
+    Cost = Material_Cost + Labor_Cost  # the live sag balance is an equality constraint of the solve (Optimizer.sag_constraint)
 
-penalty = cable_penalty + sliding_penalty_low**2 + sliding_penalty_high**2 + uplift_penalty_low*10000000 + uplift_penalty_high*10000000
+    variables = (G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high)
+    outputs = {'Cost': Cost, 'FOS_CABLE': FOS_CABLE, 'FOS_UPLIFT_LOW': FOS_UPLIFT_LOW, 'FOS_UPLIFT_HIGH': FOS_UPLIFT_HIGH,
+               'FOS_SLIDING_LOW': FOS_SLIDING_LOW, 'FOS_SLIDING_HIGH': FOS_SLIDING_HIGH, 'Freeboard': Freeboard,
+               'Ph': Ph, 'Pt_back_hand_low': Pt_back_hand_low, 'Cement': Cement, 'Rocks': Rocks, 'Sand': Sand, 'Gravel': Gravel,
+               'Labor_Cost': Labor_Cost, 'Material_Cost': Material_Cost, 'area_ramp_low': area_ramp_low, 'area_ramp_high': area_ramp_high,
+               'soil_area_low': soil_area_low, 'soil_area_high': soil_area_high}
+    PhaseProfile.expression_size(Cost=Cost, Material_Cost=Material_Cost, Labor_Cost=Labor_Cost, Freeboard=Freeboard)
+    return variables, weights, outputs
 
         # variable order is G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high
-linear_constraint = LinearConstraint([[1, 0, 0, 0, 0, 0, 0, 0, 0], [0, 1, 0, 0, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0, 0],
-                      [0, 0, 0, 1, 0, 0, 0, 0, 0], [0, 0, 0, 0, 1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 1, 0, 0, 0],
-                      [0, 0, 0, 0, 0, 0, 1, 0, 0], [0, 0, 0, 0, 0, 0, 0, 1, 0], [0, 0, 0, 0, 0, 0, 0, 0, 1]], [y_walk_left - 0.5, y_walk_right - 0.5, 0, 0, 0, 0, 0, 0, 0],
-                     [10, 10, 15, 15, 10, 10, 10, 5, 5])
-
-## Solve for minimal "cost" with safety and serviceability constraints.
-Cost = Material_Cost + Labor_Cost + (sag_equation * 1000000) + penalty
-Cost_function = sym.lambdify([(G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high)], Cost)
-
-## Minimize
-x0 = np.array([3, 3, 10, 10, 2, 3, 4, 1, 1])
-res = minimize(Cost_function, x0, method='trust-constr', constraints=[linear_constraint], options={'verbose': 1})
-
-## Present Solution (graphically, numerically)
-
-print('G2S_L is ' + str(round(res.x[0], 2)) + ' meters')
-print('G2S_R is ' + str(round(res.x[1], 2)) + ' meters')
-print('CL_L is ' + str(round(res.x[2], 2)) + ' meters')
-print('CL_R is ' + str(round(res.x[3], 2)) + ' meters')
-print('construction sag is ' + str(round(res.x[4], 2)) + ' meters')
-print('hoisting sag is ' + str(round(res.x[5], 2)) + ' meters')
-print('design sag is ' + str(round(design_sag, 2)) + ' meters')
-print('live load sag is ' + str(round(res.x[6], 2)) + ' meters')
-print('backwall height low is ' + str(round(res.x[7], 2)) + ' meters')
-print('backwall height high is ' + str(round(res.x[8], 2)) + ' meters')
-print(' ')
-
-FOS_CABLE = FOS_CABLE.subs([(G2S_L, res.x[0]), (G2S_R, res.x[1]), (CL_L, res.x[2]), (CL_R, res.x[3]), (x1, res.x[4]), (x2, res.x[5]), (x4, res.x[6]), (h_back_low, res.x[7]), (h_back_high, res.x[8])])
-FOS_UPLIFT_LOW = FOS_UPLIFT_LOW.subs([(G2S_L, res.x[0]), (G2S_R, res.x[1]), (CL_L, res.x[2]), (CL_R, res.x[3]), (x1, res.x[4]), (x2, res.x[5]), (x4, res.x[6]), (h_back_low, res.x[7]), (h_back_high, res.x[8])])
-FOS_UPLIFT_HIGH = FOS_UPLIFT_HIGH.subs([(G2S_L, res.x[0]), (G2S_R, res.x[1]), (CL_L, res.x[2]), (CL_R, res.x[3]), (x1, res.x[4]), (x2, res.x[5]), (x4, res.x[6]), (h_back_low, res.x[7]), (h_back_high, res.x[8])])
-FOS_SLIDING_LOW = FOS_SLIDING_LOW.subs([(G2S_L, res.x[0]), (G2S_R, res.x[1]), (CL_L, res.x[2]), (CL_R, res.x[3]), (x1, res.x[4]), (x2, res.x[5]), (x4, res.x[6]), (h_back_low, res.x[7]), (h_back_high, res.x[8])])
-FOS_SLIDING_HIGH = FOS_SLIDING_HIGH.subs([(G2S_L, res.x[0]), (G2S_R, res.x[1]), (CL_L, res.x[2]), (CL_R, res.x[3]), (x1, res.x[4]), (x2, res.x[5]), (x4, res.x[6]), (h_back_low, res.x[7]), (h_back_high, res.x[8])])
-Freeboard = Freeboard.subs([(G2S_L, res.x[0]), (G2S_R, res.x[1]), (CL_L, res.x[2]), (CL_R, res.x[3]), (x1, res.x[4]), (x2, res.x[5]), (x4, res.x[6]), (h_back_low, res.x[7]), (h_back_high, res.x[8])])
-
-print('Cable FOS is ' + str(round(FOS_CABLE, 2)))
-print('Low Uplift FOS is ' + str(round(FOS_UPLIFT_LOW, 2)))
-print('High Uplift FOS is ' + str(round(FOS_UPLIFT_HIGH, 2)))
-print('Low Sliding FOS is ' + str(round(FOS_SLIDING_LOW, 2)))
-print('High Sliding FOS is ' + str(round(FOS_SLIDING_HIGH, 2)))
-print('Freeboard is ' + str(round(Freeboard, 2)))
-
-## Plot Abutment Shape (coordinate plane is left to right increase)
-G2S_L_plug = res.x[0]
-G2S_R_plug = res.x[1]
-CL_L_plug = res.x[2]
-CL_R_plug = res.x[3]
-h_back_low_plug = res.x[7]
-h_back_high_plug = res.x[8]
-
-# set up points
-
+        # x1 and x2 aren't optimized, SagCalculator.construction_sags solves them after the solve, their entries are unused
+        # CL starts past the tiers and the bottom of the anchor (H_tiers + b2), where the soil under the ramp runs out
+        # (soil_area 0), this keeps it clear of H_Anchor too, where the backstay is vertical and the backstay and alpha
+        # terms divide by zero
+        # the sags stop short of 0, where the sag terms divide by zero (the smallest sag the sag solves look at,
+        # SagCalculator.sag_limits)
 if LowSide == 'Left':
-    low_low_right_corner = [x_fnd_L, y_fnd_L]
-    low_high_right_corner = [x_fnd_L, y_fnd_L + y_walk_left]
-    low_low_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L]
-    low_high_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L + anchor_height + h_back_low_plug]
-    high_low_right_corner = [x_fnd_R, y_fnd_R]
-    high_high_right_corner = [x_fnd_R, y_fnd_R + y_walk_right]
-    high_low_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R]
-    high_high_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R + anchor_height + h_back_high_plug]
-    HWL_point_left = [x_fnd_L, HWL]
-    HWL_point_right = [x_fnd_R, HWL]
+    min_CL_L, min_CL_R = H_tiers_low + b2, H_tiers_high + b2
 else:
-    low_low_right_corner = [x_fnd_R, y_fnd_R]
-    low_high_right_corner = [x_fnd_R, y_fnd_R + y_walk_right]
-    low_low_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R]
-    low_high_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R + anchor_height + h_back_low_plug]
-    high_low_right_corner = [x_fnd_L, y_fnd_L]
-    high_high_right_corner = [x_fnd_L, y_fnd_L + y_walk_left]
-    high_low_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L]
-    high_high_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L + anchor_height + h_back_high_plug]
-    HWL_point_left = [x_fnd_R, HWL]
-    HWL_point_right = [x_fnd_L, HWL]
-
-# Now plot lines (https://jakevdp.github.io/PythonDataScienceHandbook/04.01-simple-line-plots.html)
-    # High Water Line
-HWL_x = np.linspace(x_fnd_L, x_fnd_R, 100)
-HWL_y = np.ones(100) * HWL
-plt.plot(HWL_x, HWL_y)
-
-    # Abutment front walls
-low_front_wall_x = np.ones(100) * x_fnd_L
-low_front_wall_y = np.linspace(y_fnd_L, y_fnd_L + y_walk_left, 100)
-high_front_wall_x = np.ones(100) * x_fnd_R
-high_front_wall_y = np.linspace(y_fnd_R, y_fnd_R + y_walk_right, 100)
-plt.plot(low_front_wall_x, low_front_wall_y)
-plt.plot(high_front_wall_x, high_front_wall_y)
-
-    # Abutment back walls
-left_back_wall_x = np.ones(100) * (x_fnd_L - CL_L_plug)
-right_back_wall_x = np.ones(100) * (x_fnd_R + CL_R_plug)
+    min_CL_L, min_CL_R = H_tiers_high + b2, H_tiers_low + b2
+min_sag = SagCalculator.sag_limits[0] * Span
+bounds = Bounds([y_walk_left - 0.5, y_walk_right - 0.5, min_CL_L, min_CL_R, min_sag, min_sag, min_sag, 0, 0], [10, 10, 15, 15, 10, 10, 10, 5, 5])
 
-if LowSide == 'Left':
-    if y_walk_left > G2S_L_plug:
-        left_back_wall_y = np.linspace(y_fnd_L + (y_walk_left - G2S_L_plug), y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_low_plug, 100)
-    else:
-        left_back_wall_y = np.linspace(y_fnd_L - (G2S_L_plug - y_walk_left), y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_low_plug , 100)
-    if y_walk_right > G2S_R_plug:
-        right_back_wall_y = np.linspace(y_fnd_R + (y_walk_right - G2S_R_plug), y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_high_plug, 100)
-    else:
-        right_back_wall_y = np.linspace(y_fnd_R - (G2S_R_plug - y_walk_right), y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_high_plug, 100)
-else:
-    if y_walk_left > G2S_L_plug:
-        left_back_wall_y = np.linspace(y_fnd_L + (y_walk_left - G2S_L_plug), y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_high_plug, 100)
-    else:
-        left_back_wall_y = np.linspace(y_fnd_L - (G2S_L_plug - y_walk_left), y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_high_plug , 100)
-    if y_walk_right > G2S_R_plug:
-        right_back_wall_y = np.linspace(y_fnd_R + (y_walk_right - G2S_R_plug), y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_low_plug, 100)
-    else:
-        right_back_wall_y = np.linspace(y_fnd_R - (G2S_R_plug - y_walk_right), y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_low_plug, 100)
+        # a design is acceptable when every check is at least its target
+fos_targets = {'FOS_CABLE': 3, 'FOS_UPLIFT_LOW': 1.5, 'FOS_UPLIFT_HIGH': 1.5, 'FOS_SLIDING_LOW': 1.5, 'FOS_SLIDING_HIGH': 1.5, 'Freeboard': 0}
 
-plt.plot(left_back_wall_x, left_back_wall_y)
-plt.plot(right_back_wall_x, right_back_wall_y)
+###### SAG CALCULATOR ##########
+PhaseProfile.phase('Sag Calculator')
+    # evaluated numerically by SagCalculator instead of being part of the symbolic model: the live balance as a constraint
+    # at every optimizer step, the construction and hoisting sags solved once for the result
 
-    # Bottom ramp walls (straight or line?)
-left_bottom_wall_x = np.linspace(x_fnd_L - CL_L_plug, x_fnd_L, 100)
-right_bottom_wall_x = np.linspace(x_fnd_R + CL_R_plug, x_fnd_R, 100)
-
-if y_walk_left > G2S_L_plug:
-    left_bottom_wall_y = np.ones(100) * (y_fnd_L + (y_walk_left - G2S_L_plug))
-else:
-    slope_left = (y_fnd_L - (y_fnd_L - (G2S_L_plug - y_walk_left))) / (x_fnd_L - (x_fnd_L - CL_L_plug))
-    int_left = (y_fnd_L - (G2S_L_plug - y_walk_left)) - slope_left * (x_fnd_L - CL_L_plug)  #evaluate at left point
-    left_bottom_wall_y = left_bottom_wall_x * slope_left + int_left
-if y_walk_right > G2S_R_plug:
-    right_bottom_wall_y = np.ones(100) * (y_fnd_R + (y_walk_right - G2S_R_plug))
-else:
-    slope_right = (y_fnd_R - (y_fnd_R - (G2S_R_plug - y_walk_right))) / (x_fnd_R - (x_fnd_R + CL_R_plug))
-    int_right = (y_fnd_R - (G2S_R_plug - y_walk_right)) - slope_right * (x_fnd_R + CL_R_plug)  #evaluate at right point
-    right_bottom_wall_y = right_bottom_wall_x * slope_right + int_right
-
-plt.plot(left_bottom_wall_x, left_bottom_wall_y)
-plt.plot(right_bottom_wall_x, right_bottom_wall_y)
-
-    # Top ramp walls
-left_top_wall_x = np.linspace(x_fnd_L - CL_L_plug, x_fnd_L, 100)
-right_top_wall_x = np.linspace(x_fnd_R + CL_R_plug, x_fnd_R, 100)
+sag_design_i = Constants.iloc[6, 1]  # % design sag
 
-if LowSide == 'Left':
-    if y_walk_left > G2S_L_plug:
-        topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_low_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
-        topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
-        left_top_wall_y = left_top_wall_x * topslope_left + topint_left
-    else:
-        topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_low_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
-        topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
-        left_top_wall_y = left_top_wall_x * topslope_left + topint_left
-    if y_walk_right > G2S_R_plug:
-        topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_high_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
-        topint_right = (y_fnd_R + y_walk_right) - topslope_right * (x_fnd_R)
-        right_top_wall_y = right_top_wall_x * topslope_right + topint_right
-    else:
-        topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_high_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
-        topint_right = (y_fnd_R + y_walk_left) - topslope_left * (x_fnd_L)
-        right_top_wall_y = right_top_wall_x * topslope_right + topint_right
-else:
-    if y_walk_left > G2S_L_plug:
-        topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_high_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
-        topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
-        left_top_wall_y = left_top_wall_x * topslope_left + topint_left
-    else:
-        topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_high_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
-        topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
-        left_top_wall_y = left_top_wall_x * topslope_left + topint_left
-    if y_walk_right > G2S_R_plug:
-        topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_low_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
-        topint_right = (y_fnd_R + y_walk_right) - topslope_right * (x_fnd_R)
-        right_top_wall_y = right_top_wall_x * topslope_right + topint_right
+# Create the point geometry
+max_len = int(np.floor(Span)+3)
+x_lin = Geometry.iloc[1:max_len, 3]  # lowercase x is X
+    # 'points' sums cable length and tension over the x_lin points like the spreadsheet, 'closed_form' uses the exact
+    # parabola over the same stretch (see SagBenchmark for how far apart they are)
+cable_method = 'points'
+
+sag_site = SagCalculator.sag_site(Span, DH, LowSide, sag_design_i, W_cable, W_dead, W_live, x_lin, V_Anchor, H_Anchor, offset,
+                                  tower_height, WalkNumber, HandNumber, E_cable, A_cable, saddle_friction, construction_stretch, cable_method)
+
+###### END SAG CALCULATOR
+
+## Compile the model, or load it from the kernel cache if this site and code have been compiled before
+    # 'model' is one flat function returning every entry of kernel_names, sym.cse pulls the subtrees they share
+    # (atan, cos, tan(ramp_angle), Ph ...) out so each is evaluated once per call
+    # 'report' is the same for report_names, the checks plus the intermediates worth printing, evaluated once after the solve
+    # Cost_gradient and Cost_hessian are exact derivatives of the symbolic Cost (see SymbolicDerivatives)
+    # checks_jacobian is the exact Jacobian of the fos_targets checks, for the constraints and the penalty gradient
+kernel_names = ['Cost', 'FOS_CABLE', 'FOS_UPLIFT_LOW', 'FOS_UPLIFT_HIGH', 'FOS_SLIDING_LOW', 'FOS_SLIDING_HIGH', 'Freeboard']
+report_names = kernel_names + ['Ph', 'Pt_back_hand_low', 'Cement', 'Rocks', 'Sand', 'Gravel', 'Labor_Cost', 'Material_Cost', 'area_ramp_low',
+                               'area_ramp_high', 'soil_area_low', 'soil_area_high']
+code_dir = os.path.dirname(os.path.abspath(__file__))
+    # Optimizer.py defines weight_names, the order the compiled model takes its weights in
+kernel_key = KernelCache.kernel_key([Constants, Lookups, Geometry], [os.path.join(code_dir, name) for name in ['BridgeDesigner.py', 'Optimizer.py', 'SymbolicDerivatives.py', 'TierTable.py']])
+
+
+    # the two halves of a compile, separate so BenchmarkSuite can time them
+def model_derivatives(variables, outputs):
+    import SymbolicDerivatives
+    gradient, hessian = SymbolicDerivatives.gradient_and_hessian(outputs['Cost'], variables)
+    checks_jacobian = SymbolicDerivatives.jacobian([outputs[name] for name in fos_targets], variables)
+    return {'Cost_gradient': gradient, 'Cost_hessian': hessian, 'checks_jacobian': checks_jacobian}
+
+
+def compile_kernel(variables, weights, outputs, derivatives):
+    import sympy as sym
+    import SymbolicDerivatives
+    kernel = {}
+    kernel['model'] = sym.lambdify([variables, weights], [outputs[name] for name in kernel_names], modules='numpy', cse=True)
+    kernel['report'] = sym.lambdify([variables, weights], [outputs[name] for name in report_names], modules='numpy', cse=True)
+    for name, chain in derivatives.items():
+        kernel[name] = SymbolicDerivatives.lambdify_chain([variables, weights], *chain)
+    return kernel
+
+
+PhaseProfile.phase('Load kernel')
+kernel = KernelCache.load_kernel(kernel_key)
+kernel_cached = kernel is not None
+if kernel is None:
+    PhaseProfile.phase('Build model')  # sympy import and symbols, then Cable FOS to Materials inside build_model
+    variables, weights, outputs = build_model()
+    PhaseProfile.phase('Compile')
+    kernel = compile_kernel(variables, weights, outputs, model_derivatives(variables, outputs))
+    KernelCache.save_kernel(kernel_key, kernel)
+
+## Problem
+    # everything Optimizer needs to solve this site, build_only runs stop here
+x0 = np.array([3, 3, 10, 10, 2, 3, 4, 1, 1])  # starting guess
+problem = {'x0': x0, 'kernel': kernel, 'kernel_key': kernel_key, 'kernel_names': kernel_names, 'report_names': report_names, 'sag_site': sag_site, 'bounds': bounds,
+           'fos_targets': fos_targets,
+           'weights': np.array([weight_masonry, weight_excav, weight_cement, weight_sand, weight_gravel, weight_rock], dtype=float),
+           # 'constraints' holds the checks to fos_targets as NonlinearConstraints, 'penalty' adds the old abs() penalties
+           # to the cost instead (L-BFGS-B only takes bounds, it always uses the penalties), see Optimizer.penalty
+           'fos_mode': 'constraints',
+           # SLSQP and L-BFGS-B need a cost of order one, Cost is around 1e5
+           'cost_scale': 1e-5,
+           # exact Hessian of the cost for trust-constr, faster (0.08 s against 0.46 s with the BFGS update on MasterInputs,
+           # same optimum), the BFGS update is kept as the default as it also copes with the kinks of the penalties
+           'use_exact_hessian': False}
+
+if not build_only:
+    ## Minimize
+    PhaseProfile.phase('Minimize')
+        # solver is 'trust-constr', 'SLSQP' or 'L-BFGS-B', all three take the box bounds directly, trust-constr handles the
+        # FOS and sag constraints best and is the one to design with (SLSQP is faster and reaches the same cost on
+        # MasterInputs, L-BFGS-B only takes bounds and solves the penalty formulation, about 8 % dearer there)
+        # compare_solvers runs every backend from the same x0 and prints evaluations, wall time and final cost
+        # multi_starts > 0 solves from that many space filling starting points in a process pool instead of from x0
+    solver = 'trust-constr'
+    compare_solvers = False
+    solvers = ['trust-constr', 'SLSQP', 'L-BFGS-B']
+    multi_starts = 0
+    multi_start_seed = 0
+        # compare_fos_modes solves from x0 with the FOS targets as constraints and as penalties and prints both (the
+        # penalties are the old formulation, they don't make a cheaper design, see Optimizer.penalty)
+    compare_fos_modes = False
+        # a plain solve of a site and settings solved before is read back from the result cache instead (see ResultCache)
+    use_result_cache = True
+    stored = None
+        # warm_start starts a plain solve from the optimum of the most similar stored site ('nearest', see WarmStart) or
+        # from the surrogate model's prediction ('surrogate', once Surrogate has been run) instead of x0 (None)
+        # off by default, the start then depends on what this machine has solved before, so the same inputs can give
+        # another design elsewhere (and the result cache keeps the first one)
+    warm_start = None
+    site_features = WarmStart.site_features(Span, DH, LowSide, Constants.iloc[12, 1], tiers_low, tiers_high, Constants.iloc[10, 1],
+                                            Constants.iloc[11, 1], y_fnd_L, y_fnd_R, HWL, WalkNumber, HandNumber)
+
+    def model(variables):
+        return Optimizer.model(variables, problem)
+
+    startup_time = time.perf_counter() - start_time
+    if show_startup:
+        print('startup took ' + str(round(startup_time, 2)) + ' s, target ' + str(startup_target) + ' s')
+
+    if compare_fos_modes:
+        results = {}
+        print('FOS as        iterations  cost evals  gradient evals  wall time (s)  final cost  meets FOS targets')
+        for mode in ['constraints', 'penalty']:
+            start = time.perf_counter()
+            results[mode] = Optimizer.solve(x0, solver, dict(problem, fos_mode=mode))
+            wall_time = time.perf_counter() - start
+            print(mode.ljust(14) + str(results[mode].get('nit', '')).ljust(12) + str(results[mode].nfev).ljust(12) + str(results[mode].njev).ljust(16)
+                  + str(round(wall_time, 2)).ljust(15) + str(round(results[mode].fun, 2)).ljust(12) + ' ' + str(Optimizer.meets_targets(results[mode].x, problem)))
+        print('the penalties pull FOS_CABLE and both uplift FOS onto their targets from either side, a check with margin to spare '
+              + 'costs as much as one short of it, so penalty designs end dearer than the constrained optimum')
+        res = results[problem['fos_mode']]
+    elif compare_solvers:
+        results = {}
+        print('solver        cost evals  gradient evals  wall time (s)  final cost  meets FOS targets')
+        for name in solvers:
+            start = time.perf_counter()
+            results[name] = Optimizer.solve(x0, name, problem)
+            wall_time = time.perf_counter() - start
+            print(name.ljust(14) + str(results[name].nfev).ljust(12) + str(results[name].njev).ljust(16) + str(round(wall_time, 2)).ljust(15)
+                  + str(round(results[name].fun, 2)).ljust(12) + ' ' + str(Optimizer.meets_targets(results[name].x, problem)))
+        feasible = [name for name in solvers if Optimizer.meets_targets(results[name].x, problem)]
+        if feasible:
+            best = min(feasible, key=lambda name: results[name].fun)
+            print('cheapest design meeting the FOS targets from ' + best + ', the others cost '
+                  + ', '.join(name + ' ' + ('{:+.1f}'.format(100 * (results[name].fun / results[best].fun - 1)) + ' %' if name in feasible else 'misses the targets')
+                              for name in solvers if name != best))
+        else:
+            print('no solver meets the FOS targets from x0')
+        if 'L-BFGS-B' in solvers:
+            print('L-BFGS-B only takes bounds, it solves the penalty formulation instead of the constraints (see compare_fos_modes)')
+        res = results[solver]
+        print(solver + ' used ' + str(res.nfev) + ' cost and ' + str(res.njev) + ' gradient evaluations')
+    elif multi_starts > 0:
+        best, starts = Optimizer.multi_start(problem, multi_starts, solver, multi_start_seed, x0=x0)
+        res = OptimizeResult(x=best['x'], fun=best['cost'])
+        summary = Optimizer.spread(starts)
+        print(str(summary['feasible']) + ' of ' + str(summary['starts']) + ' starts meet the FOS targets, final cost min '
+              + str(round(summary['min'], 2)) + ', median ' + str(round(summary['median'], 2)) + ', max ' + str(round(summary['max'], 2)))
     else:
-        topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_low_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
-        topint_right = (y_fnd_R + y_walk_left) - topslope_left * (x_fnd_L)
-        right_top_wall_y = right_top_wall_x * topslope_right + topint_right
-plt.plot(left_top_wall_x, left_top_wall_y)
-plt.plot(right_top_wall_x, right_top_wall_y)
-
-# set limits
-plt.xlim(np.floor(x_fnd_L - CL_L_plug - 10), np.floor(x_fnd_R + CL_R_plug + 10))
-plt.ylim(np.floor(HWL - 10), np.floor(max(y_fnd_L, y_fnd_R) + 10))
-plt.show()
+        if use_result_cache:
+            result_key = ResultCache.result_key(Constants, Lookups, Geometry, ResultCache.problem_settings(problem, solver, warm_start))
+            stored = ResultCache.lookup(result_key)
+        if stored is not None:
+            res = ResultCache.stored_result(stored)
+            print('same site and settings as a stored result, solve skipped (ResultCache)')
+        else:
+            start = None
+            if warm_start == 'nearest':
+                start = WarmStart.nearest_start(site_features, bounds)
+                if start is not None:
+                    print('warm start from a stored ' + str(round(start['features']['Span'], 1)) + ' m site, distance ' + str(round(start['distance'], 2)))
+            elif warm_start == 'surrogate' and os.path.exists(Surrogate.model_path):
+                start = Surrogate.predicted_start(Surrogate.load_model(), site_features, bounds)
+                print('warm start from the surrogate prediction, cost about ' + str(round(start['Cost'], 2)))
+            elif warm_start == 'surrogate':
+                print('no surrogate model at ' + Surrogate.model_path + ' (run Surrogate), solving from x0')
+            if start is not None and not Optimizer.finite_start(start['x0'], problem):
+                print('no finite cost at the warm start, solving from x0')
+                start = None
+            if start is not None:
+                res = Optimizer.solve(start['x0'], solver, problem)
+                if not Optimizer.meets_targets(res.x, problem):  # a poor neighbour, x0 as well and the better of the two
+                    cold = Optimizer.solve(x0, solver, problem)
+                    if Optimizer.meets_targets(cold.x, problem) or cold.fun < res.fun:
+                        res = cold
+            else:
+                res = Optimizer.solve(x0, solver, problem)
+            print(solver + ' used ' + str(res.nfev) + ' cost and ' + str(res.njev) + ' gradient evaluations')
+            values = Optimizer.report(res.x, problem)
+            if use_result_cache and Optimizer.buildable(values):
+                ResultCache.store(result_key, ResultCache.result_record(res, values, Optimizer.meets_targets(res.x, problem)), site_features)
+            elif use_result_cache:  # it would warm start other sites and train the surrogate
+                print('the design has a negative area or quantity, not stored (ResultCache)')
+
+    ## Present Solution (graphically, numerically)
+    PhaseProfile.phase('Present Solution')
+
+    print('G2S_L is ' + str(round(res.x[0], 2)) + ' meters')
+    print('G2S_R is ' + str(round(res.x[1], 2)) + ' meters')
+    print('CL_L is ' + str(round(res.x[2], 2)) + ' meters')
+    print('CL_R is ' + str(round(res.x[3], 2)) + ' meters')
+    print('construction sag is ' + str(round(res.x[4], 2)) + ' meters')
+    print('hoisting sag is ' + str(round(res.x[5], 2)) + ' meters')
+    print('design sag is ' + str(round(design_sag, 2)) + ' meters')
+    print('live load sag is ' + str(round(res.x[6], 2)) + ' meters')
+    print('backwall height low is ' + str(round(res.x[7], 2)) + ' meters')
+    print('backwall height high is ' + str(round(res.x[8], 2)) + ' meters')
+    print(' ')
+
+    checks = stored['report'] if stored is not None else Optimizer.report(res.x, problem)
+    FOS_CABLE = checks['FOS_CABLE']
+    FOS_UPLIFT_LOW = checks['FOS_UPLIFT_LOW']
+    FOS_UPLIFT_HIGH = checks['FOS_UPLIFT_HIGH']
+    FOS_SLIDING_LOW = checks['FOS_SLIDING_LOW']
+    FOS_SLIDING_HIGH = checks['FOS_SLIDING_HIGH']
+    Freeboard = checks['Freeboard']
+
+    print('Cable FOS is ' + str(round(FOS_CABLE, 2)))
+    print('Low Uplift FOS is ' + str(round(FOS_UPLIFT_LOW, 2)))
+    print('High Uplift FOS is ' + str(round(FOS_UPLIFT_HIGH, 2)))
+    print('Low Sliding FOS is ' + str(round(FOS_SLIDING_LOW, 2)))
+    print('High Sliding FOS is ' + str(round(FOS_SLIDING_HIGH, 2)))
+    print('Freeboard is ' + str(round(Freeboard, 2)))
+    print(' ')
+    print('Horizontal cable tension Ph is ' + str(round(checks['Ph'], 1)) + ' kN')
+    print('Low side hand cable backstay tension is ' + str(round(checks['Pt_back_hand_low'], 1)) + ' kN')
+    print('Cement is ' + str(round(checks['Cement'], 1)) + ' bags (50 kg)')
+    print('Rocks are ' + str(round(checks['Rocks'], 2)) + ' m3')
+    print('Sand is ' + str(round(checks['Sand'], 2)) + ' m3')
+    print('Gravel is ' + str(round(checks['Gravel'], 2)) + ' m3')
+    print('Labor cost is ' + str(round(checks['Labor_Cost'], 2)))
+    print('Material cost is ' + str(round(checks['Material_Cost'], 2)))
+
+        # reliability_samples > 0 samples phi, the soil and fill densities, mu_saddle and the soil slopes around their values
+        # and prints how likely each check is to fail for this design (see Reliability)
+    reliability_samples = 0
+    if reliability_samples > 0:
+        import Reliability
+        print(' ')
+        Reliability.print_report(Reliability.analyze(globals(), res.x, reliability_samples), reliability_samples)
+
+    ## Plot Abutment Shape (coordinate plane is left to right increase)
+    PhaseProfile.phase('Plot')
+    if figure_path or not headless:
+        import matplotlib
+        if headless:
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+
+        G2S_L_plug = res.x[0]
+        G2S_R_plug = res.x[1]
+        CL_L_plug = res.x[2]
+        CL_R_plug = res.x[3]
+        h_back_low_plug = res.x[7]
+        h_back_high_plug = res.x[8]
+
+        # set up points
+
+        if LowSide == 'Left':
+            low_low_right_corner = [x_fnd_L, y_fnd_L]
+            low_high_right_corner = [x_fnd_L, y_fnd_L + y_walk_left]
+            low_low_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L]
+            low_high_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L + anchor_height + h_back_low_plug]
+            high_low_right_corner = [x_fnd_R, y_fnd_R]
+            high_high_right_corner = [x_fnd_R, y_fnd_R + y_walk_right]
+            high_low_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R]
+            high_high_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R + anchor_height + h_back_high_plug]
+            HWL_point_left = [x_fnd_L, HWL]
+            HWL_point_right = [x_fnd_R, HWL]
+        else:
+            low_low_right_corner = [x_fnd_R, y_fnd_R]
+            low_high_right_corner = [x_fnd_R, y_fnd_R + y_walk_right]
+            low_low_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R]
+            low_high_left_corner = [x_fnd_R - CL_R_plug, y_fnd_R + anchor_height + h_back_low_plug]
+            high_low_right_corner = [x_fnd_L, y_fnd_L]
+            high_high_right_corner = [x_fnd_L, y_fnd_L + y_walk_left]
+            high_low_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L]
+            high_high_left_corner = [x_fnd_L - CL_L_plug, y_fnd_L + anchor_height + h_back_high_plug]
+            HWL_point_left = [x_fnd_R, HWL]
+            HWL_point_right = [x_fnd_L, HWL]
+
+        # Now plot lines (https://jakevdp.github.io/PythonDataScienceHandbook/04.01-simple-line-plots.html)
+            # High Water Line
+        HWL_x = np.linspace(x_fnd_L, x_fnd_R, 100)
+        HWL_y = np.ones(100) * HWL
+        plt.plot(HWL_x, HWL_y)
+
+            # Abutment front walls
+        low_front_wall_x = np.ones(100) * x_fnd_L
+        low_front_wall_y = np.linspace(y_fnd_L, y_fnd_L + y_walk_left, 100)
+        high_front_wall_x = np.ones(100) * x_fnd_R
+        high_front_wall_y = np.linspace(y_fnd_R, y_fnd_R + y_walk_right, 100)
+        plt.plot(low_front_wall_x, low_front_wall_y)
+        plt.plot(high_front_wall_x, high_front_wall_y)
+
+            # Abutment back walls
+        left_back_wall_x = np.ones(100) * (x_fnd_L - CL_L_plug)
+        right_back_wall_x = np.ones(100) * (x_fnd_R + CL_R_plug)
+
+        if LowSide == 'Left':
+            if y_walk_left > G2S_L_plug:
+                left_back_wall_y = np.linspace(y_fnd_L + (y_walk_left - G2S_L_plug), y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_low_plug, 100)
+            else:
+                left_back_wall_y = np.linspace(y_fnd_L - (G2S_L_plug - y_walk_left), y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_low_plug , 100)
+            if y_walk_right > G2S_R_plug:
+                right_back_wall_y = np.linspace(y_fnd_R + (y_walk_right - G2S_R_plug), y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_high_plug, 100)
+            else:
+                right_back_wall_y = np.linspace(y_fnd_R - (G2S_R_plug - y_walk_right), y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_high_plug, 100)
+        else:
+            if y_walk_left > G2S_L_plug:
+                left_back_wall_y = np.linspace(y_fnd_L + (y_walk_left - G2S_L_plug), y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_high_plug, 100)
+            else:
+                left_back_wall_y = np.linspace(y_fnd_L - (G2S_L_plug - y_walk_left), y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_high_plug , 100)
+            if y_walk_right > G2S_R_plug:
+                right_back_wall_y = np.linspace(y_fnd_R + (y_walk_right - G2S_R_plug), y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_low_plug, 100)
+            else:
+                right_back_wall_y = np.linspace(y_fnd_R - (G2S_R_plug - y_walk_right), y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_low_plug, 100)
+
+        plt.plot(left_back_wall_x, left_back_wall_y)
+        plt.plot(right_back_wall_x, right_back_wall_y)
+
+            # Bottom ramp walls (straight or line?)
+        left_bottom_wall_x = np.linspace(x_fnd_L - CL_L_plug, x_fnd_L, 100)
+        right_bottom_wall_x = np.linspace(x_fnd_R + CL_R_plug, x_fnd_R, 100)
+
+        if y_walk_left > G2S_L_plug:
+            left_bottom_wall_y = np.ones(100) * (y_fnd_L + (y_walk_left - G2S_L_plug))
+        else:
+            slope_left = (y_fnd_L - (y_fnd_L - (G2S_L_plug - y_walk_left))) / (x_fnd_L - (x_fnd_L - CL_L_plug))
+            int_left = (y_fnd_L - (G2S_L_plug - y_walk_left)) - slope_left * (x_fnd_L - CL_L_plug)  #evaluate at left point
+            left_bottom_wall_y = left_bottom_wall_x * slope_left + int_left
+        if y_walk_right > G2S_R_plug:
+            right_bottom_wall_y = np.ones(100) * (y_fnd_R + (y_walk_right - G2S_R_plug))
+        else:
+            slope_right = (y_fnd_R - (y_fnd_R - (G2S_R_plug - y_walk_right))) / (x_fnd_R - (x_fnd_R + CL_R_plug))
+            int_right = (y_fnd_R - (G2S_R_plug - y_walk_right)) - slope_right * (x_fnd_R + CL_R_plug)  #evaluate at right point
+            right_bottom_wall_y = right_bottom_wall_x * slope_right + int_right
+
+        plt.plot(left_bottom_wall_x, left_bottom_wall_y)
+        plt.plot(right_bottom_wall_x, right_bottom_wall_y)
+
+            # Top ramp walls
+        left_top_wall_x = np.linspace(x_fnd_L - CL_L_plug, x_fnd_L, 100)
+        right_top_wall_x = np.linspace(x_fnd_R + CL_R_plug, x_fnd_R, 100)
+
+        if LowSide == 'Left':
+            if y_walk_left > G2S_L_plug:
+                topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_low_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
+                topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
+                left_top_wall_y = left_top_wall_x * topslope_left + topint_left
+            else:
+                topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_low_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
+                topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
+                left_top_wall_y = left_top_wall_x * topslope_left + topint_left
+            if y_walk_right > G2S_R_plug:
+                topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_high_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
+                topint_right = (y_fnd_R + y_walk_right) - topslope_right * (x_fnd_R)
+                right_top_wall_y = right_top_wall_x * topslope_right + topint_right
+            else:
+                topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_high_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
+                topint_right = (y_fnd_R + y_walk_left) - topslope_left * (x_fnd_L)
+                right_top_wall_y = right_top_wall_x * topslope_right + topint_right
+        else:
+            if y_walk_left > G2S_L_plug:
+                topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L + (y_walk_left - G2S_L_plug) + anchor_height + h_back_high_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
+                topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
+                left_top_wall_y = left_top_wall_x * topslope_left + topint_left
+            else:
+                topslope_left = ((y_fnd_L + y_walk_left) - (y_fnd_L - (G2S_L_plug - y_walk_left) + anchor_height + h_back_high_plug)) / (x_fnd_L - (x_fnd_L - CL_L_plug))
+                topint_left = (y_fnd_L + y_walk_left) - topslope_left * (x_fnd_L)
+                left_top_wall_y = left_top_wall_x * topslope_left + topint_left
+            if y_walk_right > G2S_R_plug:
+                topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R + (y_walk_right - G2S_R_plug) + anchor_height + h_back_low_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
+                topint_right = (y_fnd_R + y_walk_right) - topslope_right * (x_fnd_R)
+                right_top_wall_y = right_top_wall_x * topslope_right + topint_right
+            else:
+                topslope_right = ((y_fnd_R + y_walk_right) - (y_fnd_R - (G2S_R_plug - y_walk_right) + anchor_height + h_back_low_plug)) / (x_fnd_R - (x_fnd_R + CL_R_plug))
+                topint_right = (y_fnd_R + y_walk_left) - topslope_left * (x_fnd_L)
+                right_top_wall_y = right_top_wall_x * topslope_right + topint_right
+        plt.plot(left_top_wall_x, left_top_wall_y)
+        plt.plot(right_top_wall_x, right_top_wall_y)
+
+        # set limits
+        plt.xlim(np.floor(x_fnd_L - CL_L_plug - 10), np.floor(x_fnd_R + CL_R_plug + 10))
+        plt.ylim(np.floor(HWL - 10), np.floor(max(y_fnd_L, y_fnd_R) + 10))
+        if figure_path:
+            plt.savefig(figure_path)
+        else:
+            plt.show()
+
+PhaseProfile.finish(Span=float(Span), DH=float(DH), LowSide=LowSide, tiers_low=float(tiers_low), tiers_high=float(tiers_high),
+                    kernel_cached=kernel_cached, build_only=build_only)
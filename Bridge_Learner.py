@@ -1,10 +1,9 @@
-import pandas as pd
-import shutil as shit
 import numpy as np
+import LearningEngine
 
 # Update "learning" variables as "weights" - not physical
 
-# First, start with a range.
+# First, start with a range. WeightCalibration.py searches the range against as-built bridges (AsBuilt.csv)
 wm = 1  #weight of masonry
 we = 1  #weight of excavation
 wc = 1  #weight of cement
@@ -12,7 +11,12 @@ ws = 1  #weight of sand
 wg = 1  #weight of gravel
 wr = 1  #weight of rocks
 
-# Open and run BridgeDesigner
-stream = open("BridgeDesigner_Learning.py")
-read_file = stream.read()
-exec(read_file)
\ No newline at end of file
+# Build BridgeDesigner's model once, each weight set after that is only a solve
+engine = LearningEngine.load_engine()
+res, report = LearningEngine.solve_weights(engine, [wm, we, wc, ws, wg, wr])
+
+print('weights ' + str([wm, we, wc, ws, wg, wr]) + ' give cost ' + str(round(res.fun, 2)))
+print('design ' + str(np.round(res.x, 2)))
+print('Cable FOS is ' + str(round(report['FOS_CABLE'], 2)) + ', Uplift FOS ' + str(round(report['FOS_UPLIFT_LOW'], 2)) + ' / '
+      + str(round(report['FOS_UPLIFT_HIGH'], 2)) + ', Sliding FOS ' + str(round(report['FOS_SLIDING_LOW'], 2)) + ' / '
+      + str(round(report['FOS_SLIDING_HIGH'], 2)))
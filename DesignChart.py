@@ -0,0 +1,145 @@
+## Description
+
+    # Design chart of Initialize.py: optimal abutment geometry and cost over a grid of Span and DH
+    # Initialize's model is compiled once, at every (Span, DH) point the abutment variables and the live sag are solved
+    # with Span and DH held fixed, points are spread across a process pool
+    # Like BridgeDesigner, each point is held to the FOS and freeboard targets and to the live sag balance (SagCalculator,
+    # closed form parabola), the construction and hoisting sags are solved for the result, and the ramp, soil and upper
+    # triangle areas and the material quantities have to stay positive so the design can be built
+    # The chart is written to chart_path, estimate() interpolates it for a preliminary design of any span and DH inside it,
+    # points that miss the targets are flagged in the chart ('meets FOS targets') and estimate() refuses to use them
+    # Anchor size still comes from the span range on the Constants sheet, not from the chart's Span
+
+    # How to use? Set the grid, run, then DesignChart.estimate(DesignChart.read_chart(), span, dh)
+
+## Imports
+import contextlib
+import io
+import os
+import runpy
+import time
+import numpy as np
+import pandas as pd
+from scipy.optimize import Bounds
+from scipy.optimize import NonlinearConstraint
+from scipy.optimize import minimize
+import Optimizer
+import SagCalculator
+
+## Inputs
+spans = np.arange(20, 121, 5)  # meters
+DHs = np.arange(0, 10.5, 0.5)  # meters
+chart_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'DesignChart.csv')
+workers = os.cpu_count()
+
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Initialize.py')
+variable_names = ['G2S_L', 'G2S_R', 'CL_L', 'CL_R', 'x1', 'x2', 'x4', 'h_back_low', 'h_back_high']
+fos_targets = {'FOS_CABLE': 3, 'FOS_UPLIFT_LOW': 1.5, 'FOS_UPLIFT_HIGH': 1.5, 'FOS_SLIDING_LOW': 1.5, 'FOS_SLIDING_HIGH': 1.5, 'Freeboard': 0}
+buildable = ['Cement', 'Rocks', 'Sand', 'Labor_Cost', 'area_ramp_low', 'area_ramp_high', 'soil_area_low', 'soil_area_high',
+             'upper_triangle', 'upper_triangle_high']  # each at least 0
+outer = Optimizer.outer  # the construction and hoisting sags are solved after the solve, as in Optimizer
+
+
+def load_model():
+    import sympy as sym
+    with contextlib.redirect_stdout(io.StringIO()):
+        model = runpy.run_path(script, init_globals={'build_only': True})
+    model['checks'] = sym.lambdify([model['variables']], [model[name] for name in fos_targets], cse=True)
+    model['quantities'] = sym.lambdify([model['variables']], [model[name] for name in buildable], cse=True)
+    model['live_load'] = sym.lambdify([model['Span']], model['W_live'])
+    return model
+
+
+    # compiled in the parent and inherited by forked workers, only compiled again in a worker without fork
+model = None
+
+
+def start_worker():
+    global model
+    if model is None:
+        model = load_model()
+
+
+    # SagCalculator's site of one chart point, the cable is the exact parabola over the span
+def point_sag_site(span, dh):
+    return SagCalculator.sag_site(span, dh, model['LowSide'], model['design_sag_percent'], model['W_cable'], model['W_dead'],
+                                  model['live_load'](span), [0, span], model['V_Anchor'], model['H_Anchor'], model['offset'],
+                                  model['tower_height'], model['WalkNumber'], model['HandNumber'], model['E_cable'], model['A_cable'],
+                                  model['saddle_friction'], model['construction_stretch'], 'closed_form')
+
+
+    # Initialize's cost, gradient and checks on the outer variables with Span and DH fixed, x1 and x2 at the design sag
+    # until they are solved
+def solve_point(span, dh):
+    site = point_sag_site(span, dh)
+
+    def full_variables(y):
+        variables = np.full(11, SagCalculator.design_sag(site))
+        variables[:2] = span, dh
+        variables[2:][outer] = y
+        return variables
+
+    lb = model['bounds'].lb[2:].copy()
+    lb[[2, 3, 4, 5, 6]] = np.maximum(lb[[2, 3, 4, 5, 6]], SagCalculator.sag_limits[0] * span)
+    bounds = Bounds(lb[outer], model['bounds'].ub[2:][outer])
+    constraints = [NonlinearConstraint(lambda y: np.asarray(model['checks'](full_variables(y)), dtype=float), list(fos_targets.values()), np.inf),
+                   NonlinearConstraint(lambda y: np.asarray(model['quantities'](full_variables(y)), dtype=float), 0, np.inf),
+                   NonlinearConstraint(lambda y: [SagCalculator.live_residual(full_variables(y)[2:], site)], 0, 0,
+                                       jac=lambda y: SagCalculator.live_residual_gradient(full_variables(y)[2:], site)[None, outer])]
+    y0 = np.clip([3, 3, 10, 10, 1.2 * SagCalculator.design_sag(site), 1, 1], bounds.lb, bounds.ub)  # live sag a fifth over the design sag
+    res = minimize(lambda y: model['Cost_function'](full_variables(y)), y0, method='trust-constr',
+                   jac=lambda y: model['Cost_gradient'](full_variables(y))[2:][outer], bounds=bounds, constraints=constraints)
+    variables = full_variables(res.x)
+    try:
+        variables[[6, 7]] = SagCalculator.construction_sags(variables[2:], site)
+    except ValueError:
+        variables[[6, 7]] = np.nan
+    row = {'Span': float(span), 'DH': float(dh)}
+    row.update(zip(variable_names, variables[2:]))
+    row['Cost'] = float(res.fun)
+    row.update(zip(fos_targets, model['checks'](variables)))
+    quantities = model['quantities'](variables)
+    row['meets FOS targets'] = bool(all(row[name] >= target - Optimizer.tolerance for name, target in fos_targets.items())
+                                    and min(quantities) >= -Optimizer.tolerance and abs(SagCalculator.live_residual(variables[2:], site)) < 1
+                                    and np.all(np.isfinite(variables)))
+    return row
+
+
+def design_chart(spans=spans, DHs=DHs, workers=None):
+    global model
+    if model is None:
+        model = load_model()
+    workers = workers or os.cpu_count()
+    points = [(span, dh) for span in spans for dh in DHs]
+    with Optimizer.process_pool(workers, start_worker) as pool:
+        rows = list(pool.map(solve_point, *zip(*points), chunksize=max(1, len(points) // (4 * workers))))
+    return pd.DataFrame(rows)
+
+
+def read_chart(path=chart_path):
+    return pd.read_csv(path)
+
+
+    # Linear interpolation of every chart column at (span, dh), both have to be inside the chart's grid and the points
+    # around it have to meet the FOS targets
+def estimate(chart, span, dh):
+    from scipy.interpolate import RegularGridInterpolator
+    grid_spans = np.unique(chart['Span'])
+    grid_DHs = np.unique(chart['DH'])
+    values = chart.sort_values(['Span', 'DH'])
+    feasible = values['meets FOS targets'].to_numpy(dtype=float).reshape(len(grid_spans), len(grid_DHs))
+    if RegularGridInterpolator((grid_spans, grid_DHs), feasible)([span, dh])[0] < 1:
+        raise ValueError('the chart points around span ' + str(span) + ' m and DH ' + str(dh) + ' m miss the FOS targets, run BridgeDesigner for this site')
+    estimates = {}
+    for name in variable_names + ['Cost']:
+        table = values[name].to_numpy(dtype=float).reshape(len(grid_spans), len(grid_DHs))
+        estimates[name] = float(RegularGridInterpolator((grid_spans, grid_DHs), table)([span, dh])[0])
+    return estimates
+
+
+if __name__ == '__main__':
+    start = time.perf_counter()
+    chart = design_chart(spans, DHs, workers)
+    chart.to_csv(chart_path, index=False)
+    print(str(len(chart)) + ' (Span, DH) points solved in ' + str(round(time.perf_counter() - start, 1)) + ' s, '
+          + str(int((~chart['meets FOS targets']).sum())) + ' miss the FOS targets, chart in ' + chart_path)
@@ -21,14 +21,18 @@
 #11. Setback is 3m and 35 degree angle is assumed to be met so span is satisfied
 
 ## Imports
-import pandas as pd
 import sympy as sym
 from sympy import Symbol
-from sympy.core.relational import Relational
 import mpmath as mp
 import numpy as np
 from scipy.optimize import minimize
-from scipy.optimize import LinearConstraint
+from scipy.optimize import Bounds
+import SagCalculator
+import SymbolicDerivatives
+import WorkbookLoader
+
+    # DesignChart runs this script with build_only = True to get the compiled cost without solving
+build_only = globals().get('build_only', False)
 
 ## Constant Variables
 
@@ -55,10 +59,14 @@ tower_volume = 2.492  #m3 this assumes the tower and walkway volume to be a cons
 masonry_labor = 5 #m3 a day of masonry
 fill_labor = 20 #m3 a day of fill
 excavation_labor = 3 #m3 a day of excavation
+E_cable = 90000 # MPa elastic modulus of the cable
+construction_stretch = 0.05 #percent
+saddle_friction = 0.15 #coefficient of friction across saddle
 
     # Read in the file
 path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
-Constants = pd.read_excel(path, sheet_name="Constants")
+inputs = WorkbookLoader.load_inputs(path)
+Constants = inputs['Constants']
 
 Span = Symbol('Span', real = True)  #delta h value in meters
 SpanRange = Constants.iloc[7, 1]  #span range in meters
@@ -68,7 +76,7 @@ HandNumber = Constants.iloc[2, 1]  #handrail cable number
 TotalCables = WalkNumber + HandNumber
 LowSide = Constants.iloc[3, 1]  #Left or Right
 design_sag_percent = Constants.iloc[6, 1]  #design sag percent
-design_sag = design_sag_percent * Span
+design_sag = design_sag_percent * Span / 100
 if SpanRange > 100:
     V_Anchor = 0.75  #vertical distance from where cable meets anchor to top of anchor (m)
     H_Anchor = 0.725  #horizontal distance from where cable meets anchor to front (m)
@@ -91,7 +99,7 @@ else:
     b2 = 1.4
     b1 = 1.1
 
-Lookups = pd.read_excel(path, sheet_name="Lookup")
+Lookups = inputs['Lookup']
 
 CableArea = Lookups.iloc[0, 0]
 A_cable = CableArea*TotalCables
@@ -173,18 +181,18 @@ FOS_CABLE = max_cable_tension / (max_force / TotalCables)
     # Uplift FOS
 if LowSide == 'Left':
     area_low = (CL_L * (anchor_height + h_back_low)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_low))
-    area_high = (CL_R * (anchor_height + h_back_low)) + (0.5 * CL_R * (G2S_L - anchor_height - h_back_low))
+    area_high = (CL_R * (anchor_height + h_back_high)) + (0.5 * CL_R * (G2S_R - anchor_height - h_back_high))
     tiers_low = Constants.iloc[8, 1]  #total height of tiers in meteres
     tiers_high = Constants.iloc[9, 1]  #total height of tiers in meteres
     ramp_angle_low = sym.atan((G2S_L - anchor_height - h_back_low) / CL_L)
-    ramp_angle_high = sym.atan((G2S_R - anchor_height - h_back_low) / CL_R)
+    ramp_angle_high = sym.atan((G2S_R - anchor_height - h_back_high) / CL_R)
 else:
-    area_low = (CL_R * (anchor_height + h_back_low)) + (0.5 * CL_R * (G2S_L - anchor_height - h_back_low))
-    area_high = (CL_L * (anchor_height + h_back_low)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_low))
+    area_low = (CL_R * (anchor_height + h_back_low)) + (0.5 * CL_R * (G2S_R - anchor_height - h_back_low))
+    area_high = (CL_L * (anchor_height + h_back_high)) + (0.5 * CL_L * (G2S_L - anchor_height - h_back_high))
     tiers_low = Constants.iloc[9, 1]
     tiers_high = Constants.iloc[8, 1]
     ramp_angle_low = sym.atan((G2S_R - anchor_height - h_back_low) / CL_R)
-    ramp_angle_high = sym.atan((G2S_L - anchor_height - h_back_low) / CL_L)
+    ramp_angle_high = sym.atan((G2S_L - anchor_height - h_back_high) / CL_L)
 uplift_x_low = (np.tan(np.radians(30)) * (anchor_height + h_back_low))  #x distance past anchor for overburden
 uplift_x_high = (np.tan(np.radians(30)) * (anchor_height + h_back_high))  #x distance past anchor for overburden
 uplift_y_low = (uplift_x_low + b2) * sym.tan(ramp_angle_low)
@@ -197,11 +205,11 @@ overburden_area_high = (b2 * (anchor_height + h_back_high)) + (uplift_x_high * (
 
 if tiers_low < 1: #this means just one half tier
     H_tiers_low = 0.9 # 0.9 m off the centerline
-    tiers_loss_low = (90 * 1) + ((90 - tier_offset) * tiers_low) + ((90 - (2 * tiers_offset)) * walkway_height)
+    tiers_loss_low = (90 * 1) + ((90 - tier_offset) * tiers_low) + ((90 - (2 * tier_offset)) * walkway_height)
     y_hand_low = 3 #distance to high siddle
 elif tiers_low == 1:
     H_tiers_low = 0.9
-    tiers_loss_low = (90 * 1) + ((90 - tier_offset) * tiers_low) + ((90 - (2 * tiers_offset)) * walkway_height)
+    tiers_loss_low = (90 * 1) + ((90 - tier_offset) * tiers_low) + ((90 - (2 * tier_offset)) * walkway_height)
     y_hand_low = 3.5
 elif tiers_low == 2:
     H_tiers_low = 1.15
@@ -217,23 +225,23 @@ elif tiers_low > 3: #this means a 1.5 foundation tier
     y_hand_low = 6
 if tiers_high < 1:  # this means just one half tier
     H_tiers_high = 0.9
-    tiers_loss_high = (90 * 1) + ((90 - tier_offset) * tiers_low) + ((90 - (2 * tier_offset)) * walkway_height)
+    tiers_loss_high = (90 * 1) + ((90 - tier_offset) * tiers_high) + ((90 - (2 * tier_offset)) * walkway_height)
     y_hand_high = 3
 elif tiers_high == 1:
     H_tiers_high = 0.9
-    tiers_loss_high = (90 * 1) + ((90 - tier_offset) * tiers_low) + ((90 - (2 * tier_offset)) * walkway_height)
+    tiers_loss_high = (90 * 1) + ((90 - tier_offset) * tiers_high) + ((90 - (2 * tier_offset)) * walkway_height)
     y_hand_high = 3.5
 elif tiers_high == 2:
     H_tiers_high = 1.15
-    tiers_loss_high = (115 * 1) + ((115 - (tier_offset * (tiers_low - 1))) * 1) + ((115 - (tier_offset * tiers_low)) * 1) + ((115 - ((tiers_low + 1) * tier_offset)) * walkway_height)
+    tiers_loss_high = (115 * 1) + ((115 - (tier_offset * (tiers_high - 1))) * 1) + ((115 - (tier_offset * tiers_high)) * 1) + ((115 - ((tiers_high + 1) * tier_offset)) * walkway_height)
     y_hand_high = 4.5
 elif tiers_high == 3:
     H_tiers_high = 1.4
-    tiers_loss_high = (140 * 1) + ((140 - (tier_offset * (tiers_low - 2))) * 1) + ((140 - (tier_offset * (tiers_low - 1))) * 1) + ((140 - (tier_offset * tiers_low)) * 1) + ((140 - ((tiers_low + 1) * tier_offset)) * walkway_height)
+    tiers_loss_high = (140 * 1) + ((140 - (tier_offset * (tiers_high - 2))) * 1) + ((140 - (tier_offset * (tiers_high - 1))) * 1) + ((140 - (tier_offset * tiers_high)) * 1) + ((140 - ((tiers_high + 1) * tier_offset)) * walkway_height)
     y_hand_high = 5.5
 elif tiers_high > 3:  # this means a 1.5 foundation tier
     H_tiers_high = 1.4
-    tiers_loss_high = (140 * 1.5) + ((140 - (tier_offset * (tiers_low - 2))) * 1) + ((140 - (tier_offset * (tiers_low - 1))) * 1) + ((140 - (tier_offset * tiers_low)) * 1) + ((140 - ((tiers_low + 1) * tier_offset)) * walkway_height)
+    tiers_loss_high = (140 * 1.5) + ((140 - (tier_offset * (tiers_high - 2))) * 1) + ((140 - (tier_offset * (tiers_high - 1))) * 1) + ((140 - (tier_offset * tiers_high)) * 1) + ((140 - ((tiers_high + 1) * tier_offset)) * walkway_height)
     y_hand_high = 6
 if tiers_low > 3:
     ground_height_low = (H_Anchor + 1.5) / 2
@@ -315,8 +323,8 @@ W_rampcap_low = ramplength_overburden_low * ramp_thickness * ramp_width * d_maso
 W_rampcap_high = ramplength_overburden_high * ramp_thickness * ramp_width * d_masonry
 
         #rampwalls
-area_ramp_low = area_low - soil_area_low - anchor_area - (backwall_thickness * h_back_low) - (ramplength_overburden_low * ramp_thickness) - tiers_loss_low
-area_ramp_high = area_high - soil_area_high - anchor_area - (backwall_thickness * h_back_high) - (ramplength_overburden_high * ramp_thickness) - tiers_loss_high
+area_ramp_low = area_low - soil_area_low - anchor_area - (backwall_thickness * h_back_low) - (ramplength_overburden_low * ramp_thickness) - (tiers_loss_low / 100)
+area_ramp_high = area_high - soil_area_high - anchor_area - (backwall_thickness * h_back_high) - (ramplength_overburden_high * ramp_thickness) - (tiers_loss_high / 100)
             #if the tiers are 2, we want to subtract one meter down from the top
 if LowSide == 'Left':
     upper_triangle = (G2S_L - anchor_height - h_back_low)
@@ -596,7 +604,7 @@ elif tiers_low == 3:
     L_tiers_low = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03 + 9 + 12.96
 elif tiers_low > 3:
     M_tiers_low = ((4.42 * cementperfill) + (7.36 * cementpermasonry)) + ((2.52 * cementperfill) + (4.95 * cementpermasonry)) + ((6.58 * cementperfill) + (10.03 * cementpermasonry)) + ((13.5 * cementperfill) + (19.44 * cementpermasonry))
-    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockperpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((13.5 * rockperfill) + (19.44 * rockpermasonry))
+    R_tiers_low = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((13.5 * rockperfill) + (19.44 * rockpermasonry))
     S_tiers_low = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry)) + ((13.5 * sandperfill) + (19.44 * sandpermasonry))
     E_tiers_low = 13.5 + 19.44
     L_tiers_low = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03 + 13.5 + 19.44
@@ -629,7 +637,7 @@ elif tiers_high > 3:
     R_tiers_high = ((4.42 * rockperfill) + (7.36 * rockpermasonry)) + ((2.52 * rockperfill) + (4.95 * rockpermasonry)) + ((6.58 * rockperfill) + (10.03 * rockpermasonry)) + ((13.5 * rockperfill) + (19.44 * rockpermasonry))
     S_tiers_high = ((4.42 * sandperfill) + (7.36 * sandpermasonry)) + ((2.52 * sandperfill) + (4.95 * sandpermasonry)) + ((6.58 * sandperfill) + (10.03 * sandpermasonry)) + ((13.5 * sandperfill) + (19.44 * sandpermasonry))
     E_tiers_high = 13.5 + 19.44
-    L_tiers_high = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 13.5 + 9 + 19.44
+    L_tiers_high = 4.42 + 7.36 + 2.52 + 4.95 + 6.58 + 10.03 + 13.5 + 19.44
 
 M_tiers = ((M_tiers_low + M_tiers_high) / 50)  #value in 50 kg bags
 
@@ -705,31 +713,50 @@ else:
 # penalty = cable_penalty + sliding_low_penalty + sliding_high_penalty + uplift_high_penalty + uplift_low_penalty + freeboard_penalty + delta_penalty
 
         # variable order is Span, DH, G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high
-# bounds = Bounds([0, 120], [0, 10], [0, 5], [0, 5], [0, 15], [0, 15], [0, 10], [0, 10], [0, 10], [0, 5], [0, 5])
-linear_constraint = LinearConstraint([[1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0], [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-                      [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0], [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-                      [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0], [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
-                      [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1]], [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                     [120, 10, 5, 5, 15, 15, 10, 10, 10, 5, 5])
+        # as in BridgeDesigner: G2S at most half a meter below the walkway, CL and the sags off zero where the backstay and
+        # sag terms divide by zero
+span_range = (20, 120)  #meters
+DH_range = (0, 10)  #meters
+if LowSide == 'Left':
+    y_walk_left = y_hand_low - tower_height
+    y_walk_right = y_hand_high - tower_height
+else:
+    y_walk_left = y_hand_high - tower_height
+    y_walk_right = y_hand_low - tower_height
+min_length = SagCalculator.sag_limits[0] * span_range[1]
+bounds = Bounds([span_range[0], DH_range[0], y_walk_left - 0.5, y_walk_right - 0.5, min_length, min_length, min_length, min_length, min_length, 0, 0],
+                [span_range[1], DH_range[1], 10, 10, 15, 15, 10, 10, 10, 5, 5])
 
 ## Solve for minimal "cost" with safety and serviceability constraints.
 Cost = Material_Cost + Labor_Cost # + penalty
-Cost_function = sym.lambdify([(Span, DH, G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high)], Cost)
+variables = (Span, DH, G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high)
+Cost_function = sym.lambdify([variables], Cost)
+
+    # exact derivatives for trust-constr (see SymbolicDerivatives)
+gradient, hessian = SymbolicDerivatives.gradient_and_hessian(Cost, variables)
+Cost_gradient_chain = SymbolicDerivatives.lambdify_chain([variables], *gradient)
+Cost_hessian_chain = SymbolicDerivatives.lambdify_chain([variables], *hessian)
+def Cost_gradient(variables):
+    return np.asarray(Cost_gradient_chain(variables), dtype=float)
+def Cost_hessian(variables):
+    return np.asarray(Cost_hessian_chain(variables), dtype=float)
 
 ## Minimize
-x0 = np.array([60, 3, 3, 3, 10, 10, 2, 3, 4, 1, 1])
-res = minimize(Cost_function, x0, method='trust-constr', constraints=[linear_constraint], options={'verbose': 1})
-
-print('Span is ' + str(np.floor(res.x[0])) + ' meters')
-print('DH is ' + str(np.floor(res.x[1])) + ' meters')
-print('G2S_L is ' + str(np.floor(res.x[2])) + ' meters')
-print('G2S_R is ' + str(np.floor(res.x[3])) + ' meters')
-print('CL_L is ' + str(np.floor(res.x[4])) + ' meters')
-print('CL_R is ' + str(np.floor(res.x[5])) + ' meters')
-print('hoisting sag is ' + str(np.floor(res.x[6])) + ' meters')
-print('design sag is ' + str(np.floor(res.x[7])) + ' meters')
-print('live load sag is ' + str(np.floor(res.x[8])) + ' meters')
-print('backwall height low is ' + str(np.floor(res.x[9])) + ' meters')
-print('backwall height high is ' + str(np.floor(res.x[10])) + ' meters')
+if not build_only:
+    x0 = np.array([60, 3, 3, 3, 10, 10, 2, 3, 4, 1, 1])
+    res = minimize(Cost_function, x0, method='trust-constr', jac=Cost_gradient, hess=Cost_hessian, bounds=bounds, options={'verbose': 1})
+    print('trust-constr used ' + str(res.nfev) + ' cost, ' + str(res.njev) + ' gradient and ' + str(res.nhev) + ' Hessian evaluations')
+
+    print('Span is ' + str(np.floor(res.x[0])) + ' meters')
+    print('DH is ' + str(np.floor(res.x[1])) + ' meters')
+    print('G2S_L is ' + str(np.floor(res.x[2])) + ' meters')
+    print('G2S_R is ' + str(np.floor(res.x[3])) + ' meters')
+    print('CL_L is ' + str(np.floor(res.x[4])) + ' meters')
+    print('CL_R is ' + str(np.floor(res.x[5])) + ' meters')
+    print('hoisting sag is ' + str(np.floor(res.x[6])) + ' meters')
+    print('design sag is ' + str(np.floor(res.x[7])) + ' meters')
+    print('live load sag is ' + str(np.floor(res.x[8])) + ' meters')
+    print('backwall height low is ' + str(np.floor(res.x[9])) + ' meters')
+    print('backwall height high is ' + str(np.floor(res.x[10])) + ' meters')
 
 ## Present Solution (graphically, numerically)
\ No newline at end of file
@@ -0,0 +1,56 @@
+## Description
+
+    # On-disk cache for the lambdified cost kernel of BridgeDesigner
+    # A kernel is keyed by the contents of the input sheets plus the source of the code that builds it,
+    # so editing either the workbook or the model throws the old kernel away
+
+## Imports
+import hashlib
+import inspect
+import os
+import pickle
+import numpy as np
+
+## Cache location
+    # set BRIDGEDESIGNER_CACHE to move the cache, default is next to this file
+cache_dir = os.environ.get('BRIDGEDESIGNER_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.kernel_cache'))
+
+
+def kernel_key(sheets, code_files):
+    digest = hashlib.sha256()
+    for sheet in sheets:
+        digest.update(sheet.to_csv(index=False).encode())
+    for code_file in code_files:
+        with open(code_file, 'rb') as stream:
+            digest.update(stream.read())
+    return digest.hexdigest()
+
+
+def kernel_file(key):
+    return os.path.join(cache_dir, key + '.pkl')
+
+
+    # lambdify functions can't be pickled, so store the generated source and exec it again on load
+def save_kernel(key, functions):
+    sources = {}
+    for name, function in functions.items():
+        sources[name] = inspect.getsource(function)
+    os.makedirs(cache_dir, exist_ok=True)
+    temp_file = kernel_file(key) + '.tmp'
+    with open(temp_file, 'wb') as stream:
+        pickle.dump(sources, stream)
+    os.replace(temp_file, kernel_file(key))  # no half written kernels if the run is killed
+
+
+def load_kernel(key):
+    if not os.path.exists(kernel_file(key)):
+        return None
+    with open(kernel_file(key), 'rb') as stream:
+        sources = pickle.load(stream)
+    functions = {}
+    for name, source in sources.items():
+        namespace = {'numpy': np}  # same namespace lambdify(modules='numpy') generates against
+        exec('from numpy import *', namespace)
+        exec(compile(source, '<kernel ' + name + '>', 'exec'), namespace)
+        functions[name] = namespace['_lambdifygenerated']
+    return functions
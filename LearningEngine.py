@@ -0,0 +1,35 @@
+## Description
+
+    # Learning path of BridgeDesigner as something to import instead of exec'ing a copy of the script per weight set
+    # load_engine builds (or loads from the kernel cache) the compiled model of a site once, the six cost weights
+    # (masonry, excavation, cement, sand, gravel, rock) are arguments of that model, so each new weight set is only a solve
+
+## Imports
+import contextlib
+import io
+import os
+import runpy
+import numpy as np
+import Optimizer
+
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BridgeDesigner.py')
+weight_names = Optimizer.weight_names
+
+
+    # site_inputs is (Constants, Lookups, Geometry) as from SiteInputs.site_inputs, None is the MasterInputs site
+def load_engine(site_inputs=None):
+    init_globals = {'build_only': True}
+    if site_inputs is not None:
+        init_globals['site_inputs'] = site_inputs
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = runpy.run_path(script, init_globals=init_globals)
+    return run['problem']
+
+
+    # weights in the order of weight_names, returns the scipy result and the report (checks, quantities, costs) of it
+def solve_weights(engine, weights, x0=None, solver='trust-constr'):
+    problem = dict(engine, weights=np.asarray(weights, dtype=float))
+    if x0 is None:
+        x0 = problem['x0']
+    res = Optimizer.solve(x0, solver, problem)
+    return res, Optimizer.report(res.x, problem)
@@ -0,0 +1,237 @@
+## Description
+
+    # Solver side of BridgeDesigner: cost, derivatives and the local and multi-start solves
+    # Kept out of the BridgeDesigner script so worker processes can import it without running the whole script
+    # A problem is a dict with
+    #   kernel, kernel_key                  compiled model from KernelCache ('model', 'report', 'Cost_gradient', 'Cost_hessian')
+    #   kernel_names, report_names          names of the 'model' and 'report' outputs
+    #   x0                                  starting guess of the site
+    #   weights                             cost weights (masonry, excavation, cement, sand, gravel, rock), kernel arguments
+    #   sag_site                            SagCalculator.sag_site of the site
+    #   bounds, fos_targets                 scipy Bounds on the 9 variables, minimum value of each check
+    #   fos_mode                            'constraints' or 'penalty', how fos_targets are enforced
+    #   cost_scale, use_exact_hessian       solver settings, see ## Problem in BridgeDesigner
+    # Designs are the 9 variables everywhere outside solve(), which only moves the 7 outer ones (see outer)
+
+## Imports
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from scipy.optimize import Bounds
+from scipy.optimize import NonlinearConstraint
+from scipy.optimize import minimize
+import KernelCache
+import SagCalculator
+
+
+## Cost
+    # the cost weights in the order the compiled model takes them (problem['weights']), BridgeDesigner names its symbols
+    # with these and LearningEngine and WeightCalibration label weight sets with them
+weight_names = ['weight_masonry', 'weight_excav', 'weight_cement', 'weight_sand', 'weight_gravel', 'weight_rock']
+
+
+def model(variables, problem):
+    return dict(zip(problem['kernel_names'], problem['kernel']['model'](variables, problem['weights'])))
+
+
+    # checks and intermediates (Ph, Cement, Labor_Cost ...) of a solution from one call, as a vector and by name
+def report_vector(variables, problem):
+    return np.asarray(problem['kernel']['report'](variables, problem['weights']), dtype=float)
+
+
+def report(variables, problem):
+    return dict(zip(problem['report_names'], report_vector(variables, problem)))
+
+
+def uses_penalty(solver, problem):
+    return problem['fos_mode'] == 'penalty' or solver == 'L-BFGS-B'
+
+
+    # construction and hoisting sag (x1, x2) aren't in the symbolic model, SagCalculator solves them for a design once
+    # the rest is known, so the optimizer only moves the other seven
+    # until then they hold the design sag, the live residual doesn't depend on them but 0 would divide by zero
+outer = [0, 1, 2, 3, 6, 7, 8]  # G2S_L, G2S_R, CL_L, CL_R, x4, h_back_low, h_back_high
+
+
+def full_variables(y, problem):
+    variables = np.zeros(9)
+    variables[outer] = y
+    variables[[4, 5]] = SagCalculator.design_sag(problem['sag_site'])
+    return variables
+
+
+def cost_function(variables, problem, penalty_terms=False):
+    values = problem['kernel']['model'](variables, problem['weights'])
+    cost = values[0]
+    if penalty_terms:
+        cost += penalty(dict(zip(problem['kernel_names'], values))) + abs(SagCalculator.live_residual(variables, problem['sag_site'])) * 1000000
+    return cost
+
+
+def cost_gradient(variables, problem, penalty_terms=False):
+    gradient = np.asarray(problem['kernel']['Cost_gradient'](variables, problem['weights']), dtype=float)
+    if penalty_terms:
+        gradient += penalty_gradient(model(variables, problem), problem) @ checks_jacobian(variables, problem)
+        gradient += np.sign(SagCalculator.live_residual(variables, problem['sag_site'])) * SagCalculator.live_residual_gradient(variables, problem['sag_site']) * 1000000
+    return gradient
+
+
+def cost_hessian(variables, problem):
+    return np.asarray(problem['kernel']['Cost_hessian'](variables, problem['weights']), dtype=float)
+
+
+## Constraints
+    # rows in the order of fos_targets
+def checks_jacobian(variables, problem):
+    return np.asarray(problem['kernel']['checks_jacobian'](variables, problem['weights']), dtype=float)
+
+
+def check_values(variables, problem):
+    checks = model(variables, problem)
+    return np.array([checks[name] for name in problem['fos_targets']])
+
+
+    # every check at least its target, on the outer variables with the exact Jacobian, constraint Hessians are left to the solver
+def fos_constraint(problem):
+    return NonlinearConstraint(lambda y: check_values(full_variables(y, problem), problem), list(problem['fos_targets'].values()), np.inf,
+                               jac=lambda y: checks_jacobian(full_variables(y, problem), problem)[:, outer])
+
+
+    # the live case elongation balance, ties the live sag x4 to the backstay geometry
+def sag_constraint(problem):
+    return NonlinearConstraint(lambda y: [SagCalculator.live_residual(full_variables(y, problem), problem['sag_site'])], 0, 0,
+                               jac=lambda y: SagCalculator.live_residual_gradient(full_variables(y, problem), problem['sag_site'])[None, outer])
+
+
+    # the penalty formulation the FOS targets had before they were constraints, kept for L-BFGS-B and for comparison
+    # it pulls cable and uplift FOS onto their targets from both sides and has no freeboard term, so its optimum is
+    # dearer than the constrained one (about 15 % with trust-constr on MasterInputs)
+def penalty(checks):
+    return (abs(checks['FOS_CABLE'] - 3) + (checks['FOS_SLIDING_LOW'] - 1.5)**2 + (checks['FOS_SLIDING_HIGH'] - 1.5)**2
+            + abs(checks['FOS_UPLIFT_LOW'] - 1.5) * 10000000 + abs(checks['FOS_UPLIFT_HIGH'] - 1.5) * 10000000)
+
+
+    # d(penalty)/d(check) in the order of fos_targets
+def penalty_gradient(checks, problem):
+    slopes = {'FOS_CABLE': np.sign(checks['FOS_CABLE'] - 3),
+              'FOS_UPLIFT_LOW': np.sign(checks['FOS_UPLIFT_LOW'] - 1.5) * 10000000,
+              'FOS_UPLIFT_HIGH': np.sign(checks['FOS_UPLIFT_HIGH'] - 1.5) * 10000000,
+              'FOS_SLIDING_LOW': 2 * (checks['FOS_SLIDING_LOW'] - 1.5),
+              'FOS_SLIDING_HIGH': 2 * (checks['FOS_SLIDING_HIGH'] - 1.5)}
+    return np.array([slopes.get(name, 0) for name in problem['fos_targets']])
+
+
+    # areas (m2) and quantities a design can't be built with less than 0 of, by report name, a stored report from before
+    # the areas were in it doesn't count as buildable
+buildable_names = ['Cement', 'Rocks', 'Sand', 'Gravel', 'Labor_Cost', 'area_ramp_low', 'area_ramp_high', 'soil_area_low', 'soil_area_high']
+tolerance = 1e-6
+
+
+def buildable(values):
+    return all(name in values and values[name] >= -tolerance for name in buildable_names)
+
+
+    # an active constraint leaves FOS on its target within the solver's tolerance, tolerance allows for that and no more
+    # (rounding to the printed 2 decimals let FOS 2.995 pass a target of 3)
+def meets_targets(x, problem):
+    if not np.all(np.isfinite(x)):  # construction or hoisting sag not solved
+        return False
+    checks = model(x, problem)
+    return all(checks[name] >= target - tolerance for name, target in problem['fos_targets'].items())
+
+
+    # a start the solver can take its first step from, cost, gradient and check Jacobian all finite (a design on a bound
+    # can divide by zero)
+def finite_start(x, problem):
+    return (np.isfinite(cost_function(x, problem)) and np.all(np.isfinite(cost_gradient(x, problem)))
+            and np.all(np.isfinite(checks_jacobian(x, problem))))
+
+
+## Local solve
+    # solver is 'trust-constr', 'SLSQP' or 'L-BFGS-B', x0 and the returned res.x are all 9 variables
+def solve(x0, solver, problem):
+    bounds = Bounds(problem['bounds'].lb[outer], problem['bounds'].ub[outer])
+    y0 = np.asarray(x0, dtype=float)[outer]
+    penalty_terms = uses_penalty(solver, problem)
+    constraints = [] if penalty_terms else [fos_constraint(problem), sag_constraint(problem)]
+    scale = 1 if solver == 'trust-constr' else problem['cost_scale']  # SLSQP and L-BFGS-B need a cost of order one
+    cost = lambda y: cost_function(full_variables(y, problem), problem, penalty_terms) * scale
+    gradient = lambda y: cost_gradient(full_variables(y, problem), problem, penalty_terms)[outer] * scale
+    if solver == 'trust-constr':
+        # the exact Hessian doesn't see the kinks of the abs() penalties and stalls on them, BFGS copes
+        if problem['use_exact_hessian'] and not penalty_terms:
+            res = minimize(cost, y0, method=solver, jac=gradient, hess=lambda y: cost_hessian(full_variables(y, problem), problem)[np.ix_(outer, outer)],
+                           bounds=bounds, constraints=constraints)
+        else:
+            res = minimize(cost, y0, method=solver, jac=gradient, bounds=bounds, constraints=constraints)
+    else:
+        # SLSQP and L-BFGS-B need a start inside the bounds, SLSQP's default ftol stops while the constraints are still
+        # being traded against the cost
+        options = {'ftol': 1e-9, 'maxiter': 500} if solver == 'SLSQP' else {}
+        res = minimize(cost, np.clip(y0, bounds.lb, bounds.ub), method=solver, jac=gradient, bounds=bounds, constraints=constraints,
+                       options=options)
+    res.fun = res.fun / scale
+    res.x = full_variables(res.x, problem)
+    try:
+        res.x[[4, 5]] = SagCalculator.construction_sags(res.x, problem['sag_site'])
+    except ValueError as error:  # the design is kept for inspection but doesn't count as a solution (meets_targets)
+        warnings.warn(str(error))
+        res.x[[4, 5]] = np.nan
+        res.success = False
+        res.message = str(error)
+    return res
+
+
+## Multi-start
+    # Latin hypercube points inside the bounds, the same seed gives the same points
+def starting_points(bounds, n, seed=0):
+    from scipy.stats import qmc  # scipy.stats is slow to import and only multi-start needs it
+    sampler = qmc.LatinHypercube(d=len(bounds.lb), seed=seed)
+    return qmc.scale(sampler.random(n), bounds.lb, bounds.ub)
+
+
+    # the compiled kernel can't be pickled, each worker loads it from the kernel cache once
+worker_problem = None
+
+
+def start_worker(problem):
+    global worker_problem
+    worker_problem = dict(problem, kernel=KernelCache.load_kernel(problem['kernel_key']))
+
+
+def solve_start(x0, solver):
+    res = solve(x0, solver, worker_problem)
+    return {'x0': x0, 'x': res.x, 'cost': float(res.fun), 'nfev': res.nfev, 'feasible': meets_targets(res.x, worker_problem)}
+
+
+    # fork where the platform has it, so the pool doesn't import (and run) the calling script again
+def process_pool(workers, initializer=None, initargs=()):
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+    return ProcessPoolExecutor(workers, mp_context=context, initializer=initializer, initargs=initargs)
+
+
+    # Returns the cheapest start that meets the FOS targets (cheapest overall if none do) and every start's result
+    # x0, if given, is solved as one more start so the result is never worse than the single solve from it
+def multi_start(problem, n, solver='trust-constr', seed=0, workers=None, x0=None):
+    points = starting_points(problem['bounds'], n, seed)
+    if x0 is not None:
+        points = np.vstack([x0, points])
+    shipped = {name: value for name, value in problem.items() if name != 'kernel'}
+    with process_pool(workers or os.cpu_count(), start_worker, (shipped,)) as pool:
+        results = list(pool.map(solve_start, points, [solver] * len(points)))
+    feasible = [result for result in results if result['feasible'] and np.isfinite(result['cost'])]
+    candidates = feasible or [result for result in results if np.isfinite(result['cost'])]
+    best = min(candidates, key=lambda result: result['cost'])
+    return best, results
+
+
+def spread(results):
+    costs = np.array([result['cost'] for result in results])
+    costs = costs[np.isfinite(costs)]
+    return {'starts': len(results), 'feasible': sum(result['feasible'] for result in results),
+            'min': costs.min(), 'median': np.median(costs), 'max': costs.max()}
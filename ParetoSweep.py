@@ -0,0 +1,102 @@
+## Description
+
+    # Price of extra safety for one site: the cheapest design is solved again with the FOS targets raised by a margin
+    # (epsilon-constraint, uplift and sliding 1.5 -> 1.5 * (1 + margin), FOS_CABLE 3 -> 3 * (1 + margin) if it is swept,
+    # freeboard stays), one solve per margin in a process pool, and the designs no other design beats on both cost and
+    # safety are the Pareto frontier, margins no design meets are left off it and listed
+    # Cost is Material_Cost + Labor_Cost, safety is the design's minimum FOS margin, the smallest FOS / standard target - 1
+    # over the swept checks (a design often ends with more margin than it was asked for)
+    # The targets are constraints of the solve, so the sweep uses trust-constr with fos_mode 'constraints' whatever
+    # BridgeDesigner is set to, and one compiled kernel for every margin
+
+    # How to use? Run it for the workbook's site, every margin goes to results_path and the frontier is printed
+
+## Imports
+import contextlib
+import io
+import os
+import runpy
+import time
+import numpy as np
+import pandas as pd
+import Optimizer
+
+## Inputs
+margins = np.round(np.linspace(0, 1, 11), 2)  # 0 is BridgeDesigner's design, 1 doubles every swept FOS target
+    # the abutment checks, every margin can be bought with a bigger abutment (all 11 levels meet their targets on
+    # MasterInputs), FOS_CABLE can only rise as far as the cable size and the live sag balance let it (about 22 %, 8 of
+    # the 11 levels can't be met), add it to price extra cable safety up to that point
+swept_checks = ['FOS_UPLIFT_LOW', 'FOS_UPLIFT_HIGH', 'FOS_SLIDING_LOW', 'FOS_SLIDING_HIGH']
+solver = 'trust-constr'
+results_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ParetoFrontier.csv')
+workers = os.cpu_count()
+
+script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'BridgeDesigner.py')
+variable_names = ['G2S_L', 'G2S_R', 'CL_L', 'CL_R', 'x1', 'x2', 'x4', 'h_back_low', 'h_back_high']
+fos_names = ['FOS_CABLE', 'FOS_UPLIFT_LOW', 'FOS_UPLIFT_HIGH', 'FOS_SLIDING_LOW', 'FOS_SLIDING_HIGH']
+
+
+    # rounded so the targets are the ones set (1.5 * 1.1 is 1.6500000000000001)
+def margin_targets(fos_targets, margin, checks=swept_checks):
+    return {name: round(target * (1 + margin), 6) if name in checks else target for name, target in fos_targets.items()}
+
+
+def fos_margin(values, fos_targets, checks=swept_checks):
+    return min(values[name] / fos_targets[name] - 1 for name in checks)
+
+
+    # one epsilon-constraint solve in a pool worker (Optimizer.start_worker loads the kernel), targets relative to the
+    # standard fos_targets of the shipped problem
+def solve_margin(margin, solver, checks):
+    standard = Optimizer.worker_problem['fos_targets']
+    problem = dict(Optimizer.worker_problem, fos_targets=margin_targets(standard, margin, checks), fos_mode='constraints')
+    res = Optimizer.solve(problem['x0'], solver, problem)
+    values = Optimizer.report(res.x, problem)
+    row = {'target margin': margin, 'Cost': values['Material_Cost'] + values['Labor_Cost'], 'Material_Cost': values['Material_Cost'],
+           'Labor_Cost': values['Labor_Cost'], 'FOS margin': fos_margin(values, standard, checks),
+           'meets targets': Optimizer.meets_targets(res.x, problem), 'cost evals': res.nfev}
+    row.update({name: values[name] for name in fos_names + ['Freeboard']})
+    row.update(zip(variable_names, res.x))
+    return row
+
+
+    # designs meeting their targets that no other one beats on cost and margin together, cheapest first
+def pareto_front(results):
+    candidates = results[results['meets targets'] & np.isfinite(results['Cost'])].sort_values(['Cost', 'FOS margin'], ascending=[True, False])
+    front, best_margin = [], -np.inf
+    for index, row in candidates.iterrows():
+        if row['FOS margin'] > best_margin:
+            front.append(index)
+            best_margin = row['FOS margin']
+    return front
+
+
+    # one row per margin, 'on frontier' marks the Pareto frontier
+def pareto_sweep(problem, margins=margins, solver=solver, checks=swept_checks, workers=None):
+    shipped = {name: value for name, value in problem.items() if name != 'kernel'}
+    with Optimizer.process_pool(workers or os.cpu_count(), Optimizer.start_worker, (shipped,)) as pool:
+        rows = list(pool.map(solve_margin, margins, [solver] * len(margins), [checks] * len(margins)))
+    results = pd.DataFrame(rows)
+    results['on frontier'] = results.index.isin(pareto_front(results))
+    return results
+
+
+if __name__ == '__main__':
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = runpy.run_path(script, init_globals={'build_only': True})  # compiles the kernel into the cache if it isn't
+    start = time.perf_counter()
+    results = pareto_sweep(run['problem'], margins, solver, swept_checks, workers)
+    results.to_csv(results_path, index=False)
+    print(str(len(results)) + ' margins solved in ' + str(round(time.perf_counter() - start, 1)) + ' s, '
+          + str(int(results['meets targets'].sum())) + ' meet their targets, results in ' + results_path)
+    missed = results.loc[~results['meets targets'], 'target margin']
+    if len(missed) > 0:
+        print('no design meets the targets at margin ' + ', '.join(str(margin) for margin in missed) + ', left off the frontier')
+    front = results[results['on frontier']]
+    if front.empty:
+        print('no margin meets its targets, not even the standard ones')
+    else:
+        print('Pareto frontier (extra cost against the cheapest design)')
+        print(front[['target margin', 'FOS margin', 'Cost', 'Material_Cost', 'Labor_Cost'] + fos_names]
+              .assign(**{'extra cost %': 100 * (front['Cost'] / front['Cost'].iloc[0] - 1)})
+              .to_string(index=False, float_format=lambda value: '{:.4g}'.format(value)))
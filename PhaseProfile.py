@@ -0,0 +1,83 @@
+## Description
+
+    # Wall time, peak memory and symbolic expression size of each section of a BridgeDesigner run, as one JSON record
+    # Off unless BRIDGEDESIGNER_PROFILE=<file.jsonl> is set, then every run appends its record to that file as one line
+    # (a batch of sites gives one line per site)
+    # A section starts with phase(name) and lasts until the next phase() or finish()
+    # Memory is the process peak resident size (the high-water mark the OS keeps, free to read), per phase as the peak at
+    # its end and how far the phase raised it, a phase that stays under an earlier peak shows 0
+    # (tracemalloc would give each phase its own peak but makes the solve about 100 times slower)
+    # The sections inside build_model only show up when the model is built, with a cached kernel they are skipped
+
+## Imports
+import json
+import os
+import sys
+import time
+
+record = None  # the run being profiled, None when profiling is off
+current = None  # the open phase
+
+
+    # MB, None where the resource module doesn't exist (Windows)
+def peak_memory():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == 'darwin' else peak / 1e3  # bytes on macOS, kilobytes on Linux
+
+
+def start(path=None):
+    global record, current
+    path = path or os.environ.get('BRIDGEDESIGNER_PROFILE')
+    current = None
+    if not path:
+        record = None
+        return
+    record = {'path': path, 'started': time.strftime('%Y-%m-%d %H:%M:%S'), 'start': time.perf_counter(), 'phases': []}
+
+
+def close():
+    global current
+    if record is None or current is None:
+        return
+    peak = peak_memory()
+    record['phases'].append({'phase': current['phase'], 'seconds': round(time.perf_counter() - current['start'], 6),
+                             'peak_memory_mb': peak and round(peak, 1),
+                             'peak_memory_growth_mb': peak and round(peak - current['peak_memory'], 1),
+                             'expression_size': current['expression_size']})
+    current = None
+
+
+def phase(name):
+    global current
+    close()
+    if record is None:
+        return
+    current = {'phase': name, 'start': time.perf_counter(), 'peak_memory': peak_memory(), 'expression_size': {}}
+
+
+    # operation count (sym.count_ops) of the named expressions, added to the open phase, the counting isn't timed
+def expression_size(**expressions):
+    if current is None:
+        return
+    import sympy as sym
+    start_count = time.perf_counter()
+    current['expression_size'].update({name: int(sym.count_ops(expression)) for name, expression in expressions.items()})
+    current['start'] += time.perf_counter() - start_count
+
+
+    # closes the last phase and appends the record, fields (site, kernel cached ...) are added to it
+def finish(**fields):
+    global record
+    close()
+    if record is None:
+        return
+    path = record.pop('path')
+    record['seconds'] = round(time.perf_counter() - record.pop('start'), 6)
+    record.update(fields)
+    with open(path, 'a') as stream:
+        stream.write(json.dumps(record, default=str) + '\n')
+    record = None
@@ -0,0 +1,130 @@
+## Description
+
+    # Probability that a design fails its FOS checks once the soil and saddle values aren't the single numbers
+    # BridgeDesigner assumes (phi, d_soil, d_fill, mu_saddle and the approx. soil slopes of Constants rows 10 / 11)
+    # The checks are compiled once more with those values as symbols (BridgeDesigner.build_model(parameters), cached by
+    # KernelCache like the main kernel), then the design is fixed and every check is evaluated for a whole chunk of
+    # sampled parameter sets in one NumPy call
+    # Only running totals are kept (count, mean, spread, failures), so the number of samples isn't limited by memory
+    # A check fails below limit (FOS 1), a sample where a check isn't a number (a soil slope steeper than phi has no
+    # active pressure coefficient) counts as a failure
+    # beta is the reliability index of the failure probability, -Phi^-1(pf), beta_mean_std is (mean - limit) / std
+
+    # How to use? Set reliability_samples in BridgeDesigner (## Present Solution) or run this for the workbook's design
+
+## Imports
+import contextlib
+import io
+import os
+import runpy
+import numpy as np
+import pandas as pd
+import KernelCache
+
+## Inputs
+samples = 200000
+chunk = 50000  # samples evaluated per NumPy call
+seed = 0
+limit = 1.0
+
+    # mean is the value BridgeDesigner uses, spread is the standard deviation in the value's units (degrees, kN/m3),
+    # for a lognormal it is the coefficient of variation, draws below 0 are set to 0
+distributions = {'phi': ('normal', 3), 'd_soil': ('normal', 1.2), 'd_fill': ('normal', 1.3), 'mu_saddle': ('lognormal', 0.25),
+                 'slope_LHS': ('normal', 3), 'slope_RHS': ('normal', 3)}
+parameter_names = list(distributions)
+check_names = ['FOS_CABLE', 'FOS_UPLIFT_LOW', 'FOS_UPLIFT_HIGH', 'FOS_SLIDING_LOW', 'FOS_SLIDING_HIGH']
+
+code_dir = os.path.dirname(os.path.abspath(__file__))
+script = os.path.join(code_dir, 'BridgeDesigner.py')
+code_files = [os.path.join(code_dir, name) for name in ['BridgeDesigner.py', 'Optimizer.py', 'TierTable.py', 'Reliability.py']]
+
+
+    # checks(variables, weights, parameters) -> the check_names values, parameters in the order of parameter_names
+    # run is the namespace of a BridgeDesigner run (runpy result or its globals())
+def checks_kernel(run):
+    key = KernelCache.kernel_key([run['Constants'], run['Lookups'], run['Geometry']], code_files)
+    kernel = KernelCache.load_kernel(key)
+    if kernel is None:
+        import sympy as sym
+        symbols = [sym.Symbol(name, real=True) for name in parameter_names]
+        variables, weights, outputs = run['build_model'](dict(zip(parameter_names, symbols)))
+        kernel = {'checks': sym.lambdify([variables, weights, symbols], [outputs[name] for name in check_names], modules='numpy', cse=True)}
+        KernelCache.save_kernel(key, kernel)
+    return kernel['checks']
+
+
+def sample(rng, means, n):
+    values = {}
+    for name in parameter_names:
+        distribution, spread = distributions[name]
+        if distribution == 'lognormal':
+            sigma = np.sqrt(np.log(1 + spread ** 2))
+            values[name] = means[name] * rng.lognormal(-sigma ** 2 / 2, sigma, n)  # mean stays means[name]
+        else:
+            values[name] = np.maximum(rng.normal(means[name], spread, n), 0)
+    return values
+
+
+    # running count, mean and sum of squared deviations of each check, merged chunk by chunk (Chan et al.)
+    # the chunk is shifted by its first value first, so a check that is the same in every sample has exactly no spread
+def merge(totals, values):
+    shifted = values - values[0]
+    n, mean, squares = len(values), values[0] + shifted.mean(), ((shifted - shifted.mean()) ** 2).sum()
+    total = totals['count'] + n
+    delta = mean - totals['mean']
+    totals['squares'] += squares + delta ** 2 * totals['count'] * n / total
+    totals['mean'] += delta * n / total
+    totals['count'] = total
+
+
+    # one row per check plus 'any' (the design fails if one check does), for the 9 design variables x
+def analyze(run, x, samples=samples, chunk=chunk, seed=seed):
+    from scipy.special import ndtri
+    checks = checks_kernel(run)
+    weights = run['problem']['weights']
+    means = run['soil_parameters']
+    rng = np.random.default_rng(seed)
+    totals = {name: {'count': 0, 'mean': 0.0, 'squares': 0.0, 'failures': 0, 'below target': 0, 'min': np.inf} for name in check_names}
+    any_failures = 0
+    for start in range(0, samples, chunk):
+        n = min(chunk, samples - start)
+        parameters = sample(rng, means, n)
+        values = checks(x, weights, [parameters[name] for name in parameter_names])
+        failed = np.zeros(n, dtype=bool)
+        for name, value in zip(check_names, values):
+            value = np.broadcast_to(np.asarray(value, dtype=float), (n,))  # FOS_CABLE doesn't depend on the soil, one number
+            finite = np.isfinite(value)
+            failing = ~finite | (value < limit)
+            failed |= failing
+            totals[name]['failures'] += int(failing.sum())
+            totals[name]['below target'] += int((~finite | (value < run['fos_targets'][name])).sum())
+            if finite.any():
+                merge(totals[name], value[finite])
+                totals[name]['min'] = min(totals[name]['min'], value[finite].min())
+        any_failures += int(failed.sum())
+
+    rows = []
+    for name in check_names:
+        total = totals[name]
+        std = np.sqrt(total['squares'] / max(total['count'] - 1, 1))
+        rows.append({'check': name, 'deterministic': run['checks'][name] if 'checks' in run else np.nan, 'mean': total['mean'], 'std': std,
+                     'min': total['min'], 'P(FOS < target)': total['below target'] / samples, 'pf': total['failures'] / samples,
+                     'beta': -ndtri(total['failures'] / samples), 'beta_mean_std': (total['mean'] - limit) / std if std > 0 else np.inf})
+    rows.append({'check': 'any', 'pf': any_failures / samples, 'beta': -ndtri(any_failures / samples)})
+    return pd.DataFrame(rows)
+
+
+def print_report(table, samples=samples):
+    print(str(samples) + ' sampled soil and saddle parameter sets, failure below FOS ' + str(limit) + ' (beta inf: no failures sampled)')
+    print(table.to_string(index=False, float_format=lambda value: '{:.4g}'.format(value), na_rep=''))
+
+
+if __name__ == '__main__':
+    import time
+    os.environ['BRIDGEDESIGNER_HEADLESS'] = '1'
+    with contextlib.redirect_stdout(io.StringIO()):
+        run = runpy.run_path(script)
+    start = time.perf_counter()
+    table = analyze(run, run['res'].x)
+    print_report(table)
+    print('took ' + str(round(time.perf_counter() - start, 2)) + ' s')
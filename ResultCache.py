@@ -0,0 +1,122 @@
+## Description
+
+    # SQLite store of solved designs, so rerunning an identical site (reviews, reprints, re-exports) skips the solve
+    # A result is keyed by a hash of the values BridgeDesigner reads from the Constants, Lookup and Geometry sheets, the
+    # solver settings and the source of the code that produces it, any change to one of them is a miss
+    # Values are normalized before hashing (numbers to 12 significant digits, text stripped), so a sheet that was only
+    # re-saved, reformatted or had its notes edited still hits
+    # Each row stores x, the cost, the solver counts and the report (FOS values, quantities, costs)
+    # The file is kept under max_megabytes by dropping the least recently used results
+    # The sites table holds the features of each stored result's site (see WarmStart), which is what makes the store an
+    # index of past designs
+
+## Imports
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import numpy as np
+from scipy.optimize import OptimizeResult
+import KernelCache
+
+max_megabytes = 50
+code_dir = os.path.dirname(os.path.abspath(__file__))
+code_files = [os.path.join(code_dir, name) for name in ['BridgeDesigner.py', 'Optimizer.py', 'SagCalculator.py', 'SymbolicDerivatives.py', 'TierTable.py']]
+
+
+    # next to the kernel cache, looked up on every call so a moved cache_dir moves it too
+def database_path():
+    return os.path.join(KernelCache.cache_dir, 'results.sqlite')
+
+
+def normalized(value):
+    if isinstance(value, dict):
+        return {str(name): normalized(item) for name, item in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return [normalized(item) for item in value]
+    if isinstance(value, (bool, np.bool_)) or value is None:
+        return value if value is None else bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return None if np.isnan(value) else float('%.12g' % value)
+    return str(value).strip()
+
+
+    # the problem entries and solver that change a solve (everything but the kernel itself)
+    # warm_start is BridgeDesigner's setting, a warm started solve can end in another local optimum than one from x0
+def problem_settings(problem, solver, warm_start=None):
+    return {'solver': solver, 'x0': problem['x0'], 'warm_start': warm_start, 'weights': problem['weights'], 'lb': problem['bounds'].lb, 'ub': problem['bounds'].ub,
+            'fos_targets': problem['fos_targets'], 'fos_mode': problem['fos_mode'], 'cost_scale': problem['cost_scale'],
+            'use_exact_hessian': problem['use_exact_hessian'], 'cable_method': problem['sag_site']['cable_method']}
+
+
+    # the columns BridgeDesigner reads: Value of Constants, Value of Lookup and LINEAR (the cable x points) of Geometry
+def result_key(Constants, Lookups, Geometry, settings):
+    values = {'Constants': Constants.iloc[:, 1].tolist(), 'Lookups': Lookups.iloc[:, 0].tolist(),
+              'Geometry': Geometry.iloc[:, 3].tolist(), 'settings': settings}
+    digest = hashlib.sha256(json.dumps(normalized(values), sort_keys=True).encode())
+    for code_file in code_files:
+        with open(code_file, 'rb') as stream:
+            digest.update(stream.read())
+    return digest.hexdigest()
+
+
+def connect():
+    os.makedirs(KernelCache.cache_dir, exist_ok=True)
+    connection = sqlite3.connect(database_path(), timeout=30)  # batch workers write to it at the same time
+    connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, record TEXT, bytes INTEGER, created REAL, used REAL)')
+    connection.execute('CREATE TABLE IF NOT EXISTS sites (key TEXT PRIMARY KEY, features TEXT)')
+    return connection
+
+
+    # the stored record of key, or None
+def lookup(key):
+    with contextlib.closing(connect()) as connection, connection:
+        row = connection.execute('SELECT record FROM results WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        connection.execute('UPDATE results SET used = ? WHERE key = ?', (time.time(), key))
+    return json.loads(row[0])
+
+
+    # features, if given, are the site's WarmStart.site_features
+def store(key, record, features=None, max_bytes=None):
+    text = json.dumps(record, default=float)
+    now = time.time()
+    with contextlib.closing(connect()) as connection, connection:
+        connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)', (key, text, len(text), now, now))
+        if features is not None:
+            connection.execute('INSERT OR REPLACE INTO sites VALUES (?, ?)', (key, json.dumps(features)))
+        evict(connection, max_megabytes * 1e6 if max_bytes is None else max_bytes)
+
+
+    # drops least recently used results until the stored records fit in max_bytes
+def evict(connection, max_bytes):
+    total = connection.execute('SELECT COALESCE(SUM(bytes), 0) FROM results').fetchone()[0]
+    for key, size in connection.execute('SELECT key, bytes FROM results ORDER BY used').fetchall():
+        if total <= max_bytes:
+            break
+        connection.execute('DELETE FROM results WHERE key = ?', (key,))
+        connection.execute('DELETE FROM sites WHERE key = ?', (key,))
+        total -= size
+
+
+def clear():
+    with contextlib.closing(connect()) as connection, connection:
+        connection.execute('DELETE FROM results')
+        connection.execute('DELETE FROM sites')
+
+
+    # record of a solve, report is Optimizer.report of res.x
+def result_record(res, report, feasible):
+    return {'x': np.asarray(res.x, dtype=float).tolist(), 'fun': float(res.fun), 'nfev': int(res.get('nfev', 0)), 'njev': int(res.get('njev', 0)),
+            'nit': int(res.get('nit', 0)), 'status': int(res.get('status', 0)), 'success': bool(res.get('success', True)),
+            'message': str(res.get('message', '')),
+            'report': {name: float(value) for name, value in report.items()}, 'meets FOS targets': bool(feasible)}
+
+
+    # the stored record as the scipy result BridgeDesigner and BatchDesigner read
+def stored_result(record):
+    return OptimizeResult(x=np.array(record['x']), fun=record['fun'], nfev=record['nfev'], njev=record['njev'], nit=record['nit'],
+                          status=record['status'], success=record['success'], message=record['message'])
@@ -0,0 +1,88 @@
+## Description
+
+    # Compares the two ways SagCalculator gets main cable length and average tension: summed over the Geometry sheet
+    # points ('points') and the closed form of the parabola ('closed_form')
+    # Prints how far apart they are (length, tension, sag residuals and the optimal design) and the time of one
+    # evaluation and of one solve with each
+
+    # How to use? Run it, site_inputs = None is the MasterInputs site
+
+## Imports
+import timeit
+import numpy as np
+import LearningEngine
+import Optimizer
+import SagCalculator
+
+## Inputs
+site_inputs = None
+sags = np.linspace(0.5, 10, 20)  # meters, the sags length and tension are compared at
+designs = 200  # Latin hypercube designs the sag residuals are compared at
+repeats = 2000  # evaluations timed per method
+methods = ['points', 'closed_form']
+
+
+def sites(problem):
+    return {method: dict(problem['sag_site'], cable_method=method) for method in methods}
+
+
+    # largest relative difference of cable length and average tension over every sag and load case
+def cable_differences(site_by_method):
+    h = np.repeat(sags[:, None], 4, axis=1)
+    cases = {method: SagCalculator.cable_cases(h, site['loadZ'], site) for method, site in site_by_method.items()}
+    points, closed = cases['points'], cases['closed_form']
+    return {'length': np.max(abs(points[0] / closed[0] - 1)), 'tension': np.max(abs(points[1] / closed[1] - 1)),
+            'length (m)': np.max(abs(points[0] - closed[0]))}
+
+
+    # largest difference of the hoisting, design and live case residuals (mm) over designs inside the bounds
+def residual_differences(problem, site_by_method):
+    variables = Optimizer.starting_points(problem['bounds'], designs).T  # 9 x designs
+    residuals = {method: np.array(SagCalculator.sag_residuals(variables, site)) for method, site in site_by_method.items()}
+    return np.max(abs(residuals['points'] - residuals['closed_form']), axis=1)
+
+
+    # seconds per sag_residuals call on one design and on all designs at once (how the gradient and batches call it)
+def evaluation_times(problem, site_by_method):
+    batch = Optimizer.starting_points(problem['bounds'], designs).T
+    times = {}
+    for method, site in site_by_method.items():
+        times[method] = timeit.timeit(lambda: SagCalculator.sag_residuals(problem['x0'], site), number=repeats) / repeats
+        times[method + ' batch'] = timeit.timeit(lambda: SagCalculator.sag_residuals(batch, site), number=repeats // 100) / (repeats // 100)
+    return times
+
+
+def solves(problem, site_by_method, solver='trust-constr'):
+    results = {}
+    for method, site in site_by_method.items():
+        start = timeit.default_timer()
+        res = Optimizer.solve(problem['x0'], solver, dict(problem, sag_site=site))
+        results[method] = {'time': timeit.default_timer() - start, 'x': res.x, 'cost': float(res.fun), 'nfev': res.nfev,
+                           'feasible': Optimizer.meets_targets(res.x, problem)}
+    return results
+
+
+if __name__ == '__main__':
+    problem = LearningEngine.load_engine(site_inputs)
+    site_by_method = sites(problem)
+
+    cable = cable_differences(site_by_method)
+    print('points against closed_form, sags ' + str(sags[0]) + ' to ' + str(sags[-1]) + ' m, ' + str(len(site_by_method['points']['x_lin'])) + ' points')
+    print('  cable length    max difference ' + str(round(cable['length (m)'] * 1000, 2)) + ' mm (' + '{:.1e}'.format(cable['length']) + ' relative)')
+    print('  average tension max difference ' + '{:.1e}'.format(cable['tension']) + ' relative')
+    hoisting, design, live = residual_differences(problem, site_by_method)
+    print('  sag residuals   max difference ' + str(round(hoisting, 3)) + ' mm hoisting case, ' + str(round(design, 3)) + ' mm design case, '
+          + str(round(live, 3)) + ' mm live case, over ' + str(designs) + ' designs')
+
+    times = evaluation_times(problem, site_by_method)
+    for name, label in [('', 'one design'), (' batch', str(designs) + ' designs')]:
+        print('sag_residuals on ' + label + ': ' + ', '.join(method + ' ' + str(round(times[method + name] * 1e6, 1)) + ' us' for method in methods)
+              + ', closed_form ' + str(round(times['points' + name] / times['closed_form' + name], 1)) + 'x faster')
+
+    results = solves(problem, site_by_method)
+    print('method        wall time (s)  cost evals  final cost  meets FOS targets')
+    for method in methods:
+        result = results[method]
+        print(method.ljust(14) + str(round(result['time'], 2)).ljust(15) + str(result['nfev']).ljust(12) + str(round(result['cost'], 2)).ljust(12)
+              + str(result['feasible']))
+    print('largest difference in the optimal design: ' + str(round(np.max(abs(results['points']['x'] - results['closed_form']['x'])), 3)) + ' m')
@@ -0,0 +1,189 @@
+## Description
+
+    # NumPy version of the "PASTE SAG CALCULATOR" section of BridgeDesigner
+    # All four load cases (construction, hoisting, design, live) are evaluated together as a
+    # (points x load cases) array, so one call costs a handful of array ops instead of walking
+    # a symbolic expression with one branch per cable point
+    # Everything broadcasts over extra trailing axes of the variables and is complex safe, which is
+    # how the live residual gradient below is taken (complex step, many points in one pass)
+    # The hoisting and construction sags are solved here for a given geometry, so the optimizer never carries them
+    # Cable length and average tension come from the Geometry sheet points ('points', as the spreadsheet does) or from the
+    # closed form of the parabola ('closed_form', exact and independent of the point count), see cable_method in sag_site
+
+## Imports
+import numpy as np
+from scipy.optimize import brentq
+
+
+    # Everything the sag calculator needs that does not change during a solve
+def sag_site(Span, DH, LowSide, sag_design_i, W_cable, W_dead, W_live, x_lin, V_Anchor, H_Anchor, offset, tower_height,
+             WalkNumber, HandNumber, E_cable, A_cable, saddle_friction, construction_stretch, cable_method='points'):
+    return {'Span': float(Span), 'DH': float(DH), 'LowSide': LowSide, 'sag_design_i': float(sag_design_i),
+            'loadZ': np.array([W_cable, W_cable, W_dead, W_live + W_dead], dtype=float),
+            'x_lin': np.asarray(x_lin, dtype=float), 'V_Anchor': V_Anchor, 'H_Anchor': H_Anchor, 'offset': offset,
+            'tower_height': tower_height, 'WalkNumber': WalkNumber, 'HandNumber': HandNumber,
+            'TotalCables': WalkNumber + HandNumber, 'E_cable': E_cable, 'A_cable': float(A_cable),
+            'saddle_friction': saddle_friction, 'construction_stretch': float(construction_stretch), 'cable_method': cable_method}
+
+
+    # Average backstay length (m) and angle (radians) of one side, weighted by the hand and walk cable counts
+def backstay(G2S, CL, site):
+    run = CL - site['H_Anchor']
+    rise_walk = G2S - site['V_Anchor'] - site['offset']
+    rise_hand = G2S - site['V_Anchor'] + site['tower_height']
+    length = (site['HandNumber'] * np.sqrt(rise_hand ** 2 + run ** 2) + site['WalkNumber'] * np.sqrt(rise_walk ** 2 + run ** 2)) / site['TotalCables']
+    angle = (site['HandNumber'] * np.arctan(rise_hand / run) + site['WalkNumber'] * np.arctan(rise_walk / run)) / site['TotalCables']
+    return length, angle
+
+
+    # Main cable length and average tension summed over the Geometry sheet points, chords between points and the mean of
+    # the point tensions
+def cable_points(h, Ph, x_init, slope, x_tower, y_tower, site):
+    x = site['x_lin'].reshape((-1,) + (1,) * np.ndim(h)) + x_init  # points x ... x load cases
+    y = slope * (x ** 2)
+    dist_cable = np.sqrt(np.diff(x - x_tower, axis=0) ** 2 + np.diff(y - y_tower, axis=0) ** 2)
+    T = Ph * np.sqrt(1 + 4 * (slope * x) ** 2)  # y / x = slope * x, written this way so x = 0 is not 0 / 0
+    return dist_cable.sum(axis=0), T.mean(axis=0)
+
+
+    # The same over the same stretch of x, exact for y = slope * x**2
+    # arc length is the integral of sqrt(1 + (2 slope x)**2), and the tension along the cable is Ph times that same root,
+    # so the average tension over x is Ph * length / run
+def cable_closed_form(h, Ph, x_init, slope, site):
+    def arc(x):
+        u = 2 * slope * x
+        return (x * np.sqrt(1 + u ** 2) + np.arcsinh(u) / (2 * slope)) / 2
+
+    start = site['x_lin'][0] + x_init
+    end = site['x_lin'][-1] + x_init
+    main_cable_length = arc(end) - arc(start)
+    return main_cable_length, Ph * main_cable_length / (site['x_lin'][-1] - site['x_lin'][0])
+
+
+    # Main cable length, average tension and tower tensions for each sag in h (load cases on the last axis)
+def cable_cases(h, W, site):
+    Span = site['Span']
+    DH = site['DH']
+    if site['LowSide'] == 'Right':
+        DH_left = DH
+    else:
+        DH_left = -DH
+
+    x_init = Span * -1 * (4 * h + DH_left) / (8 * h)
+    slope = h / ((Span / 2) ** 2)
+    Ph = (W * (Span ** 2)) / (8 * h)
+    if site['cable_method'] == 'closed_form':
+        main_cable_length, Pavg = cable_closed_form(h, Ph, x_init, slope, site)
+    else:
+        x_towerVal = (Span / 2) - ((Span / (8 * h)) * (4 * h + DH_left))
+        y_towerVal = ((4 * h + DH) ** 2) / (16 * h)
+        main_cable_length, Pavg = cable_points(h, Ph, x_init, slope, x_towerVal, y_towerVal, site)
+
+    xleft = Span * (4 * h + DH_left) / (8 * h)
+    yleft = ((4 * h + DH_left) ** 2) / (16 * h)
+    xright = Span * (4 * h - DH_left) / (8 * h)
+    yright = ((4 * h - DH_left) ** 2) / (16 * h)
+    left_tower_cable_angle = np.arctan((4 * h + DH_left) / Span)  # radians
+    right_tower_cable_angle = np.arctan((4 * h - DH_left) / Span)
+
+    Pleft = Ph * np.sqrt(1 + (4 * (yleft ** 2) / (xleft ** 2)))
+    Pright = Ph * np.sqrt(1 + (4 * (yright ** 2) / (xright ** 2)))
+    return main_cable_length, Pavg, Pleft, Pright, left_tower_cable_angle, right_tower_cable_angle
+
+
+    # Elongation mismatch (mm) of the hoisting, design and live cases
+    # variables is G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4 (anything after x4 is ignored)
+    # hoisting against construction is the pre-stretch of the main cable (construction_stretch percent of its hoisting
+    # length), the later cases are the elastic stretch of the main cable and the backstays under the added load
+def sag_residuals(variables, site):
+    variables = np.asarray(variables)
+    G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4 = variables[:7]
+    valZ = np.stack([x1, x2, np.ones_like(x4) * site['Span'] * (site['sag_design_i'] / 100), x4], axis=-1)
+    main_cable_length, Pavg, Pleft, Pright, left_tower_cable_angle, right_tower_cable_angle = cable_cases(valZ, site['loadZ'], site)
+
+    left_avg_backstay_length, left_backstay_avg_angle = backstay(G2S_L, CL_L, site)
+    right_avg_backstay_length, right_backstay_avg_angle = backstay(G2S_R, CL_R, site)
+    left_avg_backstay_tension = Pleft * np.exp(-1 * site['saddle_friction'] * (0.04 + left_tower_cable_angle + left_backstay_avg_angle[..., None]))
+    right_avg_backstay_tension = Pright * np.exp(-1 * site['saddle_friction'] * (0.04 + right_tower_cable_angle + right_backstay_avg_angle[..., None]))
+
+    deltaL = np.diff(main_cable_length, axis=-1) * 1000  # mm, deltaL[k] here is case k+1 in the original loop
+    stiffness = site['E_cable'] * site['A_cable']
+    force_elongation = (1000 * 1000 * (left_avg_backstay_length[..., None] * np.diff(left_avg_backstay_tension, axis=-1)
+                                       + right_avg_backstay_length[..., None] * np.diff(right_avg_backstay_tension, axis=-1)
+                                       + main_cable_length[..., 1:] * np.diff(Pavg, axis=-1))) / stiffness
+    force_elongation[..., 0] = main_cable_length[..., 1] * (site['construction_stretch'] / 100) * 1000
+    residual = deltaL - force_elongation
+    return residual[..., 0], residual[..., 1], residual[..., 2]
+
+
+## Inner sag solve
+    # The design case residual only moves with the hoisting sag x2 (and the backstays), falling from positive to negative
+    # as x2 grows, and the hoisting case residual falls the same way with the construction sag x1 once x2 is known, so
+    # each is bracketed and found with brentq, a few dozen cheap residual calls
+    # The bracket starts at a factor of two around a guess and doubles until the residual changes sign, inside sag_limits
+sag_limits = (0.001, 0.5)  # fractions of the span
+
+
+def design_sag(site):
+    return site['Span'] * (site['sag_design_i'] / 100)
+
+
+def sag_root(residual, guess, site, name):
+    lowest, highest = sag_limits[0] * site['Span'], sag_limits[1] * site['Span']
+    low, high = max(guess / 2, lowest), min(guess * 2, highest)
+    residual_low, residual_high = residual(low), residual(high)
+    while np.sign(residual_low) == np.sign(residual_high) and (low > lowest or high < highest):
+        low, high = max(low / 2, lowest), min(high * 2, highest)
+        residual_low, residual_high = residual(low), residual(high)
+    if np.sign(residual_low) == np.sign(residual_high):
+        raise ValueError('no ' + name + ' sag balances the cable between ' + str(round(lowest, 3)) + ' and ' + str(round(highest, 3))
+                         + ' m (residual ' + str(round(residual_low, 1)) + ' to ' + str(round(residual_high, 1)) + ' mm)')
+    return brentq(residual, low, high, xtol=1e-9)
+
+
+def hoisting_sag(variables, site):
+    variables = np.array(variables[:7], dtype=float)
+
+    def residual(x2):
+        variables[5] = x2
+        return sag_residuals(variables, site)[1]
+
+    return sag_root(residual, design_sag(site), site, 'hoisting')
+
+
+    # x1 with the hoisting sag x2 in variables
+def construction_sag(variables, site):
+    variables = np.array(variables[:7], dtype=float)
+
+    def residual(x1):
+        variables[4] = x1
+        return sag_residuals(variables, site)[0]
+
+    return sag_root(residual, variables[5], site, 'construction')
+
+
+    # construction and hoisting sags (x1, x2) of a design, the rest of variables as in sag_residuals
+    # raises ValueError when either has no balance inside sag_limits
+def construction_sags(variables, site):
+    variables = np.array(variables[:7], dtype=float)
+    variables[4] = variables[5] = design_sag(site)  # any valid sag until each is solved, 0 divides by zero
+    variables[5] = hoisting_sag(variables, site)
+    return construction_sag(variables, site), variables[5]
+
+
+## Live case
+    # the live load sag x4 stays a design variable, its elongation balance is an equality constraint of the solve
+def live_residual(variables, site):
+    return sag_residuals(np.asarray(variables, dtype=float), site)[2]
+
+
+    # complex step, exact to machine precision, all 7 directions in one pass
+complex_step = 1e-30
+
+
+def live_residual_gradient(variables, site):
+    variables = np.asarray(variables, dtype=float)
+    perturbed = variables[:7, None] + 1j * complex_step * np.eye(7)  # column k moves variable k
+    gradient = np.zeros(len(variables))
+    gradient[:7] = sag_residuals(perturbed, site)[2].imag / complex_step
+    return gradient
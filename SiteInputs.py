@@ -0,0 +1,65 @@
+## Description
+
+    # Builds the Constants, Lookup and Geometry sheets of MasterInputs for a site without Excel
+    # The Lookup and Geometry sheets are formulas on Constants and Tables, pandas only sees the values Excel last
+    # calculated, so a site that isn't the one saved in the workbook needs them worked out here
+    # Frames come back in the same layout as pd.read_excel gives, so BridgeDesigner's iloc indexing is unchanged
+
+## Imports
+import numpy as np
+import pandas as pd
+
+increment = 0.7  # meter, Geometry!C2
+
+
+    # VLOOKUP(value, range, column, FALSE) on the Tables sheet read with header=None
+def vlookup(Tables, value, rows, key_column, value_column):
+    table = Tables.iloc[rows[0] - 1:rows[1], :]
+    matches = table[table.iloc[:, key_column] == value]
+    if matches.empty:
+        raise ValueError(str(value) + ' is not in Tables rows ' + str(rows[0]) + ' to ' + str(rows[1]))
+    return matches.iloc[0, value_column]
+
+
+    # Constants sheet with the Value of each named row replaced by the fields of one site (a dict or pandas row)
+    # fields that are missing or blank keep the workbook value
+def site_constants(Constants, fields):
+    Constants = Constants.copy()
+    Constants['Value'] = Constants['Value'].astype(object)
+    for i, name in enumerate(Constants['Name']):
+        if name in fields and not pd.isna(fields[name]):
+            Constants.iloc[i, 1] = fields[name]
+    return Constants
+
+
+def lookups(Constants, Tables):
+    CableSize = Constants.iloc[0, 1]
+    walkway_detail = Constants.iloc[4, 1]
+    crossbeam_detail = Constants.iloc[5, 1]
+    values = [vlookup(Tables, CableSize, (2, 23), 0, 3),
+              vlookup(Tables, crossbeam_detail, (48, 57), 4, 6),
+              vlookup(Tables, walkway_detail, (34, 47), 4, 6),
+              vlookup(Tables, walkway_detail, (34, 47), 4, 5),
+              vlookup(Tables, CableSize, (3, 23), 0, 6) / 1000,
+              vlookup(Tables, CableSize, (2, 23), 0, 8),
+              vlookup(Tables, Constants.iloc[8, 1], (59, 64), 4, 5),
+              vlookup(Tables, Constants.iloc[9, 1], (59, 64), 4, 5)]
+    units = ['mm2', 'kN/m', 'kN/m', 'kN/m', 'kN/m', 'kN', 'm', 'm']
+    notes = ['Cable Area', 'crossbeam weight', 'fencing weight', 'decking weight', 'cable weight', 'cable tension (ultimate)',
+             'front_extra_left', 'front_extra_right']
+    return pd.DataFrame({'Value': np.array(values, dtype=float), 'Unit': units, 'Notes': notes})
+
+
+    # only the LINEAR column (cable x points) is used, 0 then every meter from 0.7 on, then the span
+def geometry(Constants, Lookups):
+    Span = int(np.floor(abs(Constants.iloc[13, 1] - Constants.iloc[14, 1]) + Lookups.iloc[6, 0] + Lookups.iloc[7, 0]))
+    x_lin = np.concatenate([[0], np.arange(Span) + increment, [Span]])
+    return pd.DataFrame({'Span': [Span] + [np.nan] * len(x_lin), 'Increment': [increment] + [np.nan] * len(x_lin),
+                         'Unused': np.nan, 'LINEAR': ['X'] + list(x_lin)})
+
+
+    # everything BridgeDesigner reads from the workbook, for one site
+def site_inputs(Constants, Tables, fields):
+    Constants = site_constants(Constants, fields)
+    Lookups = lookups(Constants, Tables)
+    return Constants, Lookups, geometry(Constants, Lookups)
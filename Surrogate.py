@@ -0,0 +1,187 @@
+## Description
+
+    # Instant estimate of the optimal abutment geometry and cost of a site without running the optimizer (field triage)
+    # Trained on the designs in the result cache (every BridgeDesigner or BatchDesigner solve that met the FOS targets
+    # and can be built lands there with its site features, see ResultCache and WarmStart), NumPy only
+    # The model is ridge regression on the site features and their pairwise products, the ridge weight is picked by
+    # leave-one-out error (closed form, no refits), which is also the error reported against the full solve
+    # Designs are learned low side on the left, a site with the low side on the right gets its left and right swapped back
+    # predict() is a few small array ops, well under a millisecond, predicted_start() turns a prediction into a starting point
+
+    # How to use? Run it to solve a bank of sampled sites (bank_sites, skipped with bank_sites = 0), fit and save the
+    # model to model_path and print its errors, then Surrogate.predict(Surrogate.load_model(), features)
+
+## Imports
+import json
+import os
+import time
+import numpy as np
+import pandas as pd
+import SiteInputs
+import TierTable
+import WarmStart
+
+## Inputs
+path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
+model_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'SurrogateModel.json')
+bank_sites = 60  # sampled sites solved before fitting, their designs go to the result cache
+bank_seed = 0
+holdout = 0.2  # share of the bank kept out of the fit to report the error on
+workers = os.cpu_count()
+
+target_names = ['G2S_low', 'G2S_high', 'CL_low', 'CL_high', 'x4', 'h_back_low', 'h_back_high', 'Cost']
+ridges = 10.0 ** np.arange(-4, 5)
+
+
+    # design variables (9, left / right) -> targets (low / high side, plus the cost)
+    # the cost is learned as its log, costs run over a factor of ten and it is the relative error that matters
+def design_targets(features, x, cost):
+    x = np.asarray(x, dtype=float)
+    if features['LowSide'] != 'Left':
+        x = WarmStart.mirrored(x)
+    return [x[0], x[1], x[2], x[3], x[6], x[7], x[8], np.log(cost)]
+
+
+    # the WarmStart features and Bolivia or not (the only country difference BridgeDesigner makes)
+def inputs(features):
+    return np.array([features[name] for name in WarmStart.feature_names] + [float(features['Country'] == 'Bolivia')])
+
+
+    # 1, the standardized inputs and every product of two of them (squares included), one row per site
+def terms(z):
+    z = np.atleast_2d(z)
+    upper = np.triu_indices(z.shape[1])
+    return np.hstack([np.ones((len(z), 1)), z, (z[:, :, None] * z[:, None, :])[:, upper[0], upper[1]]])
+
+
+    # features and targets of every stored design that met the FOS targets and can be built
+def bank():
+    records = WarmStart.solved_records()
+    return [features for features, _ in records], np.array([design_targets(features, record['x'], record['fun']) for features, record in records])
+
+
+    # model dict (JSON ready), features as from bank(), targets one row each as from design_targets
+def fit(features, targets):
+    if len(features) < 2:
+        raise ValueError(str(len(features)) + ' designs to fit on, solve a bank first (bank_sites, with use_result_cache on in BridgeDesigner)')
+    X = np.array([inputs(site) for site in features])
+    mean, scale = X.mean(axis=0), X.std(axis=0)
+    scale[scale == 0] = 1  # a feature that never changes in the bank (e.g. one cable count) drops out
+    A = terms((X - mean) / scale)
+    target_mean, target_scale = targets.mean(axis=0), targets.std(axis=0)
+    target_scale[target_scale == 0] = 1
+    Y = (targets - target_mean) / target_scale
+
+    # the leave-one-out residual of ridge is residual / (1 - leverage), so every ridge weight costs one solve
+    best = None
+    for ridge in ridges:
+        penalty = ridge * np.eye(A.shape[1])
+        penalty[0, 0] = 0  # the intercept isn't shrunk
+        inverse = np.linalg.solve(A.T @ A + penalty, A.T)
+        coefficients = inverse @ Y
+        leverage = np.einsum('ij,ji->i', A, inverse)
+        loo = (Y - A @ coefficients) / (1 - leverage)[:, None]
+        if best is None or np.mean(loo ** 2) < best[0]:
+            best = (np.mean(loo ** 2), ridge, coefficients, loo)
+    _, ridge, coefficients, loo = best
+    loo = loo * target_scale
+    return {'input_mean': mean.tolist(), 'input_scale': scale.tolist(), 'coefficients': coefficients.tolist(),
+            'target_mean': target_mean.tolist(), 'target_scale': target_scale.tolist(), 'ridge': float(ridge), 'samples': len(features),
+            'loo_rms': dict(zip(target_names, np.sqrt(np.mean(loo ** 2, axis=0)).tolist()))}  # the Cost one as log, about the relative error
+
+
+def save_model(model, path=model_path):
+    with open(path, 'w') as stream:
+        json.dump(model, stream)
+
+
+    # arrays back as arrays, so predict doesn't convert them on every call
+def load_model(path=model_path):
+    with open(path) as stream:
+        model = json.load(stream)
+    for name in ['input_mean', 'input_scale', 'coefficients', 'target_mean', 'target_scale']:
+        model[name] = np.array(model[name])
+    return model
+
+
+    # G2S_L, G2S_R, CL_L, CL_R, x4, h_back_low, h_back_high (m) and Cost of a site, features as from WarmStart.site_features
+def predict(model, features):
+    z = (inputs(features) - np.asarray(model['input_mean'])) / np.asarray(model['input_scale'])
+    values = (terms(z) @ np.asarray(model['coefficients']))[0] * np.asarray(model['target_scale']) + np.asarray(model['target_mean'])
+    low, high = ('L', 'R') if features['LowSide'] == 'Left' else ('R', 'L')
+    return {'G2S_' + low: values[0], 'G2S_' + high: values[1], 'CL_' + low: values[2], 'CL_' + high: values[3],
+            'x4': values[4], 'h_back_low': values[5], 'h_back_high': values[6], 'Cost': np.exp(values[7])}
+
+
+    # a prediction as the 9 design variables for Optimizer.solve (x1 and x2 are worked out from the others, 0 here)
+def design_variables(design):
+    return np.array([design['G2S_L'], design['G2S_R'], design['CL_L'], design['CL_R'], 0, 0, design['x4'], design['h_back_low'], design['h_back_high']])
+
+
+    # {'x0', 'Cost'} predicted for a site, x0 clipped into bounds, like WarmStart.nearest_start
+def predicted_start(model, features, bounds):
+    design = predict(model, features)
+    return {'x0': np.clip(design_variables(design), bounds.lb, bounds.ub), 'Cost': design['Cost']}
+
+
+    # prediction error against the full solve, one row per target (meters, the cost in its currency and in %)
+def error_report(model, features, targets):
+    designs = [predict(model, site) for site in features]
+    predicted = np.array([design_targets(site, design_variables(design), design['Cost']) for site, design in zip(features, designs)])
+    predicted[:, -1], targets = np.exp(predicted[:, -1]), np.column_stack([targets[:, :-1], np.exp(targets[:, -1])])
+    errors = np.column_stack([predicted - targets, 100 * (predicted[:, -1] / targets[:, -1] - 1)])
+    means = np.append(targets.mean(axis=0), 100)
+    return pd.DataFrame({'target': target_names + ['Cost %'], 'rms error': np.sqrt(np.mean(errors ** 2, axis=0)),
+                         'max error': np.abs(errors).max(axis=0), 'mean of full solve': means})
+
+
+    # Sites table for BatchDesigner: Latin hypercube over span, DH, soil slopes and low side foundation height above
+    # HWL, tiers, low side, country and walkway cable count drawn at random, x_fnd_RHS set for the span as in BenchmarkSuite
+def sample_sites(Constants, Tables, n, seed=0):
+    from scipy.stats import qmc
+    rng = np.random.default_rng(seed)
+    unit = qmc.LatinHypercube(d=5, seed=seed).random(n)
+    span, dh, slope_LHS, slope_RHS, clearance = qmc.scale(unit, [20, 0, 0, 0, 0.5], [120, 4, 20, 20, 4]).T
+    sites = []
+    for k in range(n):
+        fields = {'Site': 'sample ' + str(k), 'Low Side?': rng.choice(['Left', 'Right']), 'Country': rng.choice(['Bolivia', 'Eswatini']),
+                  'guess LHS tiers': float(rng.choice(TierTable.tier_heights)), 'guess RHS tiers': float(rng.choice(TierTable.tier_heights)),
+                  '# of walkway cables': int(rng.choice([2, 4])), 'approx. soil slope LHS': slope_LHS[k], 'approx. soil slope RHS': slope_RHS[k],
+                  'HWL_elevation': 100.0, 'x_fnd_LHS': 20.0}
+        low, high = ('y_fnd_LHS', 'y_fnd_RHS') if fields['Low Side?'] == 'Left' else ('y_fnd_RHS', 'y_fnd_LHS')
+        fields[low] = 100 + clearance[k]
+        fields[high] = fields[low] + dh[k]
+        Lookups = SiteInputs.lookups(SiteInputs.site_constants(Constants, fields), Tables)
+        fields['x_fnd_RHS'] = fields['x_fnd_LHS'] + span[k] - Lookups.iloc[6, 0] - Lookups.iloc[7, 0] + 0.01
+        sites.append(fields)
+    return pd.DataFrame(sites)
+
+
+if __name__ == '__main__':
+    import BatchDesigner
+    import WorkbookLoader
+    start_time = time.perf_counter()
+    if bank_sites > 0:
+        workbook = WorkbookLoader.load_inputs(path)
+        results = BatchDesigner.design_sites(sample_sites(workbook['Constants'], workbook['Tables'], bank_sites, bank_seed),
+                                             workbook['Constants'], workbook['Tables'], workers)
+        print(str(len(results)) + ' bank sites solved in ' + str(round(time.perf_counter() - start_time, 1)) + ' s, '
+              + str(int(results['meets FOS targets'].fillna(False).astype(bool).sum())) + ' meet the FOS targets')
+
+    features, targets = bank()
+    order = np.random.default_rng(bank_seed).permutation(len(features))
+    test = order[:int(holdout * len(features))]
+    train = order[int(holdout * len(features)):]
+    model = fit([features[i] for i in train], targets[train])
+    print('held out ' + str(len(test)) + ' of ' + str(len(features)) + ' designs, error against the full solve')
+    print(error_report(model, [features[i] for i in test], targets[test]).to_string(index=False, float_format=lambda value: '{:.3g}'.format(value)))
+
+    model = fit(features, targets)
+    save_model(model)
+    model = load_model()
+    calls = 1000
+    timer = time.perf_counter()
+    for _ in range(calls):
+        predict(model, features[0])
+    print('fitted on all ' + str(model['samples']) + ' designs (ridge ' + str(model['ridge']) + '), saved to ' + model_path
+          + ', predict takes ' + str(round((time.perf_counter() - timer) / calls * 1e6, 1)) + ' us')
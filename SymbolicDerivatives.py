@@ -0,0 +1,61 @@
+## Description
+
+    # Exact gradient and Hessian of a large SymPy expression (the Cost of BridgeDesigner and Initialize), and the Jacobian
+    # of several (the FOS checks)
+    # sym.diff on the whole Cost tree takes minutes for the Hessian, so the expression is first broken into its
+    # common subexpressions (sym.cse) and each small assignment is differentiated once with the chain rule
+    # Results are (assignments, outputs) pairs, lambdify_chain turns one into a numeric function
+
+## Imports
+import sympy as sym
+
+
+    # Forward mode chain rule over a list of (symbol, expression) assignments
+    # Returns the assignments with the derivative assignments appended, and d(output)/d(variable) for each output
+def chain_derivatives(assignments, outputs, variables, prefix):
+    names = sym.numbered_symbols(prefix, real=True)
+    derivatives = {}  # assignment symbol -> its derivative with respect to each variable
+    new_assignments = list(assignments)
+
+    def derivative(expression, k):
+        total = sym.diff(expression, variables[k])
+        for symbol in expression.free_symbols:
+            if symbol in derivatives and derivatives[symbol][k] != 0:
+                total += sym.diff(expression, symbol) * derivatives[symbol][k]
+        return total.replace(sym.DiracDelta, lambda *args: sym.S.Zero)  # derivative of sign() from the abs() penalties
+
+    for symbol, expression in assignments:
+        row = []
+        for k in range(len(variables)):
+            value = derivative(expression, k)
+            if value.is_Symbol or value.is_Number:
+                row.append(value)
+            else:
+                name = next(names)
+                new_assignments.append((name, value))
+                row.append(name)
+        derivatives[symbol] = row
+
+    return new_assignments, [[derivative(output, k) for k in range(len(variables))] for output in outputs]
+
+
+def gradient_and_hessian(expression, variables):
+    assignments, reduced = sym.cse(expression, symbols=sym.numbered_symbols('cse_', real=True))
+    assignments, gradient = chain_derivatives(assignments, reduced, variables, 'grad_')
+    # the gradient outputs are still big sums, break them up again before taking the second derivatives
+    gradient_assignments, gradient = sym.cse(gradient[0], symbols=sym.numbered_symbols('gradcse_', real=True))
+    assignments = assignments + gradient_assignments
+    hessian_assignments, hessian = chain_derivatives(assignments, gradient, variables, 'hess_')
+    return (assignments, gradient), (hessian_assignments, hessian)
+
+
+    # d(expression)/d(variable) for a list of expressions that share subtrees (the FOS checks), one row per expression
+def jacobian(expressions, variables):
+    assignments, reduced = sym.cse(list(expressions), symbols=sym.numbered_symbols('jaccse_', real=True))
+    return chain_derivatives(assignments, reduced, variables, 'jac_')
+
+
+    # arguments is the lambdify argument list, e.g. [variables] or [variables, parameters]
+    # Outputs are nested lists, callers wrap the result in np.asarray
+def lambdify_chain(arguments, assignments, outputs):
+    return sym.lambdify([tuple(argument) for argument in arguments], outputs, modules='numpy', cse=lambda expressions: (assignments, expressions))
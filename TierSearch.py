@@ -0,0 +1,54 @@
+## Description
+
+    # Tries every pair of tier heights for one site instead of guessing 'guess LHS tiers' / 'guess RHS tiers'
+    # Each pair is its own BridgeDesigner model (the tiers are built into it), pairs are designed concurrently as a batch
+    # of the same site (see BatchDesigner) and the cheapest pair meeting the FOS targets is reported
+    # Every variant's model is compiled once, after that it is in the kernel cache
+
+    # How to use? Set site to a Site of Sites.csv (None is the MasterInputs site) and run, all pairs go to results_path
+
+## Imports
+import os
+import time
+import pandas as pd
+import BatchDesigner
+import TierTable
+import WorkbookLoader
+
+## Inputs
+path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
+sites_path = BatchDesigner.sites_path
+site = None
+results_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'TierSearchResults.csv')
+workers = os.cpu_count()
+
+
+    # one row per (LHS, RHS) tier pair, cheapest first, pairs meeting the FOS targets before the ones that don't
+def tier_search(fields, Constants, Tables, heights=TierTable.tier_heights, workers=None):
+    pairs = [(left, right) for left in heights for right in heights]
+    variants = pd.DataFrame([dict(fields, **{'guess LHS tiers': float(left), 'guess RHS tiers': float(right)}) for left, right in pairs])
+    variants['Site'] = [str(fields.get('Site', 'MasterInputs')) + ' ' + str(left) + '/' + str(right) for left, right in pairs]
+    results = BatchDesigner.design_sites(variants, Constants, Tables, workers)
+    results.insert(1, 'LHS tiers', [float(left) for left, _ in pairs])
+    results.insert(2, 'RHS tiers', [float(right) for _, right in pairs])
+    if 'meets FOS targets' not in results:
+        results['meets FOS targets'] = False
+    results['meets FOS targets'] = results['meets FOS targets'].fillna(False).astype(bool)
+    return results.sort_values(['meets FOS targets', 'Cost'], ascending=[False, True], ignore_index=True)
+
+
+if __name__ == '__main__':
+    inputs = WorkbookLoader.load_inputs(path)
+    fields = {}
+    if site is not None:
+        sites = BatchDesigner.read_table(sites_path)
+        fields = sites[sites['Site'].astype(str) == str(site)].iloc[0].to_dict()
+    start = time.perf_counter()
+    results = tier_search(fields, inputs['Constants'], inputs['Tables'], workers=workers)
+    results.to_csv(results_path, index=False)
+    print(str(len(results)) + ' tier pairs designed in ' + str(round(time.perf_counter() - start, 1)) + ' s, results in ' + results_path)
+    best = results.iloc[0]
+    if best['meets FOS targets']:
+        print('cheapest feasible: LHS tiers ' + str(best['LHS tiers']) + ' m, RHS tiers ' + str(best['RHS tiers']) + ' m, cost ' + str(round(best['Cost'], 2)))
+    else:
+        print('no tier pair meets the FOS targets, cheapest: LHS tiers ' + str(best['LHS tiers']) + ' m, RHS tiers ' + str(best['RHS tiers']) + ' m')
@@ -0,0 +1,56 @@
+## Description
+
+    # Properties of the tier stack under a tower, one entry per tier class, so both abutments (or a whole batch of them)
+    # are looked up with one index instead of a chain of ifs per property per side
+    # Tier classes by total tier height (m): 0 half tier (< 1), 1 one tier, 2 two tiers, 3 three tiers,
+    # 4 three tiers on a 1.5 m foundation (> 3)
+
+## Imports
+import numpy as np
+
+    # nominal total tier height (m) of each class, the heights a site can be designed with
+tier_heights = np.array([0.5, 1, 2, 3, 3.5])
+
+    # tier volumes (m3) by class: fill and masonry of the whole stack, and the excavation of its bottom tier
+fill_volume = np.array([4.42 + 1.26, 4.42 + 2.52, 4.42 + 2.52 + 6.58, 4.42 + 2.52 + 6.58 + 9, 4.42 + 2.52 + 6.58 + 13.5])
+masonry_volume = np.array([7.36 + 2.475, 7.36 + 4.95, 7.36 + 4.95 + 10.03, 7.36 + 4.95 + 10.03 + 12.96, 7.36 + 4.95 + 10.03 + 19.44])
+excavation_volume = np.array([4.42 + 7.36, 4.42 + 7.36, 6.58 + 10.03, 9 + 12.96, 13.5 + 19.44])
+
+
+def tier_classes(tiers):
+    tiers = np.asarray(tiers, dtype=float)
+    classes = np.select([tiers < 1, tiers == 1, tiers == 2, tiers == 3, tiers > 3], [0, 1, 2, 3, 4], -1)
+    if np.any(classes < 0):
+        raise ValueError('tier heights have to be < 1, 1, 2, 3 or > 3 m, got ' + str(tiers[classes < 0]))
+    return classes
+
+
+    # dict of property -> array over the tier classes
+    # tiers_loss (area the tiers take out of the ramp, m2) is linear in the tier height within a class,
+    # so it is kept as loss_base + loss_per_tier * tiers
+def tier_table(tier_offset, walkway_height):
+    H_tiers = np.array([0.9, 0.9, 1.15, 1.4, 1.4])  # tier width off the centerline (m)
+    o = tier_offset
+    return {
+        'H_tiers': H_tiers,
+        'front_extra': np.array([2.3, 2.3, 2.95, 3.6, 3.6]) - H_tiers,  # tier length past the centerline toward the river
+        'y_hand': np.array([3, 3.5, 4.5, 5.5, 6]),  # distance to the handrail saddle
+        'fnd_height': np.array([1, 1, 1, 1, 1.5]),
+        'loss_base': np.array([0.9 + (0.9 - 2 * o) * walkway_height,
+                               0.9 + (0.9 - 2 * o) * walkway_height,
+                               3 * 1.15 + o + (1.15 - o) * walkway_height,
+                               4 * 1.4 + 3 * o + (1.4 - o) * walkway_height,
+                               1.5 * 1.4 + 3 * 1.4 + 3 * o + (1.4 - o) * walkway_height]),
+        'loss_per_tier': np.array([0.9 - o, 0.9 - o, -(2 + walkway_height) * o, -(3 + walkway_height) * o, -(3 + walkway_height) * o]),
+        'fill_volume': fill_volume,
+        'masonry_volume': masonry_volume,
+        'excavation_volume': excavation_volume,
+    }
+
+
+    # every property of the table at the given tier heights (any shape, e.g. [tiers_low, tiers_high] or a batch of sites)
+def tier_properties(table, tiers):
+    classes = tier_classes(tiers)
+    properties = {name: values[classes] for name, values in table.items()}
+    properties['tiers_loss'] = properties['loss_base'] + properties['loss_per_tier'] * np.asarray(tiers, dtype=float)
+    return properties
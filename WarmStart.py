@@ -0,0 +1,74 @@
+## Description
+
+    # Starting point for a solve taken from the most similar site solved before, instead of the fixed x0
+    # Sites are compared on span, DH, tiers, soil slopes, foundation height above HWL and cable counts, each scaled by
+    # how much of it makes a real difference to the design (feature_scales), and on country (material prices differ, a
+    # neighbour from another country counts as country_distance further away), the index is the ResultCache store
+    # Features are by low and high side, a neighbour built the other way round (LowSide) has its left and right
+    # variables swapped before they are used
+    # Only neighbours that met the FOS targets and can be built (Optimizer.buildable) are used
+
+## Imports
+import contextlib
+import json
+import numpy as np
+import Optimizer
+import ResultCache
+
+    # distance of 1 in every feature counts the same
+feature_scales = {'Span': 10, 'DH': 1, 'tiers_low': 1, 'tiers_high': 1, 'slope_low': 5, 'slope_high': 5,
+                  'fnd_above_HWL': 1, 'WalkNumber': 1, 'HandNumber': 1}
+feature_names = list(feature_scales)
+country_distance = 1
+
+
+    # slopes are the approx. soil slope LHS / RHS (degrees), the low side foundation is the one the freeboard is against
+def site_features(Span, DH, LowSide, Country, tiers_low, tiers_high, slope_LHS, slope_RHS, y_fnd_L, y_fnd_R, HWL, WalkNumber, HandNumber):
+    if LowSide == 'Left':
+        slope_low, slope_high, y_fnd_low = slope_LHS, slope_RHS, y_fnd_L
+    else:
+        slope_low, slope_high, y_fnd_low = slope_RHS, slope_LHS, y_fnd_R
+    values = [Span, DH, tiers_low, tiers_high, slope_low, slope_high, y_fnd_low - HWL, WalkNumber, HandNumber]
+    features = {name: float(value) for name, value in zip(feature_names, values)}
+    features['LowSide'] = LowSide
+    features['Country'] = str(Country)
+    return features
+
+
+    # G2S_L, G2S_R, CL_L, CL_R swapped, sags and backwall heights (low / high) stay
+def mirrored(x):
+    return np.asarray(x, dtype=float)[[1, 0, 3, 2, 4, 5, 6, 7, 8]]
+
+
+    # every stored site that met the FOS targets and can be built, as (features, record)
+def solved_records():
+    with contextlib.closing(ResultCache.connect()) as connection:
+        rows = connection.execute('SELECT sites.features, results.record FROM sites JOIN results ON sites.key = results.key').fetchall()
+    records = []
+    for features, record in rows:
+        record = json.loads(record)
+        if record['meets FOS targets'] and np.all(np.isfinite(record['x'])) and Optimizer.buildable(record['report']):
+            records.append((json.loads(features), record))
+    return records
+
+
+    # every stored site that met the FOS targets and can be built, as (features, x)
+def solved_sites():
+    return [(features, record['x']) for features, record in solved_records()]
+
+
+    # {'x0', 'distance', 'features'} of the nearest solved site with its design clipped into bounds, None if there is none
+def nearest_start(features, bounds, sites=None):
+    sites = solved_sites() if sites is None else sites
+    if not sites:
+        return None
+    scales = np.array([feature_scales[name] for name in feature_names], dtype=float)
+    target = np.array([features[name] for name in feature_names]) / scales
+    table = np.array([[site[name] for name in feature_names] for site, _ in sites]) / scales
+    other_country = np.array([site['Country'] != features['Country'] for site, _ in sites])
+    distances = np.sqrt(((table - target) ** 2).sum(axis=1) + other_country * country_distance ** 2)
+    nearest = int(np.argmin(distances))
+    neighbour, x = sites[nearest]
+    if neighbour['LowSide'] != features['LowSide']:
+        x = mirrored(x)
+    return {'x0': np.clip(x, bounds.lb, bounds.ub), 'distance': float(distances[nearest]), 'features': neighbour}
@@ -0,0 +1,117 @@
+## Description
+
+    # Calibrates the six cost weights of the learning engine against bridges that were actually built
+    # The as-built table (.csv or .xlsx) has one row per bridge: 'Site', any of the Constants names (like Sites.csv) and
+    # the as-built dimensions that are known, in meters, named like the design variables
+    # (G2S_L, G2S_R, CL_L, CL_R, x1, x2, x4, h_back_low, h_back_high), blank ones are not scored
+    # Each weight set is solved for every bridge and scored by the RMS difference (m) between the optimized and the built
+    # dimensions, sets whose designs meet the FOS targets on more bridges rank first, then the lower score, weight sets
+    # are spread across a process pool
+
+    # How to use? Fill AsBuilt.csv, set samples and the weight range, run, the best weights are printed and every
+    # weight set with its score goes to results_path
+
+## Imports
+import os
+import time
+import numpy as np
+import pandas as pd
+import BatchDesigner
+import KernelCache
+import LearningEngine
+import Optimizer
+import SiteInputs
+import WorkbookLoader
+
+## Inputs
+path = '/Users/brentonkreiger/PycharmProjects/BridgeDesigner/venv/MasterInputs.xlsx'
+as_built_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'AsBuilt.csv')
+results_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'CalibrationResults.csv')
+samples = 64  # weight sets besides all ones
+weight_range = (0.25, 4)  # each weight is sampled log-uniformly in this range
+seed = 0
+workers = os.cpu_count()
+
+variable_names = BatchDesigner.variable_names
+weight_names = LearningEngine.weight_names
+
+
+    # Latin hypercube in log space, all ones first so the current weights are always scored
+def weight_samples(n, weight_range, seed=0):
+    from scipy.stats import qmc
+    sampler = qmc.LatinHypercube(d=len(weight_names), seed=seed)
+    logs = qmc.scale(sampler.random(n), np.log(weight_range[0]), np.log(weight_range[1]))
+    return np.vstack([np.ones(len(weight_names)), np.exp(logs)])
+
+
+    # compiles (or loads from the kernel cache) one bridge's model, the problem comes back without its kernel so it pickles
+def prepare_site(inputs):
+    engine = LearningEngine.load_engine(inputs)
+    return {name: value for name, value in engine.items() if name != 'kernel'}
+
+
+worker_engines = None
+
+
+def start_worker(engines):
+    global worker_engines
+    worker_engines = [dict(engine, kernel=KernelCache.load_kernel(engine['kernel_key'])) for engine in engines]
+
+
+def score_weights(weights, as_built):
+    errors = []
+    feasible = 0
+    for engine, built in zip(worker_engines, as_built):
+        res, report = LearningEngine.solve_weights(engine, weights)
+        feasible += Optimizer.meets_targets(res.x, dict(engine, weights=np.asarray(weights, dtype=float)))
+        for i, name in enumerate(variable_names):
+            if name in built:
+                errors.append(res.x[i] - built[name])
+    row = dict(zip(weight_names, weights))
+    row['score'] = float(np.sqrt(np.mean(np.square(errors))))
+    row['feasible'] = feasible
+    return row
+
+
+    # the known as-built dimensions of each bridge, by variable name
+def built_dimensions(bridges):
+    return [{name: float(fields[name]) for name in variable_names if name in fields and not pd.isna(fields[name])}
+            for _, fields in bridges.iterrows()]
+
+
+    # Returns the best weights and the score table (one row per weight set, best first: most bridges meeting the FOS
+    # targets, then lowest score, a close fit with designs that aren't safe isn't a calibration)
+    # bridges without any built dimension aren't solved, there is nothing to score them on
+def calibrate(bridges, Constants, Tables, n=samples, weight_range=weight_range, seed=seed, workers=None):
+    workers = workers or os.cpu_count()
+    as_built = built_dimensions(bridges)
+    bridges = bridges[[bool(built) for built in as_built]]
+    as_built = [built for built in as_built if built]
+    if not as_built:
+        raise ValueError('no bridge has a built dimension (' + ', '.join(variable_names) + ') to score the weights on')
+    inputs = [SiteInputs.site_inputs(Constants, Tables, fields) for _, fields in bridges.iterrows()]
+    with Optimizer.process_pool(workers) as pool:
+        engines = list(pool.map(prepare_site, inputs))
+    weight_sets = weight_samples(n, weight_range, seed)
+    with Optimizer.process_pool(workers, start_worker, (engines,)) as pool:
+        rows = list(pool.map(score_weights, weight_sets, [as_built] * len(weight_sets)))
+    scores = pd.DataFrame(rows).sort_values(['feasible', 'score'], ascending=[False, True], ignore_index=True)
+    return scores.loc[0, weight_names].to_numpy(dtype=float), scores
+
+
+if __name__ == '__main__':
+    inputs = WorkbookLoader.load_inputs(path)
+    bridges = BatchDesigner.read_table(as_built_path)
+    if bridges.empty:
+        raise SystemExit('no bridges in ' + as_built_path)
+    scored = sum(bool(built) for built in built_dimensions(bridges))
+    if scored == 0:
+        raise SystemExit('no bridge in ' + as_built_path + ' has a built dimension filled in')
+    if scored < len(bridges):
+        print(str(len(bridges) - scored) + ' bridges without built dimensions skipped')
+    start = time.perf_counter()
+    best, scores = calibrate(bridges, inputs['Constants'], inputs['Tables'], samples, weight_range, seed, workers)
+    scores.to_csv(results_path, index=False)
+    print(str(len(scores)) + ' weight sets scored on ' + str(scored) + ' bridges in ' + str(round(time.perf_counter() - start, 1)) + ' s')
+    print('best weights ' + str({name: round(float(weight), 3) for name, weight in zip(weight_names, best)}) + ', RMS difference ' + str(round(scores.loc[0, 'score'], 3)) + ' m, '
+          + str(int(scores.loc[0, 'feasible'])) + ' of ' + str(scored) + ' bridges meet the FOS targets')
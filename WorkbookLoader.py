@@ -0,0 +1,44 @@
+## Description
+
+    # Reads the MasterInputs sheets in one pass and keeps them in a binary sidecar next to the kernel cache
+    # openpyxl has to unzip and parse the whole xlsx for every pd.read_excel call, the sidecar is keyed by a hash of
+    # the workbook bytes so a saved change to the workbook is picked up on the next run
+
+## Imports
+import hashlib
+import os
+import pickle
+import pandas as pd
+import KernelCache
+
+    # sheet name -> pd.read_excel options, Tables is read raw because its header rows aren't a header
+sheet_options = {'Constants': {}, 'Lookup': {}, 'Geometry': {}, 'Tables': {'header': None}}
+
+
+def workbook_key(path):
+    with open(path, 'rb') as stream:
+        return hashlib.sha256(stream.read()).hexdigest()
+
+
+def sidecar_file(path):
+    return os.path.join(KernelCache.cache_dir, os.path.basename(path) + '.inputs.pkl')
+
+
+    # dict of sheet name -> DataFrame, same frames as pd.read_excel(path, sheet_name=name, **sheet_options[name])
+def load_inputs(path):
+    key = workbook_key(path)
+    if os.path.exists(sidecar_file(path)):
+        with open(sidecar_file(path), 'rb') as stream:
+            sidecar = pickle.load(stream)
+        if sidecar['key'] == key:
+            return sidecar['sheets']
+
+    with pd.ExcelFile(path) as workbook:
+        sheets = {name: workbook.parse(name, **options) for name, options in sheet_options.items()}
+
+    os.makedirs(KernelCache.cache_dir, exist_ok=True)
+    temp_file = sidecar_file(path) + '.tmp'
+    with open(temp_file, 'wb') as stream:
+        pickle.dump({'key': key, 'sheets': sheets}, stream)
+    os.replace(temp_file, sidecar_file(path))
+    return sheets